@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+"""
+Indicator kernel benchmark
+
+Compares per-call latency of the pandas indicator path against the NumPy
+kernels for 100-bar and 100k-bar inputs.
+
+Usage:
+    python benchmarks/indicator_kernels.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from modules.indicators.moving_averages import calculate_sma, calculate_ema, calculate_macd
+from modules.indicators.rsi import calculate_rsi
+from modules.indicators.bollinger_bands import calculate_bollinger_bands
+
+
+SIZES = [100, 100_000]
+
+INDICATORS = {
+    'sma(20)': lambda prices: calculate_sma(prices, 20),
+    'ema(50)': lambda prices: calculate_ema(prices, 50),
+    'rsi(14)': lambda prices: calculate_rsi(prices, 14),
+    'bollinger(20)': lambda prices: calculate_bollinger_bands(prices, 20),
+    'macd(12,26,9)': lambda prices: calculate_macd(prices),
+}
+
+
+def per_call_us(func, prices) -> float:
+    """Best-of-5 per-call latency in microseconds"""
+    timer = timeit.Timer(lambda: func(prices))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e6
+
+
+def main():
+    """Run the benchmark and print a latency table"""
+    rng = np.random.default_rng(42)
+    
+    print(f"{'indicator':<16}{'bars':>8}{'pandas (us)':>14}{'numpy (us)':>14}{'speedup':>10}")
+    print("-" * 62)
+    
+    for size in SIZES:
+        array = 50000.0 + np.cumsum(rng.normal(0.0, 50.0, size))
+        series = pd.Series(array)
+        
+        for name, func in INDICATORS.items():
+            pandas_us = per_call_us(func, series)
+            numpy_us = per_call_us(func, array)
+            print(f"{name:<16}{size:>8}{pandas_us:>14.1f}{numpy_us:>14.1f}{pandas_us / numpy_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
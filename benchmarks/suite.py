@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+"""
+Micro-benchmark suite
+
+Times every indicator function and kernel, each strategy's
+generate_signal, Config.get, Logger calls and MockBroker order
+operations across input sizes. Results can be saved as JSON and compared
+against a stored baseline; the run fails (exit code 1) when a benchmark
+got slower than the baseline by more than the threshold.
+
+Usage:
+    python benchmarks/suite.py                        # run and compare
+    python benchmarks/suite.py --save-baseline        # record a baseline
+    python benchmarks/suite.py --filter indicators --threshold 0.5
+    python benchmarks/suite.py --output results.json --quick
+
+Baselines are machine specific: record one on the machine (or CI runner)
+that will run the comparison.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import config
+from modules.brokers.mock_broker import MockBroker
+from modules.data.market_generator import MarketGenerator
+from modules.indicators import bollinger_bands, kernels, moving_averages, rsi, streaming
+from modules.indicators.cache import IndicatorCache, indicator_cache
+from modules.strategies.strategy_factory import StrategyFactory
+from utils.logging.logger import Logger
+
+
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+DEFAULT_THRESHOLD = 0.25
+
+# Slowdowns smaller than this are timer noise on sub-microsecond calls
+DEFAULT_MIN_DELTA_US = 0.5
+
+SIZES = [100, 10_000, 100_000]
+QUICK_SIZES = [100, 10_000]
+STRATEGY_SIZES = [100, 1_000, 10_000]
+ORDER_BOOK_SIZES = [100, 10_000]
+
+STRATEGIES = ['moving_average_crossover', 'rsi_strategy', 'trend_following']
+
+INDICATORS = {
+    'calculate_sma': lambda prices: moving_averages.calculate_sma(prices, 20),
+    'calculate_ema': lambda prices: moving_averages.calculate_ema(prices, 50),
+    'calculate_wma': lambda prices: moving_averages.calculate_wma(prices, 20),
+    'calculate_hma': lambda prices: moving_averages.calculate_hma(prices, 20),
+    'calculate_macd': lambda prices: moving_averages.calculate_macd(prices),
+    'calculate_rsi': lambda prices: rsi.calculate_rsi(prices, 14),
+    'calculate_stochastic_rsi': lambda prices: rsi.calculate_stochastic_rsi(prices, 14),
+    'calculate_bollinger_bands': lambda prices: bollinger_bands.calculate_bollinger_bands(prices, 20),
+    'calculate_bandwidth': lambda prices: bollinger_bands.calculate_bandwidth(prices, 20),
+    'calculate_percent_b': lambda prices: bollinger_bands.calculate_percent_b(prices, 20),
+}
+
+KERNELS = {
+    'sma_kernel': lambda values: kernels.sma_kernel(values, 20),
+    'ema_kernel': lambda values: kernels.ema_kernel(values, 50),
+    'wma_kernel': lambda values: kernels.wma_kernel(values, 20),
+    'hma_kernel': lambda values: kernels.hma_kernel(values, 20),
+    'rsi_kernel': lambda values: kernels.rsi_kernel(values, 14),
+    'rolling_std_kernel': lambda values: kernels.rolling_std_kernel(values, 20),
+    'bollinger_kernel': lambda values: kernels.bollinger_kernel(values, 20),
+    'macd_kernel': lambda values: kernels.macd_kernel(values),
+}
+
+STREAMING = {
+    'StreamingSMA': lambda: streaming.StreamingSMA(20),
+    'StreamingEMA': lambda: streaming.StreamingEMA(50),
+    'StreamingRSI': lambda: streaming.StreamingRSI(14),
+    'StreamingBollingerBands': lambda: streaming.StreamingBollingerBands(20),
+    'StreamingMACD': lambda: streaming.StreamingMACD(),
+}
+
+# A benchmark case: (name, function to time)
+Case = Tuple[str, Callable[[], object]]
+
+
+def prices(size: int, seed: int = 42) -> np.ndarray:
+    """Random-walk close prices"""
+    rng = np.random.default_rng(seed)
+    return 50000.0 + np.cumsum(rng.normal(0.0, 50.0, size))
+
+
+def indicator_cases(sizes: List[int]) -> List[Case]:
+    """Indicator functions (pandas input), kernels and streaming updates"""
+    cases = []
+    for size in sizes:
+        values = prices(size)
+        series = pd.Series(values)
+        for name, func in INDICATORS.items():
+            cases.append((f"indicators/{name}[{size}]", lambda func=func: func(series)))
+        for name, func in KERNELS.items():
+            cases.append((f"indicators/{name}[{size}]", lambda func=func: func(values)))
+    
+    # One update of a primed streaming indicator
+    ticks = prices(1_000)
+    for name, factory in STREAMING.items():
+        indicator = factory()
+        streaming.prime(indicator, ticks)
+        cases.append((f"indicators/{name}.update", lambda indicator=indicator: indicator.update(50000.0)))
+    
+    cache = IndicatorCache()
+    market_data = MarketGenerator(['BTC/EUR'], seed=1).generate(1_000)['BTC/EUR']
+    key = cache.make_key(market_data, 'ema', (50,))
+    cache.get_or_compute(key, lambda: kernels.ema_kernel(market_data.close, 50))
+    cases.append(("indicators/IndicatorCache.hit", lambda: cache.get_or_compute(key, lambda: None)))
+    return cases
+
+
+def strategy_cases(sizes: List[int]) -> List[Case]:
+    """generate_signal of every strategy, with a cold and a warm indicator cache"""
+    cases = []
+    for size in sizes:
+        market_data = MarketGenerator(['BTC/EUR'], seed=2).generate(size)['BTC/EUR']
+        for name in STRATEGIES:
+            strategy = StrategyFactory.create_strategy(name, {})
+            
+            def cold(strategy=strategy, market_data=market_data):
+                indicator_cache.clear()
+                return strategy.generate_signal(market_data)
+            
+            cases.append((f"strategies/{name}.generate_signal[{size}]", cold))
+            cases.append((f"strategies/{name}.generate_signal_cached[{size}]",
+                          lambda strategy=strategy, market_data=market_data: strategy.generate_signal(market_data)))
+    return cases
+
+
+def config_cases() -> List[Case]:
+    """Config.get for shallow, nested and missing keys"""
+    return [
+        ("config/get_shallow", lambda: config.get('trading')),
+        ("config/get_nested", lambda: config.get('strategy.parameters.fast_period')),
+        ("config/get_missing", lambda: config.get('strategy.missing.key', 0)),
+    ]
+
+
+def logger_cases() -> List[Case]:
+    """Logger calls that are emitted and that are filtered by level"""
+    logger = Logger('Benchmark')
+    sink = open(os.devnull, 'w')
+    for handler in logger.logger.handlers:
+        handler.close()
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.logger.handlers = [handler]
+    logger.logger.setLevel(logging.INFO)
+    logger.logger.propagate = False
+    return [
+        ("logger/info", lambda: logger.info("benchmark message")),
+        ("logger/debug_filtered", lambda: logger.debug("benchmark message")),
+    ]
+
+
+def broker_cases(sizes: List[int]) -> List[Case]:
+    """MockBroker order operations with resting order books of several sizes"""
+    cases = []
+    for size in sizes:
+        broker = MockBroker('', '', seed=3, clock=lambda: 1_700_000_000.0)
+        price = broker.get_current_price('BTC/EUR')
+        resting = [broker.place_order('BTC/EUR', 'buy', 1.0, 'limit', price * 0.5) for _ in range(size)]
+        order_id = resting[size // 2]['id']
+        
+        def place_cancel(broker=broker, price=price):
+            order = broker.place_order('BTC/EUR', 'buy', 1.0, 'limit', price * 0.5)
+            broker.cancel_order(order['id'])
+        
+        cases += [
+            (f"broker/place_market_order[{size}]",
+             lambda broker=broker: broker.place_order('BTC/EUR', 'buy', 1.0)),
+            (f"broker/place_cancel_limit_order[{size}]", place_cancel),
+            (f"broker/get_order_status[{size}]",
+             lambda broker=broker, order_id=order_id: broker.get_order_status(order_id)),
+            (f"broker/get_open_orders[{size}]", lambda broker=broker: broker.get_open_orders()),
+            (f"broker/update_price[{size}]",
+             lambda broker=broker, price=price: broker.update_price('BTC/EUR', price)),
+        ]
+    return cases
+
+
+def collect(quick: bool = False) -> List[Case]:
+    """Build every benchmark case"""
+    sizes = QUICK_SIZES if quick else SIZES
+    return (indicator_cases(sizes) + strategy_cases(STRATEGY_SIZES) + config_cases()
+            + logger_cases() + broker_cases(ORDER_BOOK_SIZES))
+
+
+def per_call_us(func: Callable, repeat: int) -> float:
+    """Best-of-`repeat` per-call latency in microseconds"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e6
+
+
+def run(cases: List[Case], repeat: int) -> Dict[str, float]:
+    """
+    Time benchmark cases
+    
+    Args:
+        cases: (name, function) pairs
+        repeat: Timing repetitions per case (the best one counts)
+        
+    Returns:
+        Dictionary of case name -> per-call microseconds
+    """
+    results = {}
+    for name, func in cases:
+        results[name] = per_call_us(func, repeat)
+        print(f"{name:<64}{results[name]:>14.2f} us")
+    return results
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float,
+            min_delta_us: float = DEFAULT_MIN_DELTA_US) -> List[Tuple[str, float, float]]:
+    """
+    Find regressions against a baseline
+    
+    Args:
+        results: Current per-call microseconds
+        baseline: Baseline per-call microseconds
+        threshold: Allowed slowdown as a fraction (0.25 = 25% slower)
+        min_delta_us: Slowdowns below this many microseconds are ignored
+        
+    Returns:
+        (name, baseline us, current us) for every regression
+    """
+    return [
+        (name, baseline[name], current)
+        for name, current in results.items()
+        if name in baseline and current > baseline[name] * (1 + threshold)
+        and current - baseline[name] > min_delta_us
+    ]
+
+
+def metadata() -> Dict:
+    """Environment the results were recorded in"""
+    return {
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, float]]:
+    """Read the results of a baseline file, if there is one"""
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def write_results(path: Path, results: Dict[str, float]):
+    """Save results with their environment as JSON"""
+    with open(path, 'w') as f:
+        json.dump({'metadata': metadata(), 'results': results}, f, indent=2, sort_keys=True)
+    print(f"Wrote {len(results)} results to {path}")
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description='Run the NewBot micro-benchmark suite')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE,
+                        help='Baseline JSON file (default: %(default)s)')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='Store this run as the baseline instead of comparing')
+    parser.add_argument('--output', type=Path, help='Also write this run to a JSON file')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='Allowed slowdown before failing, as a fraction (default: %(default)s)')
+    parser.add_argument('--min-delta', type=float, default=DEFAULT_MIN_DELTA_US, metavar='US',
+                        help='Ignore slowdowns smaller than this many microseconds (default: %(default)s)')
+    parser.add_argument('--filter', help='Only run benchmarks whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (default: %(default)s)')
+    parser.add_argument('--quick', action='store_true', help='Skip the largest input size')
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite; returns the process exit code"""
+    args = parse_arguments(argv)
+    
+    # Component INFO logs (order placement etc.) would swamp the timings;
+    # only the logger benchmark keeps its level
+    logging.disable(logging.WARNING)
+    cases = collect(args.quick)
+    logging.disable(logging.NOTSET)
+    for name, logger in logging.root.manager.loggerDict.items():
+        if isinstance(logger, logging.Logger) and name != 'Benchmark':
+            logger.setLevel(logging.WARNING)
+    if args.filter:
+        cases = [case for case in cases if args.filter in case[0]]
+    
+    results = run(cases, args.repeat)
+    if args.output:
+        write_results(args.output, results)
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        return 0
+    
+    baseline = load_baseline(args.baseline)
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; record one with --save-baseline")
+        return 0
+    
+    regressions = compare(results, baseline, args.threshold, args.min_delta)
+    missing = len([name for name in results if name not in baseline])
+    print(f"\nCompared {len(results) - missing} benchmarks with {args.baseline} "
+          f"(threshold {args.threshold:.0%}, {missing} without a baseline)")
+    if not regressions:
+        print("No regressions")
+        return 0
+    
+    print(f"{len(regressions)} regressions:")
+    for name, before, after in regressions:
+        print(f"  {name:<62}{before:>12.2f} -> {after:>12.2f} us  (+{after / before - 1:.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,18 +7,33 @@ Handles automated trading, risk management, order monitoring, and system coordin
 
 import time
 import signal
+import asyncio
+import argparse
+import contextvars
 import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime
 from pathlib import Path
 
 from config import config
+from modules.brokers.accounting import meter_broker, weight_by_phase
 from modules.brokers.broker_factory import BrokerFactory
+from modules.brokers.order_tracker import OrderTracker
+from modules.brokers.price_snapshot import PriceSnapshot
 from modules.strategies.strategy_factory import StrategyFactory
+from modules.indicators.cache import indicator_cache
 from utils.logging.logger import Logger
 from utils.security.credential_manager import CredentialManager
 from utils.backup.backup_manager import BackupManager
+from utils.scheduling.loop_scheduler import LoopScheduler, MONITOR, SIGNALS
+from utils.monitoring.metrics import MetricsServer, current_phase, loop_phase, metrics
 from modules.notifications.notifier import Notifier
+from modules.backtesting.cli import (
+    add_optimize_arguments, add_walk_forward_arguments, run_optimize, run_walk_forward
+)
 
 
 class NewBot:
@@ -39,6 +54,25 @@ class NewBot:
         self.running = False
         self.positions: Dict = {}
         self.open_orders: List = []
+        self.strategies: Dict = {}
+        self.order_tracker = OrderTracker()
+        self.price_snapshot = PriceSnapshot({}, max_age=0)
+        self._position_symbols: List[str] = []
+        self.last_scan_stats: Dict = {}
+        self.metrics_server: Optional[MetricsServer] = None
+        self._metrics_logged_at = time.monotonic()
+        
+        # Order-placing work (buys, sells, trailing stops) runs in worker
+        # threads in asyncio mode; one lock per symbol keeps two of them
+        # from cancelling and placing the same symbol's orders at once
+        self._symbol_locks: Dict[str, threading.RLock] = {}
+        self._symbol_locks_guard = threading.Lock()
+        
+        # Worker threads still running per loop phase (asyncio mode). A
+        # phase deadline cannot stop them, so the phase is not started
+        # again until they finish.
+        self._phase_threads: Counter = Counter()
+        self._phase_threads_lock = threading.Lock()
         
         # Initialize components
         self._init_components()
@@ -73,6 +107,10 @@ class NewBot:
             )
             self.logger.info(f"Connected to broker: {broker_name}")
             
+            # Account every exchange request and time the broker calls
+            if config.get('monitoring.metrics_enabled', True):
+                meter_broker(self.broker, metrics)
+            
             # Initialize trading strategy
             strategy_name = config.get('strategy.name')
             strategy_params = config.get('strategy.parameters', {})
@@ -108,9 +146,13 @@ class NewBot:
         )
         
         self.running = True
+        self._start_metrics_server()
         
         try:
-            self._trading_loop()
+            if config.get('monitoring.async_mode', False):
+                asyncio.run(self._trading_loop_async())
+            else:
+                self._trading_loop()
         except Exception as e:
             self.logger.error(f"Critical error in trading loop: {e}")
             self.notifier.send_notification(
@@ -122,30 +164,62 @@ class NewBot:
         finally:
             self.stop()
     
+    def _create_scheduler(self) -> LoopScheduler:
+        """Create the loop scheduler from configuration"""
+        return LoopScheduler(
+            check_interval=config.get('monitoring.check_interval_seconds', 60),
+            timeframe=config.get('strategy.timeframe', '1h'),
+            on_candle_close=config.get('strategy.evaluate_on_candle_close', True),
+            close_delay=config.get('strategy.candle_close_delay_seconds', 2),
+        )
+    
     def _trading_loop(self):
-        """Main trading loop"""
-        check_interval = config.get('monitoring.check_interval_seconds', 60)
+        """
+        Main trading loop
+        
+        Position and order checks run every check interval; signal
+        evaluation runs once per closed candle of the strategy timeframe.
+        The loop sleeps until the next deadline rather than for a fixed
+        interval after the work.
+        """
+        scheduler = self._create_scheduler()
         
         while self.running:
             try:
-                # Check market conditions
-                self._check_market()
+                due = scheduler.due()
                 
-                # Monitor existing positions
-                self._monitor_positions()
+                if due:
+                    # Take one bulk price snapshot for this iteration
+                    with loop_phase('price_snapshot'):
+                        self._refresh_price_snapshot()
                 
-                # Monitor open orders
-                self._monitor_orders()
+                if MONITOR in due:
+                    # Check market conditions
+                    with loop_phase('check_market'):
+                        self._check_market()
+                    
+                    # Monitor existing positions
+                    with loop_phase('monitor_positions'):
+                        self._monitor_positions()
+                    
+                    # Monitor open orders
+                    with loop_phase('monitor_orders'):
+                        self._monitor_orders()
                 
-                # Evaluate trading opportunities
-                self._evaluate_trading_signals()
+                if SIGNALS in due:
+                    # Evaluate trading opportunities
+                    with loop_phase('evaluate_signals'):
+                        self._evaluate_trading_signals()
                 
                 # Perform backup if needed
                 if self.backup_manager:
-                    self.backup_manager.auto_backup()
+                    with loop_phase('auto_backup'):
+                        self.backup_manager.auto_backup()
+                
+                self._log_metrics_summary()
                 
-                # Wait before next iteration
-                time.sleep(check_interval)
+                # Wait until the next phase is due
+                scheduler.sleep_until_next()
                 
             except KeyboardInterrupt:
                 self.logger.info("Keyboard interrupt received")
@@ -157,7 +231,219 @@ class NewBot:
                     f"Trading loop error: {e}",
                     priority="medium"
                 )
-                time.sleep(check_interval)
+                scheduler.sleep_until_next()
+    
+    async def _trading_loop_async(self):
+        """
+        Main trading loop (asyncio mode)
+        
+        Runs the due market, position, order and signal phases concurrently
+        so an iteration takes about as long as its slowest broker call. Each
+        phase gets its own deadline; a phase that overruns is cancelled and
+        logged without affecting the others. Blocking work it handed to
+        worker threads cannot be cancelled: it runs to completion and the
+        phase is skipped until it has.
+        """
+        scheduler = self._create_scheduler()
+        
+        try:
+            while self.running:
+                try:
+                    due = scheduler.due()
+                    phases = []
+                    
+                    if MONITOR in due:
+                        phases += [
+                            self._run_phase('check_market', self._check_market_async()),
+                            self._run_phase('monitor_positions', self._monitor_positions_async()),
+                            self._run_phase('monitor_orders', self._monitor_orders_async()),
+                        ]
+                    
+                    if SIGNALS in due:
+                        phases.append(self._run_phase('evaluate_signals', self._evaluate_trading_signals_async()))
+                    
+                    if phases:
+                        with loop_phase('price_snapshot'):
+                            await self._refresh_price_snapshot_async()
+                        await asyncio.gather(*phases)
+                    
+                    # Perform backup if needed
+                    if self.backup_manager:
+                        with loop_phase('auto_backup'):
+                            await asyncio.to_thread(self.backup_manager.auto_backup)
+                    
+                    self._log_metrics_summary()
+                    
+                    # Wait until the next phase is due
+                    await asyncio.sleep(scheduler.seconds_until_next())
+                    
+                except Exception as e:
+                    self.logger.error(f"Error in trading loop: {e}")
+                    self.notifier.send_notification(
+                        "NewBot Warning",
+                        f"Trading loop error: {e}",
+                        priority="medium"
+                    )
+                    await asyncio.sleep(scheduler.seconds_until_next())
+        finally:
+            await self.broker.close_async()
+    
+    async def _run_phase(self, name: str, coro):
+        """
+        Run one loop phase with its deadline
+        
+        A phase whose worker threads from an earlier run are still busy is
+        skipped, so blocking order work never overlaps with itself.
+        
+        Args:
+            name: Phase name (used in log messages)
+            coro: Phase coroutine
+        """
+        busy = self._phase_threads[name]
+        if busy:
+            coro.close()
+            metrics.increment('loop_phase_skipped_total', phase=name)
+            self.logger.warning(f"Phase {name} skipped, {busy} worker thread(s) from its last run still running")
+            return
+        
+        timeout = config.get(
+            f'monitoring.phase_timeouts.{name}',
+            config.get('monitoring.phase_timeout_seconds', 30)
+        )
+        
+        try:
+            with loop_phase(name):
+                await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            metrics.increment('loop_phase_timeouts_total', phase=name)
+            busy = self._phase_threads[name]
+            if busy:
+                self.logger.warning(
+                    f"Phase {name} exceeded its {timeout}s deadline; {busy} worker thread(s) "
+                    f"cannot be cancelled and keep running"
+                )
+            else:
+                self.logger.warning(f"Phase {name} exceeded its {timeout}s deadline and was cancelled")
+        except Exception as e:
+            self.logger.error(f"Phase {name} failed: {e}")
+    
+    async def _to_thread(self, func, *args):
+        """
+        Run blocking work in a worker thread, counted against the current phase
+        
+        Args:
+            func: Function to run
+            *args: Arguments for func
+            
+        Returns:
+            Result of func
+        """
+        phase = current_phase.get()
+        
+        def run():
+            with self._phase_threads_lock:
+                self._phase_threads[phase] += 1
+            try:
+                return func(*args)
+            finally:
+                with self._phase_threads_lock:
+                    self._phase_threads[phase] -= 1
+        
+        return await asyncio.to_thread(run)
+    
+    def _symbol_lock(self, symbol: str) -> threading.RLock:
+        """Lock serializing order-placing work for one symbol"""
+        with self._symbol_locks_guard:
+            return self._symbol_locks.setdefault(symbol, threading.RLock())
+    
+    def _start_metrics_server(self):
+        """Expose metrics over HTTP if a port is configured"""
+        port = config.get('monitoring.metrics_port', 0)
+        if not config.get('monitoring.metrics_enabled', True) or not port:
+            return
+        
+        host = config.get('monitoring.metrics_host', '127.0.0.1')
+        try:
+            self.metrics_server = MetricsServer(metrics, host, port).start()
+            self.logger.info(f"Metrics available at http://{host}:{self.metrics_server.port}/metrics")
+        except OSError as e:
+            self.logger.error(f"Failed to start metrics server on {host}:{port}: {e}")
+    
+    def _log_metrics_summary(self, force: bool = False):
+        """
+        Write the latency summary to the log once per interval
+        
+        Args:
+            force: Log now regardless of the interval
+        """
+        interval = config.get('monitoring.metrics_log_interval_seconds', 300)
+        now = time.monotonic()
+        if not force and (not interval or now - self._metrics_logged_at < interval):
+            return
+        self._metrics_logged_at = now
+        
+        lines = metrics.summary()
+        if lines:
+            self.logger.info("Latency summary:\n  " + "\n  ".join(lines))
+        budget = weight_by_phase(metrics)
+        if budget:
+            self.logger.info("Broker request weight by phase:\n  " + "\n  ".join(budget))
+    
+    def _snapshot_symbols(self) -> List[str]:
+        """
+        Symbols whose prices may be needed during this iteration
+        
+        Without a bulk ticker endpoint every symbol costs a request, so only
+        symbols with positions or open orders are snapshotted; watchlist
+        prices are then fetched when a signal actually needs them.
+        """
+        symbols = dict.fromkeys(self._get_watchlist() if self.broker.BULK_TICKERS else [])
+        symbols.update(dict.fromkeys(order.get('symbol') for order in self.open_orders))
+        symbols.update(dict.fromkeys(self.positions))
+        symbols.update(dict.fromkeys(self._position_symbols))
+        return [symbol for symbol in symbols if symbol]
+    
+    def _refresh_price_snapshot(self):
+        """Fetch the prices needed in this iteration up front"""
+        max_age = config.get('monitoring.price_max_age_seconds', 5)
+        symbols = self._snapshot_symbols()
+        try:
+            # An empty symbol list would fetch every ticker on the exchange
+            prices = self.broker.get_tickers(symbols) if symbols else {}
+        except Exception as e:
+            self.logger.error(f"Price snapshot failed: {e}")
+            prices = {}
+        self.price_snapshot = PriceSnapshot(prices, max_age=max_age)
+    
+    async def _refresh_price_snapshot_async(self):
+        """Fetch the prices needed in this iteration up front (async)"""
+        max_age = config.get('monitoring.price_max_age_seconds', 5)
+        symbols = self._snapshot_symbols()
+        try:
+            # An empty symbol list would fetch every ticker on the exchange
+            prices = await self.broker.get_tickers_async(symbols) if symbols else {}
+        except Exception as e:
+            self.logger.error(f"Price snapshot failed: {e}")
+            prices = {}
+        self.price_snapshot = PriceSnapshot(prices, max_age=max_age)
+    
+    def _get_price(self, symbol: str) -> float:
+        """
+        Get the current price for a symbol
+        
+        Reads the iteration's price snapshot and only falls back to a live
+        ticker request when the symbol is missing or the snapshot is stale.
+        
+        Args:
+            symbol: Trading pair symbol
+            
+        Returns:
+            Current price
+        """
+        price = self.price_snapshot.get(symbol)
+        if price is None:
+            price = self.broker.get_current_price(symbol)
+        return price
     
     def _check_market(self):
         """Check market conditions and connectivity"""
@@ -174,10 +460,15 @@ class NewBot:
         except Exception as e:
             self.logger.error(f"Market check failed: {e}")
     
+    async def _check_market_async(self):
+        """Check market conditions and connectivity (async)"""
+        await self._to_thread(self._check_market)
+    
     def _monitor_positions(self):
         """Monitor all open positions"""
         try:
             positions = self.broker.get_positions()
+            self._position_symbols = [p.get('symbol') for p in positions]
             
             for position in positions:
                 # Check if stop-loss or take-profit needs adjustment
@@ -189,57 +480,242 @@ class NewBot:
         except Exception as e:
             self.logger.error(f"Position monitoring failed: {e}")
     
-    def _monitor_orders(self):
-        """Monitor all open orders"""
+    async def _monitor_positions_async(self):
+        """Monitor all open positions (async)"""
         try:
-            orders = self.broker.get_open_orders()
+            positions = await self.broker.get_positions_async()
+            self._position_symbols = [p.get('symbol') for p in positions]
             
-            for order in orders:
-                # Check order status
-                status = self.broker.get_order_status(order['id'])
-                
-                # Notify on filled orders
-                if status == 'filled':
-                    self.notifier.send_notification(
-                        "Order Filled",
-                        f"Order {order['id']} filled at {order.get('price', 'market')}",
-                        priority="low"
-                    )
-                    self.logger.info(f"Order filled: {order['id']}")
+            # Trailing-stop adjustments may place and cancel orders, so they
+            # reuse the synchronous path in worker threads, one per position
+            await asyncio.gather(*(
+                self._to_thread(self._adjust_risk_levels, position)
+                for position in positions
+            ))
+            
+            for position in positions:
+                self.logger.debug(f"Position: {position}")
                 
-                # Notify on cancelled orders
-                elif status == 'cancelled':
-                    self.notifier.send_notification(
-                        "Order Cancelled",
-                        f"Order {order['id']} was cancelled",
-                        priority="low"
-                    )
-                    self.logger.info(f"Order cancelled: {order['id']}")
+        except Exception as e:
+            self.logger.error(f"Position monitoring failed: {e}")
+    
+    def _monitor_orders(self):
+        """
+        Monitor all open orders
+        
+        Fills and cancellations are derived from the difference between
+        successive open-order snapshots; only orders that disappeared from
+        the list get an individual status lookup.
+        """
+        try:
+            self.open_orders = self.broker.get_open_orders()
+            
+            for order in self.order_tracker.reconcile(self.open_orders):
+                status = self.broker.get_order_status(order['id'], order.get('symbol'))
+                status = self.order_tracker.resolve(order, status)
+                if status:
+                    self._handle_order_status(order, status)
                     
         except Exception as e:
             self.logger.error(f"Order monitoring failed: {e}")
     
+    async def _monitor_orders_async(self):
+        """Monitor all open orders (async)"""
+        try:
+            self.open_orders = await self.broker.get_open_orders_async()
+            vanished = self.order_tracker.reconcile(self.open_orders)
+            
+            statuses = await asyncio.gather(*(
+                self.broker.get_order_status_async(order['id'], order.get('symbol'))
+                for order in vanished
+            ))
+            
+            for order, status in zip(vanished, statuses):
+                status = self.order_tracker.resolve(order, status)
+                if status:
+                    self._handle_order_status(order, status)
+                
+        except Exception as e:
+            self.logger.error(f"Order monitoring failed: {e}")
+    
+    def _handle_order_status(self, order: Dict, status: str):
+        """
+        Notify about an order status change
+        
+        Args:
+            order: Order details
+            status: Current order status
+        """
+        # Notify on filled orders
+        if status == 'filled':
+            self.notifier.send_notification(
+                "Order Filled",
+                f"Order {order['id']} filled at {order.get('price', 'market')}",
+                priority="low"
+            )
+            self.logger.info(f"Order filled: {order['id']}")
+        
+        # Notify on cancelled orders
+        elif status == 'cancelled':
+            self.notifier.send_notification(
+                "Order Cancelled",
+                f"Order {order['id']} was cancelled",
+                priority="low"
+            )
+            self.logger.info(f"Order cancelled: {order['id']}")
+    
+    def _get_watchlist(self) -> List[str]:
+        """
+        Get the symbols to scan for trading signals
+        
+        Uses `trading.symbols` when configured, otherwise the single pair
+        built from `trading.quote_currency`/`trading.base_currency`.
+        
+        Returns:
+            List of trading pair symbols
+        """
+        symbols = config.get('trading.symbols')
+        if symbols:
+            return list(symbols)
+        return [f"{config.get('trading.quote_currency')}/{config.get('trading.base_currency')}"]
+    
+    def _get_strategy(self, symbol: str):
+        """
+        Get the strategy instance for a symbol
+        
+        Each symbol gets its own strategy instance so per-symbol state
+        (e.g. the last crossover signal) is never shared between pairs.
+        
+        Args:
+            symbol: Trading pair symbol
+            
+        Returns:
+            Strategy instance
+        """
+        strategy = self.strategies.get(symbol)
+        if strategy is None:
+            strategy = StrategyFactory.create_strategy(
+                config.get('strategy.name'),
+                config.get('strategy.parameters', {})
+            )
+            self.strategies[symbol] = strategy
+        return strategy
+    
+    def _evaluate_symbol(self, symbol: str, timeframe: str) -> str:
+        """
+        Fetch market data for one symbol and run its strategy
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            
+        Returns:
+            Signal: 'BUY', 'SELL', or 'HOLD'
+        """
+        try:
+            market_data = self.broker.get_market_data(symbol, timeframe)
+            return self.strategies[symbol].generate_signal(market_data)
+        except Exception as e:
+            self.logger.error(f"Signal evaluation failed for {symbol}: {e}")
+            return 'HOLD'
+    
+    async def _evaluate_symbol_async(self, symbol: str, timeframe: str, semaphore: asyncio.Semaphore) -> str:
+        """
+        Fetch market data for one symbol and run its strategy (async)
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: Candle timeframe
+            semaphore: Limits the number of symbols in flight
+            
+        Returns:
+            Signal: 'BUY', 'SELL', or 'HOLD'
+        """
+        async with semaphore:
+            try:
+                market_data = await self.broker.get_market_data_async(symbol, timeframe)
+                return self.strategies[symbol].generate_signal(market_data)
+            except Exception as e:
+                self.logger.error(f"Signal evaluation failed for {symbol}: {e}")
+                return 'HOLD'
+    
     def _evaluate_trading_signals(self):
-        """Evaluate trading signals from strategy"""
+        """Evaluate trading signals for every symbol on the watchlist"""
         try:
-            # Get market data
-            symbol = f"{config.get('trading.quote_currency')}/{config.get('trading.base_currency')}"
+            symbols = self._get_watchlist()
             timeframe = config.get('strategy.timeframe', '1h')
+            concurrency = max(1, min(config.get('trading.scan_concurrency', 8), len(symbols)))
             
-            market_data = self.broker.get_market_data(symbol, timeframe)
+            # Create strategies up front so worker threads only read the map
+            for symbol in symbols:
+                self._get_strategy(symbol)
+            
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                # Carry the loop phase into the worker threads
+                context = contextvars.copy_context()
+                signals = list(pool.map(
+                    lambda sym: context.copy().run(self._evaluate_symbol, sym, timeframe), symbols
+                ))
+            self._report_scan_throughput(len(symbols), time.perf_counter() - start)
+            
+            # Execute trades one at a time so position limits stay consistent
+            for symbol, signal in zip(symbols, signals):
+                if signal == 'BUY':
+                    self._execute_buy(symbol)
+                elif signal == 'SELL':
+                    self._execute_sell(symbol)
+                
+        except Exception as e:
+            self.logger.error(f"Signal evaluation failed: {e}")
+    
+    async def _evaluate_trading_signals_async(self):
+        """Evaluate trading signals for every symbol on the watchlist (async)"""
+        try:
+            symbols = self._get_watchlist()
+            timeframe = config.get('strategy.timeframe', '1h')
+            semaphore = asyncio.Semaphore(max(1, config.get('trading.scan_concurrency', 8)))
+            
+            for symbol in symbols:
+                self._get_strategy(symbol)
             
-            # Get trading signal from strategy
-            signal = self.strategy.generate_signal(market_data)
+            start = time.perf_counter()
+            signals = await asyncio.gather(*(
+                self._evaluate_symbol_async(symbol, timeframe, semaphore)
+                for symbol in symbols
+            ))
+            self._report_scan_throughput(len(symbols), time.perf_counter() - start)
             
-            # Execute trades based on signal
-            if signal == 'BUY':
-                self._execute_buy(symbol)
-            elif signal == 'SELL':
-                self._execute_sell(symbol)
+            for symbol, signal in zip(symbols, signals):
+                if signal == 'BUY':
+                    await self._to_thread(self._execute_buy, symbol)
+                elif signal == 'SELL':
+                    await self._to_thread(self._execute_sell, symbol)
                 
         except Exception as e:
             self.logger.error(f"Signal evaluation failed: {e}")
     
+    def _report_scan_throughput(self, symbol_count: int, elapsed: float):
+        """
+        Record and log watchlist scan throughput
+        
+        Args:
+            symbol_count: Number of symbols scanned
+            elapsed: Scan duration in seconds
+        """
+        rate = symbol_count / elapsed if elapsed > 0 else float('inf')
+        cache_stats = indicator_cache.stats()
+        self.last_scan_stats = {
+            'symbols': symbol_count,
+            'seconds': elapsed,
+            'symbols_per_second': rate,
+            'indicator_cache': cache_stats,
+        }
+        self.logger.info(
+            f"Scanned {symbol_count} symbols in {elapsed:.2f}s ({rate:.1f} symbols/sec), "
+            f"indicator cache hit rate {cache_stats['hit_rate']:.0%}"
+        )
+    
     def _execute_buy(self, symbol: str):
         """
         Execute a buy order with risk management
@@ -248,44 +724,50 @@ class NewBot:
             symbol: Trading pair symbol
         """
         try:
-            # Check if we can open new position
-            max_positions = config.get('trading.max_positions', 5)
-            if len(self.positions) >= max_positions:
-                self.logger.info("Max positions reached, skipping buy signal")
-                return
-            
-            # Get trade amount
-            amount = config.get('trading.trade_amount')
-            
-            # Calculate stop-loss and take-profit levels
-            current_price = self.broker.get_current_price(symbol)
-            stop_loss_pct = config.get('risk_management.stop_loss_percent', 2.0)
-            take_profit_pct = config.get('risk_management.take_profit_percent', 5.0)
-            
-            stop_loss = current_price * (1 - stop_loss_pct / 100)
-            take_profit = current_price * (1 + take_profit_pct / 100)
-            
-            # Place buy order with OCO (One-Cancels-Other) for SL/TP
-            order = self.broker.place_order(
-                symbol=symbol,
-                side='buy',
-                amount=amount,
-                order_type='market'
-            )
-            
-            # Place stop-loss and take-profit orders
-            if order and order.get('status') == 'filled':
-                self._place_risk_orders(symbol, order, stop_loss, take_profit)
+            with self._symbol_lock(symbol):
+                # Check if we can open new position
+                max_positions = config.get('trading.max_positions', 5)
+                if len(self.positions) >= max_positions:
+                    self.logger.info("Max positions reached, skipping buy signal")
+                    return
                 
-                # Send notification
-                self.notifier.send_notification(
-                    "Buy Order Executed",
-                    f"Bought {amount} {symbol} at {current_price}\nSL: {stop_loss}\nTP: {take_profit}",
-                    priority="medium"
-                )
+                # Get trade amount
+                amount = config.get('trading.trade_amount')
+                
+                # Calculate stop-loss and take-profit levels
+                current_price = self._get_price(symbol)
+                if not current_price or current_price <= 0:
+                    # Brokers return 0.0 when the price request failed; SL/TP
+                    # levels derived from it would be meaningless
+                    self.logger.warning(f"No valid price for {symbol}, skipping buy signal")
+                    return
+                stop_loss_pct = config.get('risk_management.stop_loss_percent', 2.0)
+                take_profit_pct = config.get('risk_management.take_profit_percent', 5.0)
                 
-                self.logger.info(f"Buy order executed: {symbol} at {current_price}")
+                stop_loss = current_price * (1 - stop_loss_pct / 100)
+                take_profit = current_price * (1 + take_profit_pct / 100)
                 
+                # Place buy order with OCO (One-Cancels-Other) for SL/TP
+                order = self.broker.place_order(
+                    symbol=symbol,
+                    side='buy',
+                    amount=amount,
+                    order_type='market'
+                )
+                
+                # Place stop-loss and take-profit orders
+                if order and order.get('status') == 'filled':
+                    self._place_risk_orders(symbol, order, stop_loss, take_profit)
+                    
+                    # Send notification
+                    self.notifier.send_notification(
+                        "Buy Order Executed",
+                        f"Bought {amount} {symbol} at {current_price}\nSL: {stop_loss}\nTP: {take_profit}",
+                        priority="medium"
+                    )
+                    
+                    self.logger.info(f"Buy order executed: {symbol} at {current_price}")
+                    
         except Exception as e:
             self.logger.error(f"Buy execution failed: {e}")
             self.notifier.send_notification(
@@ -302,37 +784,38 @@ class NewBot:
             symbol: Trading pair symbol
         """
         try:
-            # Check if we have position to sell
-            if symbol not in self.positions:
-                self.logger.info(f"No position to sell for {symbol}")
-                return
-            
-            position = self.positions[symbol]
-            amount = position.get('amount')
-            
-            # Place sell order
-            order = self.broker.place_order(
-                symbol=symbol,
-                side='sell',
-                amount=amount,
-                order_type='market'
-            )
-            
-            if order and order.get('status') == 'filled':
-                current_price = self.broker.get_current_price(symbol)
+            with self._symbol_lock(symbol):
+                # Check if we have position to sell
+                if symbol not in self.positions:
+                    self.logger.info(f"No position to sell for {symbol}")
+                    return
                 
-                # Send notification
-                self.notifier.send_notification(
-                    "Sell Order Executed",
-                    f"Sold {amount} {symbol} at {current_price}",
-                    priority="medium"
-                )
-                
-                self.logger.info(f"Sell order executed: {symbol} at {current_price}")
+                position = self.positions[symbol]
+                amount = position.get('amount')
                 
-                # Remove position
-                del self.positions[symbol]
+                # Place sell order
+                order = self.broker.place_order(
+                    symbol=symbol,
+                    side='sell',
+                    amount=amount,
+                    order_type='market'
+                )
                 
+                if order and order.get('status') == 'filled':
+                    current_price = self._get_price(symbol)
+                    
+                    # Send notification
+                    self.notifier.send_notification(
+                        "Sell Order Executed",
+                        f"Sold {amount} {symbol} at {current_price}",
+                        priority="medium"
+                    )
+                    
+                    self.logger.info(f"Sell order executed: {symbol} at {current_price}")
+                    
+                    # Remove position
+                    del self.positions[symbol]
+                    
         except Exception as e:
             self.logger.error(f"Sell execution failed: {e}")
             self.notifier.send_notification(
@@ -398,34 +881,37 @@ class NewBot:
                 return
             
             symbol = position.get('symbol')
-            current_price = self.broker.get_current_price(symbol)
-            entry_price = position.get('entry_price')
-            trailing_pct = config.get('risk_management.trailing_stop_percent', 1.5)
-            
-            # Calculate new trailing stop
-            new_stop_loss = current_price * (1 - trailing_pct / 100)
-            
-            # Only adjust if new stop is higher than current (for long positions)
-            if new_stop_loss > position.get('stop_loss', 0):
-                # Cancel old stop-loss order
-                if position.get('sl_order_id'):
-                    self.broker.cancel_order(position['sl_order_id'])
-                
-                # Place new stop-loss order
-                sl_order = self.broker.place_order(
-                    symbol=symbol,
-                    side='sell',
-                    amount=position['amount'],
-                    order_type='stop_loss',
-                    price=new_stop_loss
-                )
+            with self._symbol_lock(symbol):
+                current_price = self._get_price(symbol)
+                if not current_price or current_price <= 0:
+                    return
+                entry_price = position.get('entry_price')
+                trailing_pct = config.get('risk_management.trailing_stop_percent', 1.5)
                 
-                # Update position
-                position['stop_loss'] = new_stop_loss
-                position['sl_order_id'] = sl_order.get('id') if sl_order else None
-                
-                self.logger.info(f"Trailing stop adjusted for {symbol}: {new_stop_loss}")
+                # Calculate new trailing stop
+                new_stop_loss = current_price * (1 - trailing_pct / 100)
                 
+                # Only adjust if new stop is higher than current (for long positions)
+                if new_stop_loss > position.get('stop_loss', 0):
+                    # Cancel old stop-loss order
+                    if position.get('sl_order_id'):
+                        self.broker.cancel_order(position['sl_order_id'])
+                    
+                    # Place new stop-loss order
+                    sl_order = self.broker.place_order(
+                        symbol=symbol,
+                        side='sell',
+                        amount=position['amount'],
+                        order_type='stop_loss',
+                        price=new_stop_loss
+                    )
+                    
+                    # Update position
+                    position['stop_loss'] = new_stop_loss
+                    position['sl_order_id'] = sl_order.get('id') if sl_order else None
+                    
+                    self.logger.info(f"Trailing stop adjusted for {symbol}: {new_stop_loss}")
+                    
         except Exception as e:
             self.logger.error(f"Failed to adjust risk levels: {e}")
     
@@ -434,6 +920,11 @@ class NewBot:
         self.logger.info("Stopping NewBot...")
         self.running = False
         
+        self._log_metrics_summary(force=True)
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        
         # Perform final backup
         if self.backup_manager:
             self.backup_manager.create_backup()
@@ -444,6 +935,8 @@ class NewBot:
             "Trading bot has been stopped",
             priority="medium"
         )
+        # Deliver what is still queued, but do not hang on a dead mail server
+        self.notifier.close()
         
         self.logger.info("NewBot stopped successfully")
     
@@ -454,8 +947,36 @@ class NewBot:
         sys.exit(0)
 
 
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse command line arguments
+    
+    Args:
+        argv: Arguments (default: sys.argv)
+        
+    Returns:
+        Parsed arguments; `command` is None when starting the bot
+    """
+    parser = argparse.ArgumentParser(prog='newbot', description='NewBot - Advanced Trading Bot')
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('run', help='Start the trading bot (default)')
+    add_optimize_arguments(commands.add_parser(
+        'optimize', help='Sweep strategy parameters over stored candles'
+    ))
+    add_walk_forward_arguments(commands.add_parser(
+        'walk-forward', help='Walk-forward optimization over stored candles'
+    ))
+    return parser.parse_args(argv)
+
+
 def main():
     """Main entry point"""
+    args = parse_arguments()
+    if args.command == 'optimize':
+        sys.exit(run_optimize(args))
+    if args.command == 'walk-forward':
+        sys.exit(run_walk_forward(args))
+    
     print("=" * 60)
     print("NewBot - Advanced Trading Bot")
     print("=" * 60)
@@ -53,6 +53,7 @@ class Config:
                 'quote_currency': 'BTC',
                 'trade_amount': 100.0,
                 'max_positions': 5,
+                'scan_concurrency': 8,
             },
             'risk_management': {
                 'stop_loss_percent': 2.0,
@@ -68,9 +69,22 @@ class Config:
                 'sandbox': True,
                 'api_key': os.getenv('BROKER_API_KEY', ''),
                 'api_secret': os.getenv('BROKER_API_SECRET', ''),
+                'ohlcv_cache_size': 1000,
+                'candle_store_dir': 'data/candles',
+                'rate_limit_weight_per_minute': 4800,
+                'mock_slippage_percent': 0.0,
+                'mock_fee_percent': 0.0,
+                'mock_max_fill_ratio': 1.0,
+                'mock_seed': None,
+                'mock_order_retention': 10000,
+                'mock_order_archive': 'data/mock_orders.jsonl',
             },
             'strategy': {
                 'name': 'moving_average_crossover',
+                'timeframe': '1h',
+                'evaluate_on_candle_close': True,
+                'candle_close_delay_seconds': 2,
+                'indicator_cache_mb': 64,
                 'parameters': {
                     'fast_period': 10,
                     'slow_period': 30,
@@ -79,17 +93,32 @@ class Config:
             },
             'notifications': {
                 'enabled': True,
+                'async_delivery': True,
+                'queue_size': 1000,
+                'flush_timeout_seconds': 10,
                 'email': {
                     'enabled': False,
+                    'workers': 1,
                     'smtp_server': '',
                     'smtp_port': 587,
                     'from_address': '',
                     'to_address': '',
                     'password': os.getenv('EMAIL_PASSWORD', ''),
+                    'starttls': True,
+                    'idle_timeout_seconds': 60,
+                    'digest_window_seconds': 0,
                 },
                 'webhook': {
                     'enabled': False,
+                    'workers': 2,
                     'url': '',
+                    'timeout_seconds': 10,
+                    'batch_size': 1,
+                    'batch_window_seconds': 2,
+                    'spool_path': 'data/webhook_spool.jsonl',
+                    'dead_letter_path': 'data/webhook_rejected.jsonl',
+                    'retry_base_delay_seconds': 5,
+                    'retry_max_delay_seconds': 300,
                 }
             },
             'logging': {
@@ -109,6 +138,18 @@ class Config:
                 'check_interval_seconds': 60,
                 'network_timeout_seconds': 30,
                 'max_api_retries': 3,
+                'retry_base_delay_seconds': 0.5,
+                'retry_max_delay_seconds': 8,
+                'rate_limit_backoff_seconds': 30,
+                'circuit_failure_threshold': 5,
+                'circuit_reset_seconds': 30,
+                'async_mode': False,
+                'phase_timeout_seconds': 30,
+                'price_max_age_seconds': 5,
+                'metrics_enabled': True,
+                'metrics_host': '127.0.0.1',
+                'metrics_port': 0,
+                'metrics_log_interval_seconds': 300,
             }
         }
     
@@ -49,11 +49,11 @@ def demo():
     print(f"Fetching market data for {symbol}...")
     market_data = broker.get_market_data(symbol, '1h', limit=50)
     
-    if market_data['data']:
-        latest = market_data['data'][-1]
-        print(f"  Latest Price: €{latest[4]:,.2f}")
-        print(f"  24h High: €{max(candle[2] for candle in market_data['data'][-24:]):,.2f}")
-        print(f"  24h Low: €{min(candle[3] for candle in market_data['data'][-24:]):,.2f}")
+    if len(market_data):
+        last_day = market_data.tail(24)
+        print(f"  Latest Price: €{market_data.last_close:,.2f}")
+        print(f"  24h High: €{last_day.high.max():,.2f}")
+        print(f"  24h Low: €{last_day.low.min():,.2f}")
     print()
     
     # Initialize strategy
@@ -0,0 +1,285 @@
+"""
+Command line interface for NewBot backtesting tools
+
+`python bot.py optimize` sweeps strategy parameters over candles stored
+by the CandleStore (see broker.candle_store_dir); `python bot.py
+walk-forward` runs the same sweep as a walk-forward analysis.
+
+Parameter values are given as `name=start:stop:step` (inclusive range)
+or `name=v1,v2,...`, for example:
+
+    python bot.py optimize --strategy moving_average_crossover \\
+        --param fast_period=5:30:5 --param slow_period=20:100:10 \\
+        --param signal_threshold=0,0.001,0.002 --metric total_pnl
+
+    python bot.py walk-forward --param fast_period=5:30:5 \
+        --param slow_period=20:100:10 --in-sample 2000 --out-of-sample 500
+"""
+
+import argparse
+import json
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from modules.data.candle_store import CandleStore
+from modules.data.market_data import MarketData
+from modules.strategies.strategy_factory import StrategyFactory
+from modules.backtesting.optimizer import METRICS, ParameterSweep, parameter_grid, sample_parameters
+from modules.backtesting.result_cache import ResultCache
+from modules.backtesting.walk_forward import WalkForward
+
+
+def _number(text: str):
+    """Parse an int if possible, otherwise a float"""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_parameter(text: str) -> Tuple[str, List]:
+    """
+    Parse a `name=values` parameter specification
+    
+    Args:
+        text: `name=start:stop:step` or `name=v1,v2,...`
+        
+    Returns:
+        Tuple of (parameter name, candidate values)
+    """
+    name, _, values = text.partition('=')
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f"Expected name=values, got '{text}'")
+    
+    try:
+        if ':' in values:
+            start, stop, step = (_number(part) for part in values.split(':'))
+            if step <= 0:
+                raise ValueError("step must be positive")
+            # Round away float drift so 0:0.003:0.001 ends at 0.003
+            count = int(np.floor((stop - start) / step + 1e-9)) + 1
+            candidates = [start + index * step for index in range(count)]
+            if all(isinstance(item, int) for item in (start, stop, step)):
+                return name, candidates
+            return name, [round(value, 12) for value in candidates]
+        return name, [_number(value) for value in values.split(',')]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(f"Invalid values for '{name}': {e}")
+
+
+def _timestamp_ms(text: Optional[str]) -> Optional[int]:
+    """Convert an ISO date (UTC) to milliseconds"""
+    if text is None:
+        return None
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def load_history(symbol: str, timeframe: str, store_dir: str,
+                 start: Optional[str] = None, end: Optional[str] = None) -> MarketData:
+    """
+    Load stored candles for a backtest
+    
+    Args:
+        symbol: Trading pair symbol
+        timeframe: CCXT timeframe string
+        store_dir: CandleStore directory
+        start: First date (inclusive, ISO format)
+        end: Last date (exclusive, ISO format)
+        
+    Returns:
+        MarketData with the selected candles
+    """
+    candles = CandleStore(store_dir).range(symbol, timeframe, _timestamp_ms(start), _timestamp_ms(end))
+    return MarketData.from_candles(symbol, timeframe, candles)
+
+
+def add_history_arguments(parser: argparse.ArgumentParser):
+    """Arguments selecting the historical candles"""
+    default_symbol = f"{config.get('trading.quote_currency')}/{config.get('trading.base_currency')}"
+    parser.add_argument('--symbol', default=default_symbol, help='Trading pair (default: %(default)s)')
+    parser.add_argument('--timeframe', default=config.get('strategy.timeframe', '1h'),
+                        help='Candle timeframe (default: %(default)s)')
+    parser.add_argument('--store', default=config.get('broker.candle_store_dir', 'data/candles'),
+                        help='Candle store directory (default: %(default)s)')
+    parser.add_argument('--start', help='First date, ISO format (UTC)')
+    parser.add_argument('--end', help='End date, ISO format (UTC, exclusive)')
+
+
+def add_sweep_arguments(parser: argparse.ArgumentParser):
+    """Arguments shared by the parameter search commands"""
+    add_history_arguments(parser)
+    parser.add_argument('--strategy', default=config.get('strategy.name'),
+                        help='StrategyFactory strategy name (default: %(default)s)')
+    parser.add_argument('--param', dest='params', action='append', type=parse_parameter, default=[],
+                        metavar='NAME=VALUES', help='Parameter values to sweep (repeatable)')
+    parser.add_argument('--random', type=int, metavar='N',
+                        help='Evaluate N random combinations instead of the full grid')
+    parser.add_argument('--seed', type=int, help='Random search seed')
+    parser.add_argument('--metric', default='total_pnl', choices=METRICS,
+                        help='Summary metric to rank by (default: %(default)s)')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: all cores)')
+    parser.add_argument('--output', help='Write all results to this JSON file')
+
+
+def add_optimize_arguments(parser: argparse.ArgumentParser):
+    """
+    Register the `optimize` command's arguments
+    
+    Args:
+        parser: Sub-command parser
+    """
+    add_sweep_arguments(parser)
+    parser.add_argument('--top', type=int, default=10, help='Results to print (default: %(default)s)')
+
+
+def add_walk_forward_arguments(parser: argparse.ArgumentParser):
+    """
+    Register the `walk-forward` command's arguments
+    
+    Args:
+        parser: Sub-command parser
+    """
+    add_sweep_arguments(parser)
+    parser.add_argument('--in-sample', type=int, required=True, metavar='BARS',
+                        help='Bars per optimization window')
+    parser.add_argument('--out-of-sample', type=int, required=True, metavar='BARS',
+                        help='Bars per evaluation window (also the step between windows)')
+    parser.add_argument('--warmup', type=int, default=200, metavar='BARS',
+                        help='Indicator warm-up bars before each window (default: %(default)s)')
+    parser.add_argument('--cache', default='data/backtest_cache.db',
+                        help='Result cache database (default: %(default)s)')
+    parser.add_argument('--no-cache', action='store_true', help='Do not read or write the result cache')
+
+
+def _base_parameters(strategy_name: str) -> Dict:
+    """Configured parameters, if they belong to the swept strategy"""
+    if strategy_name == config.get('strategy.name'):
+        return dict(config.get('strategy.parameters', {}) or {})
+    return {}
+
+
+def print_results(results: List[Dict], metric: str, top: int):
+    """Print the best results as a table"""
+    print(f"{'rank':>4}  {metric:>14}{'trades':>8}{'pnl':>14}{'max dd %':>10}  parameters")
+    print("-" * 78)
+    for rank, result in enumerate(results[:top], start=1):
+        print(f"{rank:>4}  {result[metric]:>14.4f}{result['trades']:>8}{result['total_pnl']:>14.2f}"
+              f"{result['max_drawdown_percent']:>10.2f}  {result['parameters']}")
+
+
+def _prepare_sweep(args: argparse.Namespace) -> Optional[Tuple[MarketData, List[Dict]]]:
+    """
+    Load the candles and build the candidate list for a search command
+    
+    Returns:
+        Tuple of (market data, candidates), or None after printing an error
+    """
+    market_data = load_history(args.symbol, args.timeframe, args.store, args.start, args.end)
+    if len(market_data) == 0:
+        print(f"No stored candles for {args.symbol} {args.timeframe} in {args.store}")
+        return None
+    if not args.params:
+        print("Nothing to sweep: pass at least one --param NAME=VALUES")
+        return None
+    
+    try:
+        StrategyFactory.create_strategy(args.strategy, _base_parameters(args.strategy))
+    except ValueError as e:
+        print(e)
+        return None
+    
+    space = dict(args.params)
+    if args.random:
+        return market_data, sample_parameters(space, args.random, args.seed)
+    return market_data, parameter_grid(space)
+
+
+def _write_output(path: Optional[str], results):
+    """Dump results to a JSON file if requested"""
+    if path:
+        with open(path, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nWrote results to {path}")
+
+
+def run_optimize(args: argparse.Namespace) -> int:
+    """
+    Run the `optimize` command
+    
+    Args:
+        args: Parsed arguments
+        
+    Returns:
+        Process exit code
+    """
+    prepared = _prepare_sweep(args)
+    if prepared is None:
+        return 1
+    market_data, candidates = prepared
+    
+    sweep = ParameterSweep(args.strategy, _base_parameters(args.strategy),
+                           metric=args.metric, workers=args.workers)
+    results = sweep.run(market_data, candidates)
+    if not results:
+        print("No valid parameter combinations")
+        return 1
+    
+    print_results(results, args.metric, args.top)
+    _write_output(args.output, results)
+    return 0
+
+
+def _format_time(timestamp: int) -> str:
+    """Format a millisecond timestamp as a UTC date"""
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+def run_walk_forward(args: argparse.Namespace) -> int:
+    """
+    Run the `walk-forward` command
+    
+    Args:
+        args: Parsed arguments
+        
+    Returns:
+        Process exit code
+    """
+    prepared = _prepare_sweep(args)
+    if prepared is None:
+        return 1
+    market_data, candidates = prepared
+    
+    cache = None if args.no_cache else ResultCache(args.cache)
+    analysis = WalkForward(args.strategy, args.in_sample, args.out_of_sample, args.warmup,
+                           _base_parameters(args.strategy), metric=args.metric,
+                           workers=args.workers, cache=cache)
+    try:
+        report = analysis.run(market_data, candidates)
+    finally:
+        if cache is not None:
+            cache.close()
+    
+    if not report['windows']:
+        print(f"No complete window: need at least {args.warmup + args.in_sample + args.out_of_sample} "
+              f"bars, have {len(market_data)}")
+        return 1
+    
+    metric = args.metric
+    print(f"{'window':>6}  {'out-of-sample':<33}{'IS ' + metric:>16}{'OOS ' + metric:>16}  parameters")
+    print("-" * 100)
+    for window in report['windows']:
+        period = f"{_format_time(window['out_of_sample_start'])} - {_format_time(window['out_of_sample_end'])}"
+        print(f"{window['window']:>6}  {period:<33}{window['in_sample'][metric]:>16.4f}"
+              f"{window['out_of_sample'][metric]:>16.4f}  {window['parameters']}")
+    
+    print()
+    for name, value in report['summary'].items():
+        print(f"{name:<36}{value}")
+    _write_output(args.output, report)
+    return 0
@@ -0,0 +1,295 @@
+"""
+Vectorized backtesting engine for NewBot
+
+Replays a strategy over historical candles with the live bot's risk rules:
+
+- BUY opens a long position at the bar's close (one position at a time)
+- Stop-loss and take-profit are set at entry * (1 -/+ percent), as in
+  NewBot._execute_buy()
+- With trailing stops enabled the stop follows close * (1 - trailing
+  percent) whenever that is higher, as in NewBot._adjust_risk_levels()
+- SELL closes the position at the bar's close
+
+Signals for all bars come from one BaseStrategy.generate_signals() call.
+Each trade's exit is then located with array searches over the bars that
+follow its entry, so the Python work scales with the number of trades,
+not the number of bars.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import config
+from modules.data.market_data import MarketData
+from modules.strategies.strategy_factory import BaseStrategy, BUY, SELL
+from utils.logging.logger import Logger
+
+
+# Bars examined in the first exit search window (doubles on each miss)
+_FIRST_WINDOW = 64
+
+
+class BacktestResult:
+    """
+    Trades and equity curve of a backtest run
+    """
+    
+    def __init__(self, trades: List[Dict], equity: np.ndarray, timestamps: np.ndarray,
+                 initial_capital: float):
+        """
+        Initialize result
+        
+        Args:
+            trades: Closed trades in chronological order
+            equity: Equity marked to the close of every bar
+            timestamps: Bar open times in milliseconds
+            initial_capital: Starting capital
+        """
+        self.trades = trades
+        self.equity = equity
+        self.timestamps = timestamps
+        self.initial_capital = initial_capital
+    
+    @property
+    def drawdown(self) -> np.ndarray:
+        """Distance of the equity curve below its running peak, per bar"""
+        if len(self.equity) == 0:
+            return self.equity
+        return np.maximum.accumulate(self.equity) - self.equity
+    
+    def summary(self) -> Dict:
+        """
+        Get headline statistics
+        
+        Returns:
+            Dictionary with trade counts, PnL, return and drawdown figures
+        """
+        pnls = np.array([trade['pnl'] for trade in self.trades], dtype=np.float64)
+        wins = pnls[pnls > 0]
+        losses = pnls[pnls <= 0]
+        total_pnl = float(pnls.sum())
+        
+        max_drawdown = 0.0
+        max_drawdown_percent = 0.0
+        if len(self.equity):
+            peaks = np.maximum.accumulate(self.equity)
+            drawdown = peaks - self.equity
+            max_drawdown = float(drawdown.max())
+            with np.errstate(divide='ignore', invalid='ignore'):
+                max_drawdown_percent = float(np.nanmax(drawdown / peaks) * 100)
+        
+        gross_loss = float(-losses.sum())
+        return {
+            'trades': len(self.trades),
+            'wins': len(wins),
+            'losses': len(losses),
+            'win_rate': len(wins) / len(pnls) * 100 if len(pnls) else 0.0,
+            'total_pnl': total_pnl,
+            'return_percent': total_pnl / self.initial_capital * 100,
+            'profit_factor': float(wins.sum()) / gross_loss if gross_loss > 0 else float('inf'),
+            'max_drawdown': max_drawdown,
+            'max_drawdown_percent': max_drawdown_percent,
+        }
+
+
+class Backtester:
+    """
+    Simulates a strategy over historical market data
+    
+    Risk settings default to the `risk_management` configuration, so a
+    backtest uses the same rules as the running bot.
+    """
+    
+    def __init__(self, strategy: BaseStrategy, amount: Optional[float] = None,
+                 stop_loss_percent: Optional[float] = None,
+                 take_profit_percent: Optional[float] = None,
+                 use_trailing_stop: Optional[bool] = None,
+                 trailing_stop_percent: Optional[float] = None,
+                 initial_capital: float = 10000.0, fee_percent: float = 0.0):
+        """
+        Initialize backtester
+        
+        Args:
+            strategy: Strategy implementing generate_signals()
+            amount: Position size per trade (default trading.trade_amount)
+            stop_loss_percent: Stop-loss distance from entry
+            take_profit_percent: Take-profit distance from entry
+            use_trailing_stop: Whether the stop trails the price
+            trailing_stop_percent: Trailing distance below the price
+            initial_capital: Starting capital for the equity curve
+            fee_percent: Fee charged on the notional of every fill
+        """
+        self.logger = Logger('Backtester')
+        self.strategy = strategy
+        self.amount = amount if amount is not None else config.get('trading.trade_amount', 100.0)
+        self.stop_loss_percent = (stop_loss_percent if stop_loss_percent is not None
+                                  else config.get('risk_management.stop_loss_percent', 2.0))
+        self.take_profit_percent = (take_profit_percent if take_profit_percent is not None
+                                    else config.get('risk_management.take_profit_percent', 5.0))
+        self.use_trailing_stop = (use_trailing_stop if use_trailing_stop is not None
+                                  else config.get('risk_management.use_trailing_stop', False))
+        self.trailing_stop_percent = (trailing_stop_percent if trailing_stop_percent is not None
+                                      else config.get('risk_management.trailing_stop_percent', 1.5))
+        self.initial_capital = initial_capital
+        self.fee_percent = fee_percent
+    
+    def settings(self) -> Dict:
+        """
+        Effective trade and risk settings, after configuration defaults
+        
+        Returns:
+            Dictionary of every setting that affects the result
+        """
+        return {
+            'amount': self.amount,
+            'stop_loss_percent': self.stop_loss_percent,
+            'take_profit_percent': self.take_profit_percent,
+            'use_trailing_stop': self.use_trailing_stop,
+            'trailing_stop_percent': self.trailing_stop_percent,
+            'initial_capital': self.initial_capital,
+            'fee_percent': self.fee_percent,
+        }
+    
+    def run(self, market_data: MarketData, trade_from: int = 0) -> BacktestResult:
+        """
+        Run the backtest
+        
+        Args:
+            market_data: Historical candles, oldest first
+            trade_from: First bar that may open a trade; earlier bars only
+                warm up the indicators
+                
+        Returns:
+            BacktestResult with trades and equity curve
+        """
+        signals = np.asarray(self.strategy.generate_signals(market_data))
+        if len(signals) != len(market_data):
+            raise ValueError(f"Strategy returned {len(signals)} signals for {len(market_data)} bars")
+        
+        close = market_data.close
+        count = len(close)
+        entries = np.flatnonzero(signals == BUY)
+        
+        trades = []
+        position = np.zeros(count)
+        entry_value = np.zeros(count)
+        fees = np.zeros(count)
+        
+        cursor = trade_from
+        while True:
+            index = int(np.searchsorted(entries, cursor))
+            if index >= len(entries):
+                break
+            entry = int(entries[index])
+            if entry >= count - 1:
+                # Nothing left to simulate after the final bar
+                break
+            
+            exit_index, exit_price, reason = self._find_exit(market_data, signals, entry)
+            trade = self._record_trade(market_data, entry, exit_index, exit_price, reason)
+            trades.append(trade)
+            
+            # Held from the entry close up to (not including) the exit bar
+            position[entry:exit_index] = self.amount
+            entry_value[entry:exit_index] = trade['entry_price'] * self.amount
+            fees[entry] += trade['entry_fee']
+            fees[exit_index] += trade['exit_fee']
+            
+            # A stop or target frees the slot within the bar, so a BUY at
+            # that bar's close may open the next trade
+            cursor = exit_index + 1 if reason in ('signal', 'end') else exit_index
+            if cursor >= count:
+                break
+        
+        realized = np.zeros(count)
+        for trade in trades:
+            realized[trade['exit_index']] += trade['pnl'] + trade['exit_fee'] + trade['entry_fee']
+        
+        equity = self.initial_capital + np.cumsum(realized - fees)
+        equity += position * close - entry_value
+        
+        result = BacktestResult(trades, equity[trade_from:], market_data.timestamps[trade_from:],
+                                self.initial_capital)
+        summary = result.summary()
+        self.logger.info(
+            f"Backtest {market_data.symbol} {market_data.timeframe}: {count - trade_from} bars, "
+            f"{summary['trades']} trades, PnL {summary['total_pnl']:.2f}, "
+            f"max drawdown {summary['max_drawdown_percent']:.2f}%"
+        )
+        return result
+    
+    def _find_exit(self, market_data: MarketData, signals: np.ndarray, entry: int):
+        """
+        Locate the exit of a position opened at the close of bar `entry`
+        
+        Returns:
+            Tuple of (exit bar index, exit price, reason)
+        """
+        open_, high, low, close = market_data.open, market_data.high, market_data.low, market_data.close
+        count = len(close)
+        entry_price = close[entry]
+        initial_stop = entry_price * (1 - self.stop_loss_percent / 100)
+        take_profit = entry_price * (1 + self.take_profit_percent / 100)
+        trail = 1 - self.trailing_stop_percent / 100
+        
+        start = entry + 1
+        window = _FIRST_WINDOW
+        peak = entry_price
+        while start < count:
+            end = min(start + window, count)
+            
+            # The stop in force during bar j was set at the close of bar j - 1
+            if self.use_trailing_stop:
+                peaks = np.maximum.accumulate(close[start - 1:end - 1])
+                np.maximum(peaks, peak, out=peaks)
+                stops = np.maximum(peaks * trail, initial_stop)
+            else:
+                stops = np.full(end - start, initial_stop)
+            
+            stop_hit = low[start:end] <= stops
+            target_hit = high[start:end] >= take_profit
+            sell = signals[start:end] == SELL
+            hits = stop_hit | target_hit | sell
+            
+            offset = int(np.argmax(hits))
+            if hits[offset]:
+                bar = start + offset
+                # Within one bar the stop is assumed to trigger first
+                if stop_hit[offset]:
+                    stop = stops[offset]
+                    reason = 'trailing_stop' if stop > initial_stop else 'stop_loss'
+                    return bar, min(open_[bar], stop), reason
+                if target_hit[offset]:
+                    return bar, max(open_[bar], take_profit), 'take_profit'
+                return bar, close[bar], 'signal'
+            
+            if self.use_trailing_stop:
+                peak = max(float(peaks[-1]), float(close[end - 1]))
+            start = end
+            window *= 2
+        
+        return count - 1, close[count - 1], 'end'
+    
+    def _record_trade(self, market_data: MarketData, entry: int, exit_index: int,
+                      exit_price: float, reason: str) -> Dict:
+        """Build the trade record for one round trip"""
+        entry_price = float(market_data.close[entry])
+        exit_price = float(exit_price)
+        entry_fee = entry_price * self.amount * self.fee_percent / 100
+        exit_fee = exit_price * self.amount * self.fee_percent / 100
+        pnl = (exit_price - entry_price) * self.amount - entry_fee - exit_fee
+        return {
+            'entry_index': entry,
+            'exit_index': exit_index,
+            'entry_time': int(market_data.timestamps[entry]),
+            'exit_time': int(market_data.timestamps[exit_index]),
+            'entry_price': entry_price,
+            'exit_price': exit_price,
+            'amount': self.amount,
+            'entry_fee': entry_fee,
+            'exit_fee': exit_fee,
+            'pnl': pnl,
+            'pnl_percent': pnl / (entry_price * self.amount) * 100,
+            'exit_reason': reason,
+        }
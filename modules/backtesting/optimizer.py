@@ -0,0 +1,289 @@
+"""
+Parameter sweep for NewBot strategies
+
+Backtests many parameter combinations of a StrategyFactory strategy on a
+process pool. The candle arrays are placed in shared memory once and
+every worker maps them read-only, so tasks only carry a small parameter
+dictionary instead of a pickled copy of the history.
+"""
+
+import itertools
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.data.market_data import MarketData, PRICE_COLUMNS
+from modules.strategies.strategy_factory import StrategyFactory
+from modules.backtesting.engine import Backtester
+from utils.logging.logger import Logger
+
+
+# BacktestResult.summary() keys that results can be ranked by
+METRICS = ('total_pnl', 'return_percent', 'profit_factor', 'win_rate', 'trades',
+           'wins', 'losses', 'max_drawdown', 'max_drawdown_percent')
+
+# Summary metrics where a smaller value ranks higher
+MINIMIZE_METRICS = {'losses', 'max_drawdown', 'max_drawdown_percent'}
+
+
+def parameter_grid(space: Dict[str, Sequence]) -> List[Dict]:
+    """
+    Expand a parameter space into every combination
+    
+    Args:
+        space: Parameter name -> candidate values
+        
+    Returns:
+        List of parameter dictionaries
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def sample_parameters(space: Dict[str, Sequence], samples: int, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Draw distinct random combinations from a parameter space
+    
+    Args:
+        space: Parameter name -> candidate values
+        samples: Number of combinations
+        seed: Random seed for reproducible searches
+        
+    Returns:
+        List of parameter dictionaries (the full grid if it is smaller)
+    """
+    names = list(space)
+    sizes = [len(space[name]) for name in names]
+    total = int(np.prod(sizes)) if sizes else 0
+    if samples >= total:
+        return parameter_grid(space)
+    
+    # Sample flat grid positions, then decode them without building the grid
+    rng = random.Random(seed)
+    candidates = []
+    for position in rng.sample(range(total), samples):
+        combination = {}
+        for name, size in zip(reversed(names), reversed(sizes)):
+            position, offset = divmod(position, size)
+            combination[name] = space[name][offset]
+        candidates.append({name: combination[name] for name in names})
+    return candidates
+
+
+def rank_results(results: List[Dict], metric: str) -> List[Dict]:
+    """
+    Sort sweep results best first
+    
+    Args:
+        results: Result dictionaries containing the metric
+        metric: Summary key to rank by
+        
+    Returns:
+        Sorted list
+    """
+    descending = metric not in MINIMIZE_METRICS
+    return sorted(results, key=lambda result: result[metric], reverse=descending)
+
+
+class SharedCandles:
+    """
+    Candle arrays copied once into a shared memory block
+    
+    Layout: int64 timestamps followed by the (5, n) float64 price block.
+    """
+    
+    def __init__(self, market_data: MarketData):
+        """
+        Copy market data into shared memory
+        
+        Args:
+            market_data: Candles to share
+        """
+        count = len(market_data)
+        self.shm = shared_memory.SharedMemory(create=True, size=max(count * 8 * (1 + len(PRICE_COLUMNS)), 1))
+        timestamps, prices = self._views(self.shm, count)
+        timestamps[:] = market_data.timestamps
+        prices[0], prices[1], prices[2] = market_data.open, market_data.high, market_data.low
+        prices[3], prices[4] = market_data.close, market_data.volume
+        self.descriptor = (self.shm.name, count, market_data.symbol, market_data.timeframe)
+    
+    @staticmethod
+    def _views(shm: shared_memory.SharedMemory, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Array views over the shared block"""
+        timestamps = np.ndarray((count,), dtype=np.int64, buffer=shm.buf)
+        prices = np.ndarray((len(PRICE_COLUMNS), count), dtype=np.float64, buffer=shm.buf, offset=count * 8)
+        return timestamps, prices
+    
+    @classmethod
+    def attach(cls, descriptor: Tuple) -> Tuple[shared_memory.SharedMemory, MarketData]:
+        """
+        Map a shared block created by another process
+        
+        Args:
+            descriptor: SharedCandles.descriptor of the owner
+            
+        Returns:
+            Tuple of (shared memory handle, zero-copy MarketData)
+        """
+        name, count, symbol, timeframe = descriptor
+        # Pool workers share the owner's resource tracker, so attaching
+        # does not hand them ownership; only the owner unlinks the block
+        shm = shared_memory.SharedMemory(name=name)
+        timestamps, prices = cls._views(shm, count)
+        return shm, MarketData(symbol, timeframe, timestamps, prices)
+    
+    def close(self):
+        """Release and remove the shared block"""
+        self.shm.close()
+        self.shm.unlink()
+    
+    def __enter__(self) -> 'SharedCandles':
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def _evaluate(strategy_name: str, base_parameters: Dict, backtest_options: Dict,
+              market_data: MarketData, parameters: Dict, trade_from: int = 0) -> Optional[Dict]:
+    """
+    Backtest one parameter combination
+    
+    Returns:
+        Summary with the parameters, or None if the combination is invalid
+    """
+    strategy = StrategyFactory.create_strategy(strategy_name, {**base_parameters, **parameters})
+    if not strategy.validate_parameters():
+        return None
+    summary = Backtester(strategy, **backtest_options).run(market_data, trade_from).summary()
+    return {'parameters': parameters, **summary}
+
+
+# State of a pool worker process, set up once by _init_worker()
+_worker: Dict = {}
+
+
+def _init_worker(descriptor: Tuple, strategy_name: str, base_parameters: Dict, backtest_options: Dict):
+    """Attach a pool worker to the shared candles"""
+    # Per-run INFO logs from thousands of backtests would flood the console
+    logging.disable(logging.INFO)
+    shm, market_data = SharedCandles.attach(descriptor)
+    _worker.update(shm=shm, market_data=market_data, strategy_name=strategy_name,
+                   base_parameters=base_parameters, backtest_options=backtest_options)
+
+
+def _evaluate_in_worker(parameters: Dict) -> Optional[Dict]:
+    """Pool task: backtest one combination against the shared candles"""
+    return _evaluate(_worker['strategy_name'], _worker['base_parameters'],
+                     _worker['backtest_options'], _worker['market_data'], parameters)
+
+
+def _evaluate_segment(strategy_name: str, base_parameters: Dict, backtest_options: Dict,
+                      market_data: MarketData, task: Tuple[int, int, int, Dict]) -> Optional[Dict]:
+    """Backtest one combination on bars trade_from..end-1 (warmed up from start)"""
+    start, trade_from, end, parameters = task
+    return _evaluate(strategy_name, base_parameters, backtest_options,
+                     market_data.slice(start, end), parameters, trade_from - start)
+
+
+def _evaluate_segment_in_worker(task: Tuple[int, int, int, Dict]) -> Optional[Dict]:
+    """Pool task: backtest one combination on a segment of the shared candles"""
+    return _evaluate_segment(_worker['strategy_name'], _worker['base_parameters'],
+                             _worker['backtest_options'], _worker['market_data'], task)
+
+
+class ParameterSweep:
+    """
+    Backtests parameter combinations in parallel and ranks them
+    """
+    
+    def __init__(self, strategy_name: str, base_parameters: Optional[Dict] = None,
+                 backtest_options: Optional[Dict] = None, metric: str = 'total_pnl',
+                 workers: Optional[int] = None):
+        """
+        Initialize sweep
+        
+        Args:
+            strategy_name: StrategyFactory strategy name
+            base_parameters: Parameters shared by every combination
+            backtest_options: Keyword arguments for Backtester
+            metric: BacktestResult.summary() key to rank by
+            workers: Worker processes (default: all cores; 1 runs in-process)
+        """
+        self.logger = Logger('ParameterSweep')
+        self.strategy_name = strategy_name
+        self.base_parameters = base_parameters or {}
+        self.backtest_options = backtest_options or {}
+        self.metric = metric
+        self.workers = workers or os.cpu_count() or 1
+    
+    def run(self, market_data: MarketData, candidates: List[Dict]) -> List[Dict]:
+        """
+        Backtest all candidates
+        
+        Args:
+            market_data: Historical candles
+            candidates: Parameter combinations
+            
+        Returns:
+            Results ranked best first; each holds 'parameters' plus the
+            backtest summary
+        """
+        self.logger.info(
+            f"Sweeping {len(candidates)} {self.strategy_name} combinations "
+            f"on {len(market_data)} bars with {self.workers} workers"
+        )
+        
+        if self.workers == 1 or len(candidates) <= 1:
+            results = [
+                _evaluate(self.strategy_name, self.base_parameters, self.backtest_options,
+                          market_data, parameters)
+                for parameters in candidates
+            ]
+        else:
+            results = self._run_pool(market_data, _evaluate_in_worker, candidates)
+        
+        valid = [result for result in results if result is not None]
+        if len(valid) < len(results):
+            self.logger.info(f"Skipped {len(results) - len(valid)} invalid combinations")
+        return rank_results(valid, self.metric)
+    
+    def run_segments(self, market_data: MarketData,
+                     tasks: List[Tuple[int, int, int, Dict]]) -> List[Optional[Dict]]:
+        """
+        Backtest combinations on segments of the history
+        
+        Used by walk-forward analysis, where every window is a segment.
+        Bars from `start` only warm up the indicators; trades are taken
+        from `trade_from` up to `end` (exclusive).
+        
+        Args:
+            market_data: Full historical candles
+            tasks: (start, trade_from, end, parameters) tuples
+            
+        Returns:
+            One result (or None if invalid) per task, in task order
+        """
+        if self.workers == 1 or len(tasks) <= 1:
+            return [
+                _evaluate_segment(self.strategy_name, self.base_parameters, self.backtest_options,
+                                  market_data, task)
+                for task in tasks
+            ]
+        return self._run_pool(market_data, _evaluate_segment_in_worker, tasks)
+    
+    def _run_pool(self, market_data: MarketData, function: Callable, tasks: List) -> List[Optional[Dict]]:
+        """Fan tasks out to worker processes"""
+        chunksize = max(1, len(tasks) // (self.workers * 8))
+        with SharedCandles(market_data) as shared:
+            with ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(shared.descriptor, self.strategy_name, self.base_parameters, self.backtest_options),
+            ) as pool:
+                return list(pool.map(function, tasks, chunksize=chunksize))
@@ -0,0 +1,118 @@
+"""
+On-disk cache of backtest results
+
+Stores backtest summaries in SQLite, keyed by a digest of everything that
+determines the result (strategy, parameters, backtest options and the
+candles themselves). Re-running an analysis after more candles arrived
+only evaluates segments that were not seen before.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from modules.data.market_data import MarketData
+
+
+def fingerprint(market_data: MarketData) -> str:
+    """
+    Digest of a candle range
+    
+    Args:
+        market_data: Candles to identify
+        
+    Returns:
+        Hex digest that changes if any candle changes
+    """
+    digest = hashlib.sha1()
+    digest.update(np.ascontiguousarray(market_data.timestamps).tobytes())
+    for column in (market_data.open, market_data.high, market_data.low,
+                   market_data.close, market_data.volume):
+        digest.update(np.ascontiguousarray(column).tobytes())
+    return digest.hexdigest()
+
+
+def result_key(*parts) -> str:
+    """
+    Build a cache key from JSON-serializable parts
+    
+    Returns:
+        Hex digest of the parts
+    """
+    payload = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    SQLite-backed key/value store for backtest summaries
+    """
+    
+    def __init__(self, path: str = 'data/backtest_cache.db'):
+        """
+        Initialize cache
+        
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        """
+        Look up several results
+        
+        Args:
+            keys: Cache keys
+            
+        Returns:
+            Dictionary of the keys that were found (values may be None for
+            combinations recorded as invalid)
+        """
+        keys = list(keys)
+        found = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for offset in range(0, len(keys), 500):
+                batch = keys[offset:offset + 500]
+                placeholders = ','.join('?' * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, value FROM results WHERE key IN ({placeholders})", batch
+                )
+                for key, value in rows:
+                    found[key] = json.loads(value)
+        return found
+    
+    def put_many(self, items: List[Tuple[str, Optional[Dict]]]):
+        """
+        Store several results
+        
+        Args:
+            items: (key, result) pairs
+        """
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in items]
+            )
+            self._conn.commit()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+    
+    def close(self):
+        """Close the database"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,192 @@
+"""
+Walk-forward optimization for NewBot strategies
+
+History is split into rolling windows: parameters are optimized on an
+in-sample segment and then traded unchanged on the out-of-sample segment
+that follows it. Each window advances by the out-of-sample length, so
+the out-of-sample segments tile the history without overlap.
+
+All (window, parameters) backtests go to one ParameterSweep process
+pool, so windows are evaluated concurrently. With a ResultCache, results
+are stored on disk keyed by the candles they ran on, so a re-run after
+new candles arrived only evaluates the new windows.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from modules.data.market_data import MarketData
+from modules.backtesting.engine import Backtester
+from modules.backtesting.optimizer import ParameterSweep, rank_results
+from modules.backtesting.result_cache import ResultCache, fingerprint, result_key
+from utils.logging.logger import Logger
+
+
+class WalkForward:
+    """
+    Rolling in-sample optimization / out-of-sample evaluation
+    """
+    
+    def __init__(self, strategy_name: str, in_sample: int, out_of_sample: int, warmup: int = 200,
+                 base_parameters: Optional[Dict] = None, backtest_options: Optional[Dict] = None,
+                 metric: str = 'total_pnl', workers: Optional[int] = None,
+                 cache: Optional[ResultCache] = None):
+        """
+        Initialize walk-forward analysis
+        
+        Args:
+            strategy_name: StrategyFactory strategy name
+            in_sample: Bars per in-sample (optimization) segment
+            out_of_sample: Bars per out-of-sample (evaluation) segment
+            warmup: Bars before each segment used only to warm up indicators
+            base_parameters: Parameters shared by every combination
+            backtest_options: Keyword arguments for Backtester
+            metric: BacktestResult.summary() key used to pick parameters
+            workers: Worker processes (default: all cores)
+            cache: Optional on-disk result cache
+        """
+        self.logger = Logger('WalkForward')
+        self.strategy_name = strategy_name
+        self.in_sample = in_sample
+        self.out_of_sample = out_of_sample
+        self.warmup = warmup
+        self.base_parameters = base_parameters or {}
+        self.backtest_options = backtest_options or {}
+        self.metric = metric
+        self.cache = cache
+        self.sweep = ParameterSweep(strategy_name, self.base_parameters, self.backtest_options,
+                                    metric=metric, workers=workers)
+    
+    def windows(self, count: int) -> List[Tuple[int, int, int]]:
+        """
+        Split a history into windows
+        
+        Windows are anchored at the first bar, so appending candles never
+        changes the existing windows.
+        
+        Args:
+            count: Number of bars
+            
+        Returns:
+            List of (in-sample start, out-of-sample start, out-of-sample end)
+            bar indices
+        """
+        windows = []
+        in_sample_start = self.warmup
+        while in_sample_start + self.in_sample + self.out_of_sample <= count:
+            out_of_sample_start = in_sample_start + self.in_sample
+            windows.append((in_sample_start, out_of_sample_start, out_of_sample_start + self.out_of_sample))
+            in_sample_start += self.out_of_sample
+        return windows
+    
+    def _evaluate(self, market_data: MarketData, segments: List[Tuple[int, int, Dict]]) -> List[Optional[Dict]]:
+        """
+        Backtest (trade_from, end, parameters) segments, through the cache
+        
+        Returns:
+            One result (or None if invalid) per segment
+        """
+        tasks = [(max(trade_from - self.warmup, 0), trade_from, end, parameters)
+                 for trade_from, end, parameters in segments]
+        
+        # Key on the settings the backtests actually use: options left out
+        # fall back to the current risk configuration
+        settings = Backtester(None, **self.backtest_options).settings()
+        
+        # Fingerprint each distinct candle range once
+        digests = {}
+        keys = []
+        for start, trade_from, end, parameters in tasks:
+            if (start, end) not in digests:
+                digests[(start, end)] = fingerprint(market_data.slice(start, end))
+            keys.append(result_key(self.strategy_name, self.base_parameters, settings,
+                                   digests[(start, end)], trade_from - start, parameters))
+        
+        cached = self.cache.get_many(keys) if self.cache is not None else {}
+        missing = [index for index, key in enumerate(keys) if key not in cached]
+        self.logger.info(f"{len(tasks) - len(missing)} of {len(tasks)} backtests cached, "
+                         f"running {len(missing)}")
+        
+        computed = self.sweep.run_segments(market_data, [tasks[index] for index in missing]) if missing else []
+        if self.cache is not None and computed:
+            self.cache.put_many([(keys[index], result) for index, result in zip(missing, computed)])
+        
+        results = [cached.get(key) for key in keys]
+        for index, result in zip(missing, computed):
+            results[index] = result
+        return results
+    
+    def run(self, market_data: MarketData, candidates: List[Dict]) -> Dict:
+        """
+        Run the walk-forward analysis
+        
+        Args:
+            market_data: Historical candles
+            candidates: Parameter combinations to optimize over
+            
+        Returns:
+            Dictionary with per-window reports ('windows') and the
+            aggregated out-of-sample performance ('summary')
+        """
+        windows = self.windows(len(market_data))
+        self.logger.info(
+            f"Walk-forward {self.strategy_name}: {len(windows)} windows x "
+            f"{len(candidates)} combinations on {len(market_data)} bars"
+        )
+        
+        # In-sample: every combination on every window, all in one pool run
+        segments = [(in_start, out_start, parameters)
+                    for in_start, out_start, _ in windows for parameters in candidates]
+        in_sample_results = self._evaluate(market_data, segments)
+        
+        best = []
+        for index in range(len(windows)):
+            window_results = in_sample_results[index * len(candidates):(index + 1) * len(candidates)]
+            ranked = rank_results([result for result in window_results if result is not None], self.metric)
+            best.append(ranked[0] if ranked else None)
+        
+        # Out-of-sample: each window's winner on the following segment
+        chosen = [index for index, result in enumerate(best) if result is not None]
+        out_of_sample_results = self._evaluate(market_data, [
+            (windows[index][1], windows[index][2], best[index]['parameters']) for index in chosen
+        ])
+        
+        timestamps = market_data.timestamps
+        reports = []
+        for index, out_of_sample in zip(chosen, out_of_sample_results):
+            in_start, out_start, out_end = windows[index]
+            reports.append({
+                'window': index,
+                'in_sample_start': int(timestamps[in_start]),
+                'out_of_sample_start': int(timestamps[out_start]),
+                'out_of_sample_end': int(timestamps[out_end - 1]),
+                'parameters': best[index]['parameters'],
+                'in_sample': best[index],
+                'out_of_sample': out_of_sample,
+            })
+        
+        return {'windows': reports, 'summary': self._aggregate(reports)}
+    
+    def _aggregate(self, reports: List[Dict]) -> Dict:
+        """Combine the out-of-sample results of all windows"""
+        if not reports:
+            return {'windows': 0}
+        
+        out_of_sample = [report['out_of_sample'] for report in reports]
+        in_sample = [report['in_sample'] for report in reports]
+        total_pnl = sum(result['total_pnl'] for result in out_of_sample)
+        in_sample_pnl = sum(result['total_pnl'] for result in in_sample)
+        
+        # Out-of-sample PnL per bar relative to in-sample PnL per bar
+        efficiency = None
+        if in_sample_pnl > 0:
+            efficiency = (total_pnl / self.out_of_sample) / (in_sample_pnl / self.in_sample)
+        
+        return {
+            'windows': len(reports),
+            'trades': sum(result['trades'] for result in out_of_sample),
+            'total_pnl': total_pnl,
+            'profitable_windows': sum(1 for result in out_of_sample if result['total_pnl'] > 0),
+            f'mean_in_sample_{self.metric}': sum(result[self.metric] for result in in_sample) / len(reports),
+            f'mean_out_of_sample_{self.metric}': sum(result[self.metric] for result in out_of_sample) / len(reports),
+            'walk_forward_efficiency': efficiency,
+        }
@@ -0,0 +1,164 @@
+"""
+Broker call accounting for NewBot
+
+Two levels are measured, both per trading loop phase (see
+utils.monitoring.metrics.loop_phase):
+
+- Exchange requests: every request attempt a broker sends through
+  BaseBroker._call() records its latency, response bytes, exchange
+  request weight and rate limit wait per endpoint (e.g. 'fetch_ohlcv').
+  The broker's rate limiter is charged per attempt too, so the budget
+  pays for exactly the requests sent: a get_market_data() answered from
+  the OHLCV cache costs nothing, a gap backfill pays for every page and
+  a retry pays again.
+- Broker methods: meter_broker() times the public BaseBroker methods
+  (cache hits included) to show what each call costs the loop.
+"""
+
+import functools
+import inspect
+import time
+from typing import Dict, List
+
+from utils.monitoring.metrics import MetricsRegistry, current_phase, metrics
+
+
+CALL_SECONDS = 'broker_call_seconds'
+REQUEST_SECONDS = 'broker_request_seconds'
+WEIGHT_TOTAL = 'broker_request_weight_total'
+BYTES_TOTAL = 'broker_response_bytes_total'
+WAIT_TOTAL = 'broker_rate_limit_wait_seconds_total'
+
+
+def local_helper(method):
+    """Mark a BaseBroker method that never talks to the exchange, so it is not metered"""
+    method.local_helper = True
+    return method
+
+
+def broker_methods() -> tuple:
+    """Public BaseBroker API; implementations are metered where they define them"""
+    from modules.brokers.broker_factory import BaseBroker
+    return tuple(
+        name for name, member in vars(BaseBroker).items()
+        if not name.startswith('_') and inspect.isfunction(member)
+        and not getattr(member, 'local_helper', False)
+    )
+
+
+def record_weight(registry: MetricsRegistry, endpoint: str, weight: float, waited: float):
+    """
+    Store the rate limit weight drawn by one request attempt
+    
+    Args:
+        registry: Metrics registry
+        endpoint: Exchange endpoint (e.g. 'fetch_ticker')
+        weight: Exchange request weight
+        waited: Seconds spent waiting for the rate limit
+    """
+    phase = current_phase.get()
+    if weight:
+        registry.increment(WEIGHT_TOTAL, weight, endpoint=endpoint, phase=phase)
+    if waited:
+        registry.increment(WAIT_TOTAL, waited, endpoint=endpoint, phase=phase)
+
+
+def record_request(registry: MetricsRegistry, endpoint: str, elapsed: float, error: bool, size: int):
+    """
+    Store one exchange request attempt's latency and response size
+    
+    Args:
+        registry: Metrics registry
+        endpoint: Exchange endpoint (e.g. 'fetch_ticker')
+        elapsed: Request duration in seconds
+        error: Whether the request failed
+        size: Response bytes (0 if unknown)
+    """
+    phase = current_phase.get()
+    registry.observe(REQUEST_SECONDS, elapsed, error, endpoint=endpoint, phase=phase)
+    if size:
+        registry.increment(BYTES_TOTAL, size, endpoint=endpoint, phase=phase)
+
+
+def _metered(name: str, method, registry: MetricsRegistry):
+    """Wrap one bound broker method"""
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(*args, **kwargs):
+            phase = current_phase.get()
+            start = time.perf_counter()
+            error = True
+            try:
+                result = await method(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                registry.observe(CALL_SECONDS, time.perf_counter() - start, error, method=name, phase=phase)
+        return async_wrapper
+    
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        phase = current_phase.get()
+        start = time.perf_counter()
+        error = True
+        try:
+            result = method(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            registry.observe(CALL_SECONDS, time.perf_counter() - start, error, method=name, phase=phase)
+    return wrapper
+
+
+def meter_broker(broker, registry: MetricsRegistry = metrics):
+    """
+    Account a broker's exchange requests and time its public methods
+    
+    Methods inherited from BaseBroker unchanged (such as the default
+    to_thread async wrappers) are left alone: they delegate to metered
+    methods, so wrapping them too would count each call twice.
+    
+    Args:
+        broker: Broker instance (wrapped in place)
+        registry: Metrics registry receiving the measurements
+        
+    Returns:
+        The same broker
+    """
+    from modules.brokers.broker_factory import BaseBroker
+    broker.request_metrics = registry
+    for name in broker_methods():
+        if getattr(type(broker), name, None) is getattr(BaseBroker, name):
+            continue
+        setattr(broker, name, _metered(name, getattr(broker, name), registry))
+    return broker
+
+
+def weight_by_phase(registry: MetricsRegistry = metrics) -> List[str]:
+    """
+    Summarise request weight and traffic per loop phase, heaviest first
+    
+    Returns:
+        Log lines such as `evaluate_signals: weight=1240 (81%) requests=620
+        bytes=2.1MB wait=0.0s`
+    """
+    histograms, counters = registry.snapshot()
+    totals: Dict[str, Dict[str, float]] = {}
+    
+    def add(series: Dict, field: str):
+        for labels, value in series.items():
+            phase = dict(labels).get('phase', 'idle')
+            entry = totals.setdefault(phase, {'weight': 0.0, 'requests': 0, 'bytes': 0.0, 'wait': 0.0})
+            entry[field] += value
+    
+    add({labels: data[1] for labels, data in histograms.get(REQUEST_SECONDS, {}).items()}, 'requests')
+    add(counters.get(WEIGHT_TOTAL, {}), 'weight')
+    add(counters.get(BYTES_TOTAL, {}), 'bytes')
+    add(counters.get(WAIT_TOTAL, {}), 'wait')
+    
+    total_weight = sum(entry['weight'] for entry in totals.values()) or 1
+    return [
+        f"{phase}: weight={entry['weight']:.0f} ({entry['weight'] / total_weight:.0%}) "
+        f"requests={entry['requests']:.0f} bytes={entry['bytes'] / 1e6:.1f}MB wait={entry['wait']:.1f}s"
+        for phase, entry in sorted(totals.items(), key=lambda item: -item[1]['weight'])
+    ]
@@ -4,9 +4,14 @@ Binance Broker Implementation
 Handles integration with Binance exchange using CCXT library
 """
 
+import asyncio
 import ccxt
-from typing import Optional
+import ccxt.async_support as ccxt_async
+from typing import Dict, List, Optional
 from modules.brokers.broker_factory import BaseBroker
+from modules.brokers.ohlcv_cache import OHLCVCache
+from modules.data.candle_store import CandleStore
+from modules.data.market_data import MarketData
 
 
 class BinanceBroker(BaseBroker):
@@ -14,28 +19,65 @@ class BinanceBroker(BaseBroker):
     Binance broker implementation using CCXT
     """
     
-    def __init__(self, api_key: str, api_secret: str, sandbox: bool = True):
+    # Binance spot REQUEST_WEIGHT costs of the endpoints behind each request
+    REQUEST_WEIGHTS = {
+        'load_markets': 20,       # exchangeInfo
+        'fetch_balance': 20,      # account
+        'fetch_open_orders': 80,  # openOrders without a symbol (6 with one)
+        'fetch_order': 4,         # order
+        'fetch_ohlcv': 2,         # klines
+        'fetch_ticker': 2,        # ticker/24hr for one symbol
+        'create_order': 1,
+        'cancel_order': 1,
+    }
+    
+    # ccxt.NetworkError covers timeouts, DDoS protection, rate limiting
+    # and maintenance (ExchangeNotAvailable)
+    TRANSIENT_ERRORS = (ccxt.NetworkError,)
+    
+    # HTTP 429/418: retrying quickly only extends the ban
+    RATE_LIMIT_ERRORS = (ccxt.RateLimitExceeded, ccxt.DDoSProtection)
+    
+    # fetch_tickers returns the whole watchlist in one request
+    BULK_TICKERS = True
+    
+    def __init__(self, api_key: str, api_secret: str, sandbox: bool = True,
+                 ohlcv_cache_size: int = 1000, candle_store_dir: Optional[str] = None,
+                 enable_rate_limit: bool = True, network_timeout: float = 30):
         """Initialize Binance broker"""
         super().__init__(api_key, api_secret, sandbox)
+        self.enable_rate_limit = enable_rate_limit
+        self.network_timeout = network_timeout
+        self.async_exchange = None
+        # Async clients replaced by reconnect(), closed on the event loop
+        self._retired_async_exchanges = []
+        self._async_exchange_lock: Optional[asyncio.Lock] = None
+        store = CandleStore(candle_store_dir) if candle_store_dir else None
+        self.ohlcv_cache = OHLCVCache(capacity=ohlcv_cache_size, store=store)
         self._init_exchange()
     
+    def _exchange_config(self) -> dict:
+        """CCXT exchange options shared by the sync and async clients"""
+        return {
+            'apiKey': self.api_key,
+            'secret': self.api_secret,
+            'enableRateLimit': self.enable_rate_limit,
+            'timeout': int(self.network_timeout * 1000),
+            'options': {
+                'defaultType': 'spot',  # spot, margin, future
+            }
+        }
+    
     def _init_exchange(self):
         """Initialize CCXT exchange"""
         try:
-            self.exchange = ccxt.binance({
-                'apiKey': self.api_key,
-                'secret': self.api_secret,
-                'enableRateLimit': True,
-                'options': {
-                    'defaultType': 'spot',  # spot, margin, future
-                }
-            })
+            self.exchange = ccxt.binance(self._exchange_config())
             
             if self.sandbox:
                 self.exchange.set_sandbox_mode(True)
             
             # Test connection
-            self.exchange.load_markets()
+            self._call('load_markets', self.exchange.load_markets)
             self.connected = True
             self.logger.info("Connected to Binance")
             
@@ -43,14 +85,63 @@ class BinanceBroker(BaseBroker):
             self.logger.error(f"Failed to connect to Binance: {e}")
             self.connected = False
     
+    def request_weight(self, method: str, args: tuple, kwargs: dict) -> float:
+        """Exchange request weight of a request (ticker/24hr scales with symbols)"""
+        if method == 'fetch_tickers':
+            symbols = args[0] if args else kwargs.get('symbols')
+            count = len(symbols) if symbols else 0
+            if not count or count > 100:
+                return 80
+            return 2 if count <= 20 else 40
+        if method == 'fetch_open_orders' and (args or kwargs.get('symbol')):
+            return 6
+        return super().request_weight(method, args, kwargs)
+    
+    def last_response_size(self, asynchronous: bool = False) -> int:
+        """Size of the last HTTP response body of the sync or async client"""
+        exchange = self.async_exchange if asynchronous else getattr(self, 'exchange', None)
+        response = getattr(exchange, 'last_http_response', None)
+        return len(response) if response else 0
+    
+    def retry_after(self, asynchronous: bool = False) -> Optional[float]:
+        """Retry-After header of the last HTTP response of the sync or async client"""
+        exchange = self.async_exchange if asynchronous else getattr(self, 'exchange', None)
+        headers = getattr(exchange, 'last_response_headers', None) or {}
+        value = headers.get('Retry-After') or headers.get('retry-after')
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+    
+    def _client_timeout(self) -> Optional[float]:
+        """Timeout the ccxt clients enforce (network_timeout_seconds)"""
+        return self.network_timeout
+    
+    def _request(self, endpoint: str, *args, idempotent: bool = True, **kwargs):
+        """Call a sync ccxt endpoint with retries, timeout and circuit breaker"""
+        return self._call(endpoint, getattr(self.exchange, endpoint), *args, idempotent=idempotent, **kwargs)
+    
+    async def _request_async(self, endpoint: str, *args, idempotent: bool = True, **kwargs):
+        """Call an async ccxt endpoint with retries, timeout and circuit breaker"""
+        exchange = await self._get_async_exchange()
+        return await self._call_async(endpoint, getattr(exchange, endpoint), *args,
+                                      idempotent=idempotent, **kwargs)
+    
     def reconnect(self):
         """Reconnect to Binance"""
         self._init_exchange()
+        # The async client is bound to the event loop that created it, so it
+        # is rebuilt lazily on the next async call instead of here. Closing
+        # its aiohttp session needs that loop too, so it is retired and
+        # closed there.
+        exchange, self.async_exchange = self.async_exchange, None
+        if exchange is not None:
+            self._retired_async_exchanges.append(exchange)
     
     def get_positions(self) -> list:
         """Get all open positions"""
         try:
-            balance = self.exchange.fetch_balance()
+            balance = self._request('fetch_balance')
             positions = []
             
             for currency, amount in balance['total'].items():
@@ -69,62 +160,70 @@ class BinanceBroker(BaseBroker):
     def get_open_orders(self) -> list:
         """Get all open orders"""
         try:
-            return self.exchange.fetch_open_orders()
+            return self._request('fetch_open_orders')
         except Exception as e:
             self.logger.error(f"Failed to get open orders: {e}")
             return []
     
-    def get_order_status(self, order_id: str) -> str:
+    def get_order_status(self, order_id: str, symbol: str = None) -> str:
         """Get order status"""
         try:
-            order = self.exchange.fetch_order(order_id)
+            order = self._request('fetch_order', order_id, symbol)
             return order['status']
         except Exception as e:
             self.logger.error(f"Failed to get order status: {e}")
             return 'unknown'
     
-    def get_market_data(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> dict:
+    def get_market_data(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> MarketData:
         """Get market data (OHLCV)"""
         try:
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            return {
-                'symbol': symbol,
-                'timeframe': timeframe,
-                'data': ohlcv
-            }
+            ohlcv = self.ohlcv_cache.fetch_window(
+                symbol, timeframe, limit,
+                lambda since, count: self._request('fetch_ohlcv', symbol, timeframe, since=since, limit=count)
+            )
+            return MarketData.from_rows(symbol, timeframe, ohlcv)
         except Exception as e:
             self.logger.error(f"Failed to get market data: {e}")
-            return {'symbol': symbol, 'timeframe': timeframe, 'data': []}
+            return MarketData.empty(symbol, timeframe)
     
     def get_current_price(self, symbol: str) -> float:
         """Get current market price"""
         try:
-            ticker = self.exchange.fetch_ticker(symbol)
+            ticker = self._request('fetch_ticker', symbol)
             return ticker['last']
         except Exception as e:
             self.logger.error(f"Failed to get current price: {e}")
             return 0.0
     
+    def get_tickers(self, symbols: List[str]) -> Dict[str, float]:
+        """Get current prices for several symbols in one request"""
+        try:
+            tickers = self._request('fetch_tickers', symbols)
+            return {symbol: ticker['last'] for symbol, ticker in tickers.items()}
+        except Exception as e:
+            self.logger.error(f"Failed to get tickers: {e}")
+            return {}
+    
     def place_order(self, symbol: str, side: str, amount: float,
                    order_type: str = 'market', price: Optional[float] = None) -> dict:
         """Place an order"""
         try:
             if order_type == 'stop_loss':
                 # Stop-loss order
-                order = self.exchange.create_order(
-                    symbol, 'stop_loss_limit', side, amount, price,
-                    {'stopPrice': price}
+                order = self._request(
+                    'create_order', symbol, 'stop_loss_limit', side, amount, price,
+                    {'stopPrice': price}, idempotent=False
                 )
             elif order_type == 'take_profit':
                 # Take-profit order
-                order = self.exchange.create_order(
-                    symbol, 'take_profit_limit', side, amount, price,
-                    {'stopPrice': price}
+                order = self._request(
+                    'create_order', symbol, 'take_profit_limit', side, amount, price,
+                    {'stopPrice': price}, idempotent=False
                 )
             else:
                 # Regular order (market or limit)
-                order = self.exchange.create_order(
-                    symbol, order_type, side, amount, price
+                order = self._request(
+                    'create_order', symbol, order_type, side, amount, price, idempotent=False
                 )
             
             self.logger.info(f"Order placed: {order['id']}")
@@ -137,7 +236,128 @@ class BinanceBroker(BaseBroker):
     def cancel_order(self, order_id: str, symbol: str = None) -> bool:
         """Cancel an order"""
         try:
-            self.exchange.cancel_order(order_id, symbol)
+            self._request('cancel_order', order_id, symbol, idempotent=False)
+            self.logger.info(f"Order cancelled: {order_id}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to cancel order: {e}")
+            return False
+    
+    # Async counterparts (native ccxt.async_support client)
+    
+    async def _get_async_exchange(self):
+        """Create the async CCXT client on first use inside the running loop"""
+        exchange = self.async_exchange
+        if exchange is not None:
+            return exchange
+        
+        if self._async_exchange_lock is None:
+            self._async_exchange_lock = asyncio.Lock()
+        # Phases starting together must not each build (and leak) a client
+        async with self._async_exchange_lock:
+            await self._close_retired_async_exchanges()
+            if self.async_exchange is None:
+                exchange = ccxt_async.binance(self._exchange_config())
+                if self.sandbox:
+                    exchange.set_sandbox_mode(True)
+                try:
+                    await self._call_async('load_markets', exchange.load_markets)
+                except BaseException:
+                    await exchange.close()
+                    raise
+                self.async_exchange = exchange
+            return self.async_exchange
+    
+    async def _close_retired_async_exchanges(self):
+        """Close async clients replaced by reconnect()"""
+        while self._retired_async_exchanges:
+            exchange = self._retired_async_exchanges.pop()
+            try:
+                await exchange.close()
+            except Exception as e:
+                self.logger.warning(f"Failed to close replaced async client: {e}")
+    
+    async def close_async(self):
+        """Close the async CCXT client sessions"""
+        try:
+            await self._close_retired_async_exchanges()
+            if self.async_exchange is not None:
+                await self.async_exchange.close()
+        finally:
+            self.async_exchange = None
+            # The lock belongs to the loop that is finishing
+            self._async_exchange_lock = None
+    
+    async def get_positions_async(self) -> list:
+        """Get all open positions (async)"""
+        try:
+            balance = await self._request_async('fetch_balance')
+            positions = []
+            
+            for currency, amount in balance['total'].items():
+                if amount > 0 and currency != 'EUR':
+                    positions.append({
+                        'symbol': f"{currency}/EUR",
+                        'amount': amount,
+                    })
+            
+            return positions
+            
+        except Exception as e:
+            self.logger.error(f"Failed to get positions: {e}")
+            return []
+    
+    async def get_open_orders_async(self) -> list:
+        """Get all open orders (async)"""
+        try:
+            return await self._request_async('fetch_open_orders')
+        except Exception as e:
+            self.logger.error(f"Failed to get open orders: {e}")
+            return []
+    
+    async def get_order_status_async(self, order_id: str, symbol: str = None) -> str:
+        """Get order status (async)"""
+        try:
+            order = await self._request_async('fetch_order', order_id, symbol)
+            return order['status']
+        except Exception as e:
+            self.logger.error(f"Failed to get order status: {e}")
+            return 'unknown'
+    
+    async def get_market_data_async(self, symbol: str, timeframe: str = '1h', limit: int = 100) -> MarketData:
+        """Get market data (OHLCV) (async)"""
+        try:
+            async def fetch(since, count):
+                return await self._request_async('fetch_ohlcv', symbol, timeframe, since=since, limit=count)
+            
+            ohlcv = await self.ohlcv_cache.fetch_window_async(symbol, timeframe, limit, fetch)
+            return MarketData.from_rows(symbol, timeframe, ohlcv)
+        except Exception as e:
+            self.logger.error(f"Failed to get market data: {e}")
+            return MarketData.empty(symbol, timeframe)
+    
+    async def get_current_price_async(self, symbol: str) -> float:
+        """Get current market price (async)"""
+        try:
+            ticker = await self._request_async('fetch_ticker', symbol)
+            return ticker['last']
+        except Exception as e:
+            self.logger.error(f"Failed to get current price: {e}")
+            return 0.0
+    
+    async def get_tickers_async(self, symbols: List[str]) -> Dict[str, float]:
+        """Get current prices for several symbols in one request (async)"""
+        try:
+            tickers = await self._request_async('fetch_tickers', symbols)
+            return {symbol: ticker['last'] for symbol, ticker in tickers.items()}
+        except Exception as e:
+            self.logger.error(f"Failed to get tickers: {e}")
+            return {}
+    
+    async def cancel_order_async(self, order_id: str, symbol: str = None) -> bool:
+        """Cancel an order (async)"""
+        try:
+            await self._request_async('cancel_order', order_id, symbol, idempotent=False)
             self.logger.info(f"Order cancelled: {order_id}")
             return True
         except Exception as e:
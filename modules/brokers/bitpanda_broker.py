@@ -5,6 +5,7 @@ This is a placeholder for Bitpanda integration
 """
 
 from modules.brokers.broker_factory import BaseBroker
+from modules.data.market_data import MarketData
 
 
 class BitpandaBroker(BaseBroker):
@@ -32,13 +33,13 @@ class BitpandaBroker(BaseBroker):
         """Get all open orders"""
         return []
     
-    def get_order_status(self, order_id: str) -> str:
+    def get_order_status(self, order_id: str, symbol: str = None) -> str:
         """Get order status"""
         return 'unknown'
     
-    def get_market_data(self, symbol: str, timeframe: str) -> dict:
+    def get_market_data(self, symbol: str, timeframe: str) -> MarketData:
         """Get market data"""
-        return {'symbol': symbol, 'timeframe': timeframe, 'data': []}
+        return MarketData.empty(symbol, timeframe)
     
     def get_current_price(self, symbol: str) -> float:
         """Get current market price"""
@@ -4,8 +4,13 @@ Broker Factory for NewBot
 Creates broker instances based on configuration
 """
 
-from typing import Optional
+import asyncio
+import functools
+import time
+from typing import Dict, List, Optional, Tuple, Type
 from utils.logging.logger import Logger
+from modules.brokers.accounting import local_helper, record_request, record_weight
+from modules.data.market_data import MarketData
 
 
 class BrokerFactory:
@@ -31,7 +36,21 @@ class BrokerFactory:
         
         if broker_name == 'binance':
             from modules.brokers.binance_broker import BinanceBroker
-            return BinanceBroker(api_key, api_secret, sandbox)
+            from config import config
+            from modules.brokers.rate_limit import TokenBucket
+            weight_per_minute = config.get('broker.rate_limit_weight_per_minute', 4800)
+            broker = BinanceBroker(
+                api_key, api_secret, sandbox,
+                ohlcv_cache_size=config.get('broker.ohlcv_cache_size', 1000),
+                candle_store_dir=config.get('broker.candle_store_dir'),
+                # Our weight budget replaces ccxt's per-request throttling
+                enable_rate_limit=not weight_per_minute,
+                network_timeout=config.get('monitoring.network_timeout_seconds', 30)
+            )
+            if weight_per_minute:
+                broker.rate_limiter = TokenBucket.per_minute(weight_per_minute)
+            broker.resilience = BrokerFactory.create_resilience(broker)
+            return broker
         
         elif broker_name == 'bitpanda':
             from modules.brokers.bitpanda_broker import BitpandaBroker
@@ -39,10 +58,50 @@ class BrokerFactory:
         
         elif broker_name == 'mock':
             from modules.brokers.mock_broker import MockBroker
-            return MockBroker(api_key, api_secret, sandbox)
+            from config import config
+            return MockBroker(
+                api_key, api_secret, sandbox,
+                slippage_percent=config.get('broker.mock_slippage_percent', 0.0),
+                fee_percent=config.get('broker.mock_fee_percent', 0.0),
+                max_fill_ratio=config.get('broker.mock_max_fill_ratio', 1.0),
+                seed=config.get('broker.mock_seed'),
+                order_retention=config.get('broker.mock_order_retention', 10000),
+                order_archive=config.get('broker.mock_order_archive')
+            )
         
         else:
             raise ValueError(f"Unsupported broker: {broker_name}")
+    
+    @staticmethod
+    def create_resilience(broker: 'BaseBroker'):
+        """
+        Create the retry/timeout/circuit breaker layer for a broker
+        
+        Args:
+            broker: Broker instance (its TRANSIENT_ERRORS are retried,
+                its RATE_LIMIT_ERRORS hold the circuit open)
+            
+        Returns:
+            ResilientCaller instance
+        """
+        from config import config
+        from modules.brokers.resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+        return ResilientCaller(
+            retry=RetryPolicy(
+                max_retries=config.get('monitoring.max_api_retries', 3),
+                base_delay=config.get('monitoring.retry_base_delay_seconds', 0.5),
+                max_delay=config.get('monitoring.retry_max_delay_seconds', 8),
+                rate_limit_delay=config.get('monitoring.rate_limit_backoff_seconds', 30)
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=config.get('monitoring.circuit_failure_threshold', 5),
+                reset_timeout=config.get('monitoring.circuit_reset_seconds', 30),
+                name=broker.__class__.__name__
+            ),
+            endpoint_timeouts=config.get('monitoring.endpoint_timeouts') or {},
+            retry_on=broker.TRANSIENT_ERRORS,
+            rate_limited=broker.RATE_LIMIT_ERRORS
+        )
 
 
 class BaseBroker:
@@ -50,6 +109,21 @@ class BaseBroker:
     Base class for all broker implementations
     """
     
+    # Exchange request weight per endpoint sent through _call() (e.g.
+    # 'fetch_ticker'); endpoints not listed weigh 1
+    REQUEST_WEIGHTS: Dict[str, float] = {}
+    
+    # Errors worth retrying: the request may succeed if sent again
+    TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError)
+    
+    # Errors meaning the exchange is throttling us: not retried, the circuit
+    # is held open for the exchange's backoff instead
+    RATE_LIMIT_ERRORS: Tuple[Type[BaseException], ...] = ()
+    
+    # Whether get_tickers() fetches all prices with one request; without a
+    # bulk endpoint it costs one request per symbol
+    BULK_TICKERS = False
+    
     def __init__(self, api_key: str, api_secret: str, sandbox: bool = True):
         """
         Initialize broker
@@ -64,11 +138,145 @@ class BaseBroker:
         self.sandbox = sandbox
         self.logger = Logger(self.__class__.__name__)
         self.connected = False
+        # Optional shared TokenBucket every exchange request draws weight from
+        self.rate_limiter = None
+        # Optional MetricsRegistry exchange requests are accounted in
+        self.request_metrics = None
+        # Optional ResilientCaller used by _call()/_call_async()
+        self.resilience = None
     
+    @local_helper
     def is_connected(self) -> bool:
         """Check if broker is connected"""
         return self.connected
     
+    @local_helper
+    def request_weight(self, method: str, args: tuple, kwargs: dict) -> float:
+        """
+        Exchange request weight of a request
+        
+        Args:
+            method: Endpoint name (e.g. 'fetch_ohlcv')
+            args: Positional arguments of the request
+            kwargs: Keyword arguments of the request
+            
+        Returns:
+            Weight drawn from the rate limit budget
+        """
+        return self.REQUEST_WEIGHTS.get(method, 1)
+    
+    @local_helper
+    def last_response_size(self, asynchronous: bool = False) -> int:
+        """
+        Size in bytes of the last exchange response, if the broker knows it
+        
+        Args:
+            asynchronous: Ask about the async client
+            
+        Returns:
+            Number of bytes (0 if unknown)
+        """
+        return 0
+    
+    @local_helper
+    def retry_after(self, asynchronous: bool = False) -> Optional[float]:
+        """
+        Retry-After of the last exchange response, if the broker knows it
+        
+        Args:
+            asynchronous: Ask about the async client
+            
+        Returns:
+            Seconds the exchange asked to wait (None if not sent)
+        """
+        return None
+    
+    def _call(self, endpoint: str, fn, *args, idempotent: bool = True, **kwargs):
+        """
+        Send one exchange request through the resilience layer, if any
+        
+        Every attempt, retries included, draws the request's weight from
+        the rate limit budget and is accounted on its own.
+        
+        Args:
+            endpoint: Endpoint name (e.g. 'fetch_ticker')
+            fn: Request function
+            *args: Positional arguments for fn
+            idempotent: Whether the request may be retried
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Result of fn
+        """
+        throttle = functools.partial(self._throttle, endpoint, self.request_weight(endpoint, args, kwargs))
+        send = functools.partial(self._send, endpoint, fn)
+        if self.resilience is None:
+            throttle()
+            return send(*args, **kwargs)
+        return self.resilience.call(endpoint, send, *args, idempotent=idempotent,
+                                    client_timeout=self._client_timeout(), throttle=throttle,
+                                    retry_after=self.retry_after, **kwargs)
+    
+    async def _call_async(self, endpoint: str, fn, *args, idempotent: bool = True, **kwargs):
+        """Send one async exchange request through the resilience layer, if any"""
+        throttle = functools.partial(self._throttle_async, endpoint, self.request_weight(endpoint, args, kwargs))
+        send = functools.partial(self._send_async, endpoint, fn)
+        if self.resilience is None:
+            await throttle()
+            return await send(*args, **kwargs)
+        return await self.resilience.call_async(endpoint, send, *args, idempotent=idempotent, throttle=throttle,
+                                                retry_after=functools.partial(self.retry_after, asynchronous=True),
+                                                **kwargs)
+    
+    def _throttle(self, endpoint: str, weight: float):
+        """Draw one attempt's weight from the rate limit budget and account it"""
+        limiter = self.rate_limiter
+        waited = limiter.acquire(weight) if limiter is not None and weight else 0.0
+        if self.request_metrics is not None:
+            record_weight(self.request_metrics, endpoint, weight, waited)
+    
+    async def _throttle_async(self, endpoint: str, weight: float):
+        """Draw one attempt's weight from the rate limit budget and account it (async)"""
+        limiter = self.rate_limiter
+        waited = await limiter.acquire_async(weight) if limiter is not None and weight else 0.0
+        if self.request_metrics is not None:
+            record_weight(self.request_metrics, endpoint, weight, waited)
+    
+    def _send(self, endpoint: str, fn, *args, **kwargs):
+        """Send one attempt of a request and account its latency and size"""
+        registry = self.request_metrics
+        if registry is None:
+            return fn(*args, **kwargs)
+        
+        start = time.perf_counter()
+        error = True
+        try:
+            result = fn(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            record_request(registry, endpoint, time.perf_counter() - start, error, self.last_response_size())
+    
+    async def _send_async(self, endpoint: str, fn, *args, **kwargs):
+        """Send one attempt of a request and account its latency and size (async)"""
+        registry = self.request_metrics
+        if registry is None:
+            return await fn(*args, **kwargs)
+        
+        start = time.perf_counter()
+        error = True
+        try:
+            result = await fn(*args, **kwargs)
+            error = False
+            return result
+        finally:
+            record_request(registry, endpoint, time.perf_counter() - start, error,
+                           self.last_response_size(asynchronous=True))
+    
+    def _client_timeout(self) -> Optional[float]:
+        """Timeout in seconds the exchange client enforces itself (None if unknown)"""
+        return None
+    
     def reconnect(self):
         """Reconnect to broker"""
         raise NotImplementedError("Subclass must implement reconnect()")
@@ -81,11 +289,11 @@ class BaseBroker:
         """Get all open orders"""
         raise NotImplementedError("Subclass must implement get_open_orders()")
     
-    def get_order_status(self, order_id: str) -> str:
+    def get_order_status(self, order_id: str, symbol: Optional[str] = None) -> str:
         """Get order status"""
         raise NotImplementedError("Subclass must implement get_order_status()")
     
-    def get_market_data(self, symbol: str, timeframe: str) -> dict:
+    def get_market_data(self, symbol: str, timeframe: str) -> MarketData:
         """Get market data (OHLCV)"""
         raise NotImplementedError("Subclass must implement get_market_data()")
     
@@ -93,6 +301,22 @@ class BaseBroker:
         """Get current market price"""
         raise NotImplementedError("Subclass must implement get_current_price()")
     
+    def get_tickers(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Get current prices for several symbols
+        
+        Brokers with a bulk ticker endpoint override this and set
+        BULK_TICKERS; the default falls back to one get_current_price()
+        call per symbol.
+        
+        Args:
+            symbols: Trading pair symbols
+            
+        Returns:
+            Mapping of symbol to current price
+        """
+        return {symbol: self.get_current_price(symbol) for symbol in symbols}
+    
     def place_order(self, symbol: str, side: str, amount: float, 
                    order_type: str = 'market', price: Optional[float] = None) -> dict:
         """Place an order"""
@@ -101,3 +325,46 @@ class BaseBroker:
     def cancel_order(self, order_id: str) -> bool:
         """Cancel an order"""
         raise NotImplementedError("Subclass must implement cancel_order()")
+    
+    # Async counterparts
+    #
+    # The defaults run the synchronous method in a worker thread so every
+    # broker can be used from the asyncio trading loop. Brokers with a native
+    # async client (e.g. BinanceBroker) override these.
+    
+    async def get_positions_async(self) -> list:
+        """Get all open positions (async)"""
+        return await asyncio.to_thread(self.get_positions)
+    
+    async def get_open_orders_async(self) -> list:
+        """Get all open orders (async)"""
+        return await asyncio.to_thread(self.get_open_orders)
+    
+    async def get_order_status_async(self, order_id: str, symbol: Optional[str] = None) -> str:
+        """Get order status (async)"""
+        return await asyncio.to_thread(self.get_order_status, order_id, symbol)
+    
+    async def get_market_data_async(self, symbol: str, timeframe: str) -> MarketData:
+        """Get market data (OHLCV) (async)"""
+        return await asyncio.to_thread(self.get_market_data, symbol, timeframe)
+    
+    async def get_current_price_async(self, symbol: str) -> float:
+        """Get current market price (async)"""
+        return await asyncio.to_thread(self.get_current_price, symbol)
+    
+    async def get_tickers_async(self, symbols: List[str]) -> Dict[str, float]:
+        """Get current prices for several symbols (async)"""
+        return await asyncio.to_thread(self.get_tickers, symbols)
+    
+    async def place_order_async(self, symbol: str, side: str, amount: float,
+                                order_type: str = 'market', price: Optional[float] = None) -> dict:
+        """Place an order (async)"""
+        return await asyncio.to_thread(self.place_order, symbol, side, amount, order_type, price)
+    
+    async def cancel_order_async(self, order_id: str, *args) -> bool:
+        """Cancel an order (async)"""
+        return await asyncio.to_thread(self.cancel_order, order_id, *args)
+    
+    async def close_async(self):
+        """Release async resources (sessions, connections)"""
+        return None
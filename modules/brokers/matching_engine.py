@@ -0,0 +1,290 @@
+"""
+Order matching engine for the mock broker
+
+Resting orders are kept per symbol in two heaps keyed by trigger price:
+
+- `below`: orders that fire when the price falls to their trigger (sell
+  stops, buy limits, buy take-profits), highest trigger on top
+- `above`: orders that fire when the price rises to their trigger (buy
+  stops, sell limits, sell take-profits), lowest trigger on top
+
+A new price or candle only pops the orders whose trigger it crossed, so
+matching cost depends on the number of fills, not on the book size.
+Cancelled orders are dropped lazily when they reach the top of a heap.
+
+Triggered stop orders become market orders and fill with slippage;
+limit and take-profit orders fill at their limit (or better on a gap).
+When a volume is supplied, each tick only offers `max_fill_ratio` of it
+to resting orders, which produces partial fills.
+"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+BELOW = 'below'
+ABOVE = 'above'
+
+# Order types that turn into market orders once triggered
+STOP_TYPES = {'stop_loss', 'stop', 'stop_market'}
+
+
+def trigger_direction(order_type: str, side: str) -> str:
+    """
+    Side of the trigger price on which an order fires
+    
+    Args:
+        order_type: 'limit', 'stop_loss' or 'take_profit'
+        side: 'buy' or 'sell'
+        
+    Returns:
+        BELOW or ABOVE
+    """
+    if order_type in STOP_TYPES:
+        return BELOW if side == 'sell' else ABOVE
+    # Limits and take-profits wait for a better price
+    return ABOVE if side == 'sell' else BELOW
+
+
+class MatchingEngine:
+    """
+    Trigger-price indexed book of resting orders
+    """
+    
+    def __init__(self, slippage_percent: float = 0.0, fee_percent: float = 0.0,
+                 max_fill_ratio: float = 1.0):
+        """
+        Initialize matching engine
+        
+        Args:
+            slippage_percent: Adverse price move applied to market fills
+            fee_percent: Fee charged on the notional of every fill
+            max_fill_ratio: Share of a tick's volume available to resting
+                orders (only applies when a volume is given)
+        """
+        self.slippage = slippage_percent / 100
+        self.fee_rate = fee_percent / 100
+        self.max_fill_ratio = max_fill_ratio
+        self.orders: Dict[str, dict] = {}
+        self._books: Dict[str, Dict[str, list]] = {}
+        self._triggered: Dict[str, Deque[str]] = {}
+        self._sequence = itertools.count()
+        self._stale = 0
+    
+    def _book(self, symbol: str) -> Dict[str, list]:
+        """Get (or create) the heaps for a symbol"""
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = {BELOW: [], ABOVE: []}
+            self._triggered[symbol] = deque()
+        return book
+    
+    def add(self, order: dict):
+        """
+        Rest an order until its trigger price is crossed
+        
+        Args:
+            order: Order dictionary with id, symbol, side, type, amount and
+                price (the trigger or limit price)
+        """
+        direction = trigger_direction(order['type'], order['side'])
+        order.setdefault('filled', 0.0)
+        order['remaining'] = order['amount'] - order['filled']
+        order['status'] = 'open'
+        self.orders[order['id']] = order
+        
+        # heapq is a min-heap; negate triggers that fire from above
+        key = -order['price'] if direction == BELOW else order['price']
+        heapq.heappush(self._book(order['symbol'])[direction], (key, next(self._sequence), order['id']))
+    
+    def cancel(self, order_id: str) -> bool:
+        """
+        Cancel a resting order
+        
+        Args:
+            order_id: Order ID
+            
+        Returns:
+            True if the order was open
+        """
+        order = self.orders.pop(order_id, None)
+        if order is None:
+            return False
+        order['status'] = 'cancelled'
+        
+        # Cancelled entries linger in the heaps; rebuild them once they
+        # outnumber the live orders so memory follows the open orders
+        self._stale += 1
+        if self._stale > 1024 and self._stale > len(self.orders):
+            self._compact()
+        return True
+    
+    def _compact(self):
+        """Drop cancelled entries from every heap"""
+        for book in self._books.values():
+            for direction, heap in book.items():
+                live = [entry for entry in heap if entry[2] in self.orders]
+                heapq.heapify(live)
+                book[direction] = live
+        self._stale = 0
+    
+    def fill_market(self, order: dict, price: float, timestamp: Optional[int] = None) -> dict:
+        """
+        Fill a market order completely at the given price plus slippage
+        
+        Args:
+            order: Order dictionary
+            price: Current market price
+            timestamp: Fill time in milliseconds (default: now)
+            
+        Returns:
+            The fill record
+        """
+        order.setdefault('filled', 0.0)
+        order['remaining'] = order['amount'] - order['filled']
+        return self._fill(order, order['remaining'], self._slipped(order['side'], price), timestamp)
+    
+    def on_price(self, symbol: str, price: float, volume: Optional[float] = None,
+                 timestamp: Optional[int] = None) -> List[dict]:
+        """
+        Match resting orders against a new price
+        
+        Args:
+            symbol: Trading pair symbol
+            price: Traded price
+            volume: Volume traded at this price (None = unlimited)
+            timestamp: Tick time in milliseconds (default: now)
+            
+        Returns:
+            Fill records, in execution order
+        """
+        return self.on_candle(symbol, price, price, price, price, volume, timestamp)
+    
+    def on_candle(self, symbol: str, open_: float, high: float, low: float, close: float,
+                  volume: Optional[float] = None, timestamp: Optional[int] = None) -> List[dict]:
+        """
+        Match resting orders against a candle
+        
+        Orders whose trigger lies within [low, high] fire. Gaps through a
+        trigger fill at the open.
+        
+        Args:
+            symbol: Trading pair symbol
+            open_, high, low, close: Candle prices
+            volume: Candle volume (None = unlimited)
+            timestamp: Candle time in milliseconds (default: now)
+            
+        Returns:
+            Fill records, in execution order
+        """
+        if symbol not in self._books:
+            return []
+        
+        fills: List[dict] = []
+        liquidity = [float('inf') if volume is None else volume * self.max_fill_ratio]
+        book = self._book(symbol)
+        triggered = self._triggered[symbol]
+        
+        # Stops triggered earlier but not completely filled go first
+        self._drain_triggered(triggered, open_, liquidity, fills, timestamp)
+        self._match(book[BELOW], BELOW, open_, low, triggered, liquidity, fills, timestamp)
+        self._match(book[ABOVE], ABOVE, open_, high, triggered, liquidity, fills, timestamp)
+        return fills
+    
+    def _drain_triggered(self, triggered: Deque[str], price: float, liquidity: List[float],
+                         fills: List[dict], timestamp: Optional[int]):
+        """Fill triggered stop orders at market"""
+        while triggered and liquidity[0] > 0:
+            order = self.orders.get(triggered[0])
+            if order is None:
+                triggered.popleft()
+                continue
+            self._fill_available(order, self._slipped(order['side'], price), liquidity, fills, timestamp)
+            if order['remaining'] > 0:
+                return
+            triggered.popleft()
+    
+    def _match(self, heap: list, direction: str, open_: float, extreme: float,
+               triggered: Deque[str], liquidity: List[float], fills: List[dict],
+               timestamp: Optional[int]):
+        """Pop and fill the orders of one heap whose trigger was crossed"""
+        while heap and liquidity[0] > 0:
+            key, _, order_id = heap[0]
+            trigger = -key if direction == BELOW else key
+            if (direction == BELOW and extreme > trigger) or (direction == ABOVE and extreme < trigger):
+                return
+            
+            heapq.heappop(heap)
+            order = self.orders.get(order_id)
+            if order is None:
+                continue
+            
+            # A gap through the trigger executes at the open
+            gapped = open_ < trigger if direction == BELOW else open_ > trigger
+            reference = open_ if gapped else trigger
+            
+            if order['type'] in STOP_TYPES:
+                triggered.append(order_id)
+                self._drain_triggered(triggered, reference, liquidity, fills, timestamp)
+            else:
+                self._fill_available(order, reference, liquidity, fills, timestamp)
+                if order['remaining'] > 0:
+                    # Keep its place in the book for the rest of the amount
+                    heapq.heappush(heap, (key, next(self._sequence), order_id))
+                    return
+    
+    def _fill_available(self, order: dict, price: float, liquidity: List[float],
+                        fills: List[dict], timestamp: Optional[int]):
+        """Fill as much of an order as the remaining liquidity allows"""
+        amount = min(order['remaining'], liquidity[0])
+        if amount <= 0:
+            return
+        liquidity[0] -= amount
+        fills.append(self._fill(order, amount, price, timestamp))
+    
+    def _slipped(self, side: str, price: float) -> float:
+        """Apply adverse slippage to a market execution price"""
+        return price * (1 + self.slippage) if side == 'buy' else price * (1 - self.slippage)
+    
+    def _fill(self, order: dict, amount: float, price: float, timestamp: Optional[int]) -> dict:
+        """Record a (partial) fill on an order"""
+        fee = amount * price * self.fee_rate
+        previous = order['filled']
+        order['filled'] = previous + amount
+        order['remaining'] = max(order['amount'] - order['filled'], 0.0)
+        order['average'] = (order.get('average') or 0.0) * previous / order['filled'] + price * amount / order['filled']
+        order['cost'] = order['average'] * order['filled']
+        
+        order_fee = order.setdefault('fee', {'cost': 0.0, 'currency': order['symbol'].split('/')[-1]})
+        order_fee['cost'] += fee
+        
+        if order['remaining'] <= 0:
+            order['status'] = 'filled'
+            self.orders.pop(order['id'], None)
+        
+        return {
+            'order_id': order['id'],
+            'symbol': order['symbol'],
+            'side': order['side'],
+            'amount': amount,
+            'price': price,
+            'fee': fee,
+            'timestamp': timestamp if timestamp is not None else int(time.time() * 1000),
+        }
+    
+    def resting(self, symbol: Optional[str] = None) -> int:
+        """
+        Count open orders
+        
+        Args:
+            symbol: Only count this symbol (default: all)
+            
+        Returns:
+            Number of open orders
+        """
+        if symbol is None:
+            return len(self.orders)
+        return sum(1 for order in self.orders.values() if order['symbol'] == symbol)
@@ -1,12 +1,33 @@
 """
 Mock Broker Implementation
 
-Mock broker for testing without connecting to real exchanges
+Mock broker for testing without connecting to real exchanges. Candles
+come from a seeded MarketGenerator per (symbol, timeframe) that is
+extended as the clock advances, so repeated calls return one continuous
+series and a fixed seed and clock reproduce it exactly. Limit,
+stop-loss and take-profit orders rest in a MatchingEngine and fill when
+a price update (update_price or process_candle) crosses their trigger.
+Every new candle of the symbol's price series (`price_timeframe`) is
+matched as it is generated, so a bar whose low went through a stop
+fills it even if it closed above. One lock guards the series, the
+matching engine and the order store, since the bot calls the broker
+from several worker threads at once.
 """
 
-import random
-from typing import Optional
+import threading
+import time
+import uuid
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
 from modules.brokers.broker_factory import BaseBroker
+from modules.brokers.matching_engine import MatchingEngine
+from modules.brokers.order_store import OrderStore
+from modules.data.market_data import MarketData
+from modules.data.market_generator import MarketGenerator
+from utils.scheduling.loop_scheduler import timeframe_to_seconds
 
 
 class MockBroker(BaseBroker):
@@ -14,13 +35,49 @@ class MockBroker(BaseBroker):
     Mock broker for testing and development
     """
     
-    def __init__(self, api_key: str, api_secret: str, sandbox: bool = True):
-        """Initialize mock broker"""
+    def __init__(self, api_key: str, api_secret: str, sandbox: bool = True,
+                 slippage_percent: float = 0.0, fee_percent: float = 0.0,
+                 max_fill_ratio: float = 1.0, seed: Optional[int] = None,
+                 history_size: int = 1000, generator_options: Optional[Dict] = None,
+                 clock: Callable[[], float] = time.time, order_retention: int = 10000,
+                 order_archive: Optional[str] = None, price_timeframe: str = '1m'):
+        """
+        Initialize mock broker
+        
+        Args:
+            api_key: API key (unused)
+            api_secret: API secret (unused)
+            sandbox: Use sandbox/testnet mode
+            slippage_percent: Adverse slippage on market and stop fills
+            fee_percent: Fee charged on every fill
+            max_fill_ratio: Share of a candle's volume resting orders can fill
+            seed: Market data seed (None = different series every run)
+            history_size: Candles kept per symbol and timeframe
+            generator_options: Extra keyword arguments for MarketGenerator
+                (volatility, regimes, gaps, ...)
+            clock: Time source in seconds; the series advances with it
+            order_retention: Finished orders kept in memory
+            order_archive: Append-only file for older finished orders
+            price_timeframe: Series that sets the current price and is
+                matched against resting orders
+        """
         super().__init__(api_key, api_secret, sandbox)
         self.connected = True
         self.positions = []
-        self.orders = []
+        self.orders = OrderStore(order_retention, order_archive)
         self.order_counter = 0
+        # The order archive outlives the process, so ids carry a run prefix
+        self.run_id = uuid.uuid4().hex[:8]
+        self.matching_engine = MatchingEngine(slippage_percent, fee_percent, max_fill_ratio)
+        self.seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2 ** 32)
+        self.history_size = history_size
+        self.generator_options = generator_options or {}
+        self.clock = clock
+        self.price_timeframe = price_timeframe
+        self._series: Dict[Tuple[str, str], Tuple[MarketGenerator, MarketData]] = {}
+        # Reentrant: placing a market order reads the current price, which
+        # may match resting orders
+        self._lock = threading.RLock()
         self.logger.info("Mock broker initialized")
     
     def reconnect(self):
@@ -33,75 +90,164 @@ class MockBroker(BaseBroker):
         return self.positions
     
     def get_open_orders(self) -> list:
-        """Get all open orders"""
-        return [o for o in self.orders if o['status'] == 'open']
+        """Get all open orders (copies, the stored orders keep changing)"""
+        with self._lock:
+            return [dict(order) for order in self.orders.with_status('open')]
     
-    def get_order_status(self, order_id: str) -> str:
+    def get_order_status(self, order_id: str, symbol: str = None) -> str:
         """Get order status"""
-        for order in self.orders:
-            if order['id'] == order_id:
-                return order['status']
-        return 'unknown'
+        with self._lock:
+            order = self.orders.get(order_id)
+            return order['status'] if order is not None else 'unknown'
     
-    def get_market_data(self, symbol: str, timeframe: str, limit: int = 100) -> dict:
-        """Get mock market data"""
-        # Generate fake OHLCV data
-        data = []
-        base_price = 50000.0
+    def _advance(self, symbol: str, timeframe: str) -> MarketData:
+        """
+        Extend a symbol's series up to the current candle
         
-        for i in range(limit):
-            open_price = base_price + random.uniform(-1000, 1000)
-            high = open_price + random.uniform(0, 500)
-            low = open_price - random.uniform(0, 500)
-            close = open_price + random.uniform(-500, 500)
-            volume = random.uniform(100, 1000)
-            
-            data.append([
-                i * 3600000,  # timestamp
-                open_price,
-                high,
-                low,
-                close,
-                volume
-            ])
+        Returns:
+            The stored candles, newest last
+        """
+        period_ms = timeframe_to_seconds(timeframe) * 1000
+        current = int(self.clock() * 1000) // period_ms * period_ms
+        key = (symbol, timeframe)
+        
+        if key not in self._series:
+            # Independent, reproducible stream per symbol and timeframe
+            generator = MarketGenerator(
+                [symbol], timeframe,
+                seed=[self.seed, zlib.crc32(f"{symbol}|{timeframe}".encode())],
+                start_timestamp=current - (self.history_size - 1) * period_ms,
+                **self.generator_options
+            )
+            timestamps, prices = generator.generate_arrays(self.history_size)
+            self._series[key] = (generator, MarketData(symbol, timeframe, timestamps, prices[0]))
+        else:
+            generator, history = self._series[key]
+            due = (current - generator.next_timestamp) // period_ms + 1
+            if due <= 0:
+                return history
+            timestamps, prices = generator.generate_arrays(due)
+            if timeframe == self.price_timeframe:
+                self._match_candles(symbol, timestamps, prices[0])
+            columns = [np.concatenate([old, new]) for old, new in
+                       zip((history.open, history.high, history.low, history.close, history.volume), prices[0])]
+            keep = self.history_size
+            self._series[key] = (generator, MarketData(
+                symbol, timeframe,
+                np.concatenate([history.timestamps, timestamps])[-keep:],
+                np.vstack(columns)[:, -keep:]
+            ))
         
-        return {
-            'symbol': symbol,
-            'timeframe': timeframe,
-            'data': data
-        }
+        return self._series[key][1]
+    
+    def _match_candles(self, symbol: str, timestamps: np.ndarray, prices: np.ndarray):
+        """Match resting orders against new candles, oldest first"""
+        if not self.matching_engine.orders:
+            return
+        for index, timestamp in enumerate(timestamps.tolist()):
+            open_, high, low, close, volume = prices[:, index].tolist()
+            self.process_candle(symbol, open_, high, low, close, volume, timestamp)
+    
+    def get_market_data(self, symbol: str, timeframe: str, limit: int = 100) -> MarketData:
+        """Get mock market data (at most history_size candles)"""
+        with self._lock:
+            return self._advance(symbol, timeframe).tail(limit)
     
     def get_current_price(self, symbol: str) -> float:
-        """Get mock current price"""
-        return 50000.0 + random.uniform(-1000, 1000)
+        """
+        Get mock current price
+        
+        The last close of the symbol's `price_timeframe` series. Advancing
+        the series matches resting orders against the new candles; the
+        price itself is matched too, for orders placed since.
+        """
+        with self._lock:
+            price = self._advance(symbol, self.price_timeframe).last_close
+            self.update_price(symbol, price)
+            return price
     
-    def place_order(self, symbol: str, side: str, amount: float,
-                   order_type: str = 'market', price: Optional[float] = None) -> dict:
-        """Place a mock order"""
-        self.order_counter += 1
-        order_id = f"mock_order_{self.order_counter}"
+    def update_price(self, symbol: str, price: float, volume: Optional[float] = None,
+                     timestamp: Optional[int] = None) -> List[dict]:
+        """
+        Feed a traded price to the matching engine
         
-        order = {
-            'id': order_id,
-            'symbol': symbol,
-            'side': side,
-            'amount': amount,
-            'type': order_type,
-            'price': price or self.get_current_price(symbol),
-            'status': 'filled' if order_type == 'market' else 'open',
-            'filled': amount if order_type == 'market' else 0
-        }
+        Args:
+            symbol: Trading pair symbol
+            price: Traded price
+            volume: Volume traded at this price (None = unlimited)
+            timestamp: Tick time in milliseconds
+            
+        Returns:
+            Fills caused by this price
+        """
+        with self._lock:
+            return self._record_fills(self.matching_engine.on_price(symbol, price, volume, timestamp))
+    
+    def process_candle(self, symbol: str, open_: float, high: float, low: float, close: float,
+                       volume: Optional[float] = None, timestamp: Optional[int] = None) -> List[dict]:
+        """
+        Feed a candle to the matching engine
         
-        self.orders.append(order)
-        self.logger.info(f"Mock order placed: {order_id}")
+        Every resting order whose trigger lies within the candle's range
+        fires; gaps through a trigger fill at the open.
         
-        return order
+        Args:
+            symbol: Trading pair symbol
+            open_, high, low, close: Candle prices
+            volume: Candle volume (None = unlimited)
+            timestamp: Candle time in milliseconds
+            
+        Returns:
+            Fills caused by this candle
+        """
+        with self._lock:
+            fills = self.matching_engine.on_candle(symbol, open_, high, low, close, volume, timestamp)
+            return self._record_fills(fills)
+    
+    def _record_fills(self, fills: List[dict]) -> List[dict]:
+        """Log fills reported by the matching engine and re-index their orders"""
+        for fill in fills:
+            self.orders.update(fill['order_id'])
+            self.logger.info(
+                f"Mock order {fill['order_id']} filled {fill['amount']} {fill['symbol']} @ {fill['price']:.2f}"
+            )
+        return fills
+    
+    def place_order(self, symbol: str, side: str, amount: float,
+                   order_type: str = 'market', price: Optional[float] = None) -> dict:
+        """Place a mock order"""
+        with self._lock:
+            self.order_counter += 1
+            order_id = f"mock_order_{self.run_id}_{self.order_counter}"
+            
+            order = {
+                'id': order_id,
+                'symbol': symbol,
+                'side': side,
+                'amount': amount,
+                'type': order_type,
+                'price': price or self.get_current_price(symbol),
+                'status': 'open',
+                'filled': 0.0,
+                'timestamp': int(self.clock() * 1000)
+            }
+            
+            if order_type == 'market':
+                fill = self.matching_engine.fill_market(order, order['price'])
+                self.orders.add(order)
+                self._record_fills([fill])
+            else:
+                self.matching_engine.add(order)
+                self.orders.add(order)
+            self.logger.info(f"Mock order placed: {order_id}")
+            
+            return order
     
     def cancel_order(self, order_id: str) -> bool:
         """Cancel a mock order"""
-        for order in self.orders:
-            if order['id'] == order_id:
-                order['status'] = 'cancelled'
+        with self._lock:
+            if self.matching_engine.cancel(order_id):
+                self.orders.update(order_id)
                 self.logger.info(f"Mock order cancelled: {order_id}")
                 return True
-        return False
+            return False
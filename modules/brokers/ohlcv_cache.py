@@ -0,0 +1,304 @@
+"""
+Incremental OHLCV cache for NewBot brokers
+
+Keeps a ring buffer of candles per (symbol, timeframe). After the first
+download only bars newer than the last cached one are requested (via
+`since`); the still-forming last bar is replaced in place and missing
+bars are backfilled, so steady-state requests return one or two candles
+instead of the whole window. With a CandleStore attached, buffers are
+seeded from disk and every fetch is appended to it.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Dict, Generator, List, Optional, Tuple
+
+from modules.data.candle_store import CandleStore
+from utils.scheduling.loop_scheduler import timeframe_to_seconds
+
+
+class CandleBuffer:
+    """
+    Ring buffer of OHLCV rows ([timestamp, open, high, low, close, volume])
+    ordered by timestamp
+    """
+    
+    def __init__(self, timeframe: str, capacity: int = 1000):
+        """
+        Initialize candle buffer
+        
+        Args:
+            timeframe: CCXT timeframe string
+            capacity: Maximum number of candles kept
+        """
+        self.timeframe = timeframe
+        self.period_ms = timeframe_to_seconds(timeframe) * 1000
+        self.capacity = capacity
+        self.candles: deque = deque(maxlen=capacity)
+        self.gaps: List[Tuple[int, int]] = []
+        # Open time of the exchange's first bar, once a fetch ran into it
+        # (e.g. a pair listed more recently than the requested window)
+        self.first_available: Optional[int] = None
+    
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Open time of the newest cached candle"""
+        return self.candles[-1][0] if self.candles else None
+    
+    def merge(self, rows: List[list]) -> int:
+        """
+        Merge freshly fetched candles into the buffer
+        
+        Rows newer than the last candle are appended, a row with the same
+        timestamp replaces it (the bar was still forming) and older rows
+        fill gaps.
+        
+        Args:
+            rows: Candles sorted by timestamp
+            
+        Returns:
+            Number of rows that were new to the buffer
+        """
+        added = 0
+        for row in rows:
+            timestamp = row[0]
+            last = self.last_timestamp
+            
+            if last is None or timestamp > last:
+                if last is not None and self.is_gap(last, timestamp):
+                    self.gaps.append((last + self.period_ms, timestamp))
+                self.candles.append(list(row))
+                added += 1
+            elif timestamp == last:
+                self.candles[-1] = list(row)
+            else:
+                added += self._insert(row)
+        return added
+    
+    def is_gap(self, previous: int, current: int) -> bool:
+        """Check whether bars are missing between two timestamps"""
+        # Calendar months have no fixed length, so gaps are not tracked
+        if self.timeframe.endswith('M'):
+            return False
+        return current - previous > self.period_ms
+    
+    def _insert(self, row: list) -> int:
+        """Insert a backfilled row at its sorted position"""
+        timestamp = row[0]
+        if not self.candles or timestamp < self.candles[0][0]:
+            # Older than the window; only useful if there is still room
+            if len(self.candles) < self.capacity:
+                self.candles.appendleft(list(row))
+                return 1
+            return 0
+        
+        for index in range(len(self.candles) - 1, -1, -1):
+            existing = self.candles[index][0]
+            if existing == timestamp:
+                self.candles[index] = list(row)
+                return 0
+            if existing < timestamp:
+                # deque.insert() refuses to grow past maxlen
+                if len(self.candles) == self.capacity:
+                    self.candles.popleft()
+                    index -= 1
+                self.candles.insert(index + 1, list(row))
+                return 1
+        return 0
+    
+    def is_expired(self, now_ms: int) -> bool:
+        """Check whether so much time passed that the buffer cannot be caught up"""
+        last = self.last_timestamp
+        return last is None or now_ms - last > self.capacity * self.period_ms
+    
+    def window(self, limit: int) -> List[list]:
+        """
+        Get the newest candles
+        
+        Args:
+            limit: Number of candles
+            
+        Returns:
+            List of OHLCV rows (oldest first)
+        """
+        if limit >= len(self.candles):
+            return [list(row) for row in self.candles]
+        return [list(row) for row in list(self.candles)[-limit:]]
+
+
+class OHLCVCache:
+    """
+    Per-(symbol, timeframe) candle buffers with incremental refresh
+    
+    Fetch functions have the signature `fetch(since, limit) -> rows`, which
+    maps directly onto CCXT's `fetch_ohlcv(symbol, timeframe, since, limit)`.
+    """
+    
+    def __init__(self, capacity: int = 1000, page_limit: int = 1000,
+                 store: Optional[CandleStore] = None):
+        """
+        Initialize cache
+        
+        Args:
+            capacity: Candles kept per (symbol, timeframe)
+            page_limit: Maximum candles requested per fetch call
+            store: Optional persistent store for warm starts
+        """
+        self.capacity = capacity
+        self.page_limit = page_limit
+        self.store = store
+        self.buffers: Dict[Tuple[str, str], CandleBuffer] = {}
+    
+    def get_buffer(self, symbol: str, timeframe: str) -> CandleBuffer:
+        """Get (or create) the buffer for a symbol and timeframe"""
+        key = (symbol, timeframe)
+        buffer = self.buffers.get(key)
+        if buffer is None:
+            buffer = CandleBuffer(timeframe, self.capacity)
+            if self.store is not None:
+                stored = self.store.window(symbol, timeframe, self.capacity)
+                # Holes in the stored history stay in buffer.gaps and are
+                # backfilled on the first refresh
+                buffer.merge(CandleStore.to_rows(stored))
+            self.buffers[key] = buffer
+        return buffer
+    
+    def _persist(self, symbol: str, timeframe: str, buffer: CandleBuffer, rows: List[list]):
+        """
+        Append fetched rows to the persistent store, if any
+        
+        When the rows do not continue the stored history (the buffer
+        expired and only the latest window was fetched), the hole is queued
+        for backfill so the file stays contiguous.
+        """
+        if self.store is None or not rows:
+            return
+        last = self.store.last_timestamp(symbol, timeframe)
+        if last is not None and buffer.is_gap(last, rows[0][0]):
+            gap = (last + buffer.period_ms, rows[0][0])
+            if gap not in buffer.gaps:
+                buffer.gaps.append(gap)
+        self.store.append(symbol, timeframe, rows)
+    
+    def _plan(self, buffer: CandleBuffer, limit: int) -> Tuple[Optional[int], int]:
+        """
+        Work out the next request for a buffer
+        
+        Only an empty or expired buffer is downloaded in full. A buffer
+        holding fewer than `limit` candles is caught up incrementally and
+        the missing older bars are queued for backfill, unless the exchange
+        has no bars before the buffer (a recently listed pair).
+        
+        Returns:
+            Tuple of (since, limit) for the fetch call
+        """
+        now_ms = int(time.time() * 1000)
+        if buffer.is_expired(now_ms):
+            buffer.candles.clear()
+            buffer.gaps.clear()
+            return None, min(max(limit, 1), self.page_limit)
+        
+        first = buffer.candles[0][0]
+        # Bars already queued for backfill will fill part of the window
+        queued = sum((end - start) // buffer.period_ms for start, end in buffer.gaps)
+        missing = min(limit, buffer.capacity) - len(buffer.candles) - queued
+        if missing > 0 and (buffer.first_available is None or first > buffer.first_available):
+            older = (first - missing * buffer.period_ms, first)
+            if older not in buffer.gaps:
+                buffer.gaps.append(older)
+        
+        expected = (now_ms - buffer.last_timestamp) // buffer.period_ms + 1
+        return buffer.last_timestamp, int(min(max(expected, 1) + 1, self.page_limit))
+    
+    def _refresh(self, symbol: str, timeframe: str,
+                 limit: int) -> Generator[Tuple[Optional[int], int], List[list], List[list]]:
+        """
+        Refresh steps shared by the sync and async paths
+        
+        A generator that yields (since, limit) fetch requests and is sent
+        the fetched rows back, so both paths run the same plan, merge and
+        persist logic and only differ in how they call `fetch`.
+        
+        Returns:
+            List of OHLCV rows (oldest first), as the generator's value
+        """
+        buffer = self.get_buffer(symbol, timeframe)
+        since, page = self._plan(buffer, limit)
+        
+        # Page forward until the exchange returns a short page
+        while True:
+            rows = yield since, page
+            if since is None and rows and len(rows) < page:
+                buffer.first_available = rows[0][0]
+            buffer.merge(rows)
+            self._persist(symbol, timeframe, buffer, rows)
+            if len(rows) < page or since is None:
+                break
+            since = buffer.last_timestamp
+        
+        # Backfill bars that were skipped between refreshes, page by page
+        while buffer.gaps:
+            start, end = buffer.gaps.pop(0)
+            history = bool(buffer.candles) and start < buffer.candles[0][0]
+            while start < end:
+                count = int(min(-(-(end - start) // buffer.period_ms), self.page_limit))
+                rows = [row for row in (yield start, count) if start <= row[0] < end]
+                if history and (not rows or rows[0][0] > start):
+                    # Nothing older exists, don't ask again next refresh
+                    buffer.first_available = rows[0][0] if rows else end
+                history = False
+                if not rows:
+                    break  # the exchange has no bars there either
+                buffer.merge(rows)
+                if self.store is not None:
+                    self.store.append(symbol, timeframe, rows)
+                start = rows[-1][0] + buffer.period_ms
+        
+        return buffer.window(limit)
+    
+    def fetch_window(self, symbol: str, timeframe: str, limit: int,
+                     fetch: Callable[[Optional[int], int], List[list]]) -> List[list]:
+        """
+        Refresh a buffer incrementally and return its newest candles
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            limit: Number of candles to return
+            fetch: Function fetching candles since a timestamp
+            
+        Returns:
+            List of OHLCV rows (oldest first)
+        """
+        steps = self._refresh(symbol, timeframe, limit)
+        request = next(steps)
+        while True:
+            try:
+                request = steps.send(fetch(*request))
+            except StopIteration as done:
+                return done.value
+    
+    async def fetch_window_async(self, symbol: str, timeframe: str, limit: int, fetch) -> List[list]:
+        """
+        Refresh a buffer incrementally and return its newest candles (async)
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            limit: Number of candles to return
+            fetch: Coroutine function fetching candles since a timestamp
+            
+        Returns:
+            List of OHLCV rows (oldest first)
+        """
+        steps = self._refresh(symbol, timeframe, limit)
+        request = next(steps)
+        while True:
+            try:
+                request = steps.send(await fetch(*request))
+            except StopIteration as done:
+                return done.value
+    
+    def clear(self):
+        """Drop all cached candles"""
+        self.buffers.clear()
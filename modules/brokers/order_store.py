@@ -0,0 +1,179 @@
+"""
+Indexed order storage for the mock broker
+
+Orders are indexed by id and by status, so lookups and open-order
+listings do not scan the order history. Terminal orders (filled,
+cancelled, ...) are kept for a bounded number of recent orders and then
+moved to an append-only JSON-lines archive, so memory stays flat over
+long paper-trading runs no matter how many orders are placed.
+"""
+
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from utils.logging.logger import Logger
+
+
+TERMINAL_STATUSES = {'filled', 'closed', 'cancelled', 'canceled', 'rejected', 'expired'}
+
+# Fields written to the archive, in order
+ARCHIVE_FIELDS = ('id', 'symbol', 'side', 'type', 'amount', 'price', 'status',
+                  'filled', 'average', 'timestamp')
+
+
+class OrderStore:
+    """
+    Orders indexed by id and status with archival of terminal orders
+    """
+    
+    def __init__(self, retention: int = 10000, archive_path: Optional[str] = None):
+        """
+        Initialize order store
+        
+        Args:
+            retention: Most recent terminal orders kept in memory
+            archive_path: JSON-lines file receiving evicted terminal orders
+                (None = evicted orders are dropped)
+        """
+        self.logger = Logger('OrderStore')
+        self.retention = retention
+        self.archive_path = Path(archive_path) if archive_path else None
+        self._active: Dict[str, dict] = {}
+        self._by_status: Dict[str, Dict[str, dict]] = {}
+        self._terminal: 'OrderedDict[str, dict]' = OrderedDict()
+        self.archived = 0
+        
+        if self.archive_path is not None:
+            self.archive_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    def add(self, order: dict):
+        """
+        Store a new order
+        
+        Args:
+            order: Order dictionary with at least 'id' and 'status'
+        """
+        self._index(order)
+    
+    def update(self, order_id: str) -> Optional[dict]:
+        """
+        Re-index an order after its status changed
+        
+        Args:
+            order_id: Order ID
+            
+        Returns:
+            The order, or None if it is not held in memory
+        """
+        order = self._active.get(order_id)
+        if order is None:
+            return self._terminal.get(order_id)
+        
+        # Drop it from the index of the status it was filed under
+        for status, orders in self._by_status.items():
+            if orders.pop(order_id, None) is not None:
+                if not orders:
+                    del self._by_status[status]
+                break
+        del self._active[order_id]
+        self._index(order)
+        return order
+    
+    def _index(self, order: dict):
+        """File an order under its current status"""
+        if order['status'] in TERMINAL_STATUSES:
+            self._terminal[order['id']] = order
+            self._terminal.move_to_end(order['id'])
+            # Archive in batches so the file is not reopened for every order
+            if len(self._terminal) > self.retention + max(1, self.retention // 10):
+                self._evict()
+        else:
+            self._active[order['id']] = order
+            self._by_status.setdefault(order['status'], {})[order['id']] = order
+    
+    def _evict(self):
+        """Move the oldest terminal orders out of memory"""
+        evicted = []
+        while len(self._terminal) > self.retention:
+            evicted.append(self._terminal.popitem(last=False)[1])
+        
+        if self.archive_path is None:
+            return
+        try:
+            with open(self.archive_path, 'a') as f:
+                for order in evicted:
+                    f.write(json.dumps([order.get(field) for field in ARCHIVE_FIELDS],
+                                       separators=(',', ':')) + '\n')
+            self.archived += len(evicted)
+        except OSError as e:
+            self.logger.error(f"Error archiving orders: {e}")
+    
+    def get(self, order_id: str) -> Optional[dict]:
+        """
+        Get an order by id
+        
+        Active and recently terminated orders are found in O(1); older
+        ones are read back from the archive.
+        
+        Args:
+            order_id: Order ID
+            
+        Returns:
+            Order dictionary or None
+        """
+        order = self._active.get(order_id) or self._terminal.get(order_id)
+        if order is not None:
+            return order
+        return self._find_archived(order_id)
+    
+    def _find_archived(self, order_id: str) -> Optional[dict]:
+        """Scan the archive for an evicted order"""
+        if self.archive_path is None or not self.archive_path.exists():
+            return None
+        try:
+            with open(self.archive_path) as f:
+                for line in f:
+                    # Cheap substring test before decoding the line
+                    if order_id in line:
+                        values = json.loads(line)
+                        if values[0] == order_id:
+                            return dict(zip(ARCHIVE_FIELDS, values))
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Error reading order archive: {e}")
+        return None
+    
+    def with_status(self, status: str) -> List[dict]:
+        """
+        Get the in-memory orders with a status
+        
+        Args:
+            status: Order status, e.g. 'open'
+            
+        Returns:
+            List of orders
+        """
+        if status in TERMINAL_STATUSES:
+            return [order for order in self._terminal.values() if order['status'] == status]
+        return list(self._by_status.get(status, {}).values())
+    
+    def archive(self) -> Iterator[dict]:
+        """
+        Iterate over archived orders, oldest first
+        
+        Yields:
+            Order dictionaries with the ARCHIVE_FIELDS
+        """
+        if self.archive_path is None or not self.archive_path.exists():
+            return
+        with open(self.archive_path) as f:
+            for line in f:
+                yield dict(zip(ARCHIVE_FIELDS, json.loads(line)))
+    
+    def __len__(self) -> int:
+        """Number of orders held in memory"""
+        return len(self._active) + len(self._terminal)
+    
+    def __contains__(self, order_id: str) -> bool:
+        return order_id in self._active or order_id in self._terminal
@@ -0,0 +1,108 @@
+"""
+Order Tracker for NewBot
+
+Keeps a local copy of the open-order book and derives fills and
+cancellations from the difference between successive snapshots, so only
+orders that disappeared need an individual status lookup.
+"""
+
+from typing import Dict, List, Optional
+
+from utils.logging.logger import Logger
+
+
+# Exchange status spellings mapped to the statuses NewBot reports
+TERMINAL_STATUSES = {
+    'filled': 'filled',
+    'closed': 'filled',
+    'cancelled': 'cancelled',
+    'canceled': 'cancelled',
+    'expired': 'cancelled',
+    'rejected': 'cancelled',
+}
+
+
+class OrderTracker:
+    """
+    Local order-state machine built from open-order snapshots
+    
+    Every order moves through open -> (filled | cancelled) exactly once.
+    Orders that vanish from the open list are resolved with a single
+    status lookup; if the lookup is inconclusive they stay pending and
+    are retried on the next snapshot.
+    """
+    
+    def __init__(self, max_status_retries: int = 5):
+        """
+        Initialize order tracker
+        
+        Args:
+            max_status_retries: Lookups to attempt for a vanished order
+                before giving up on it
+        """
+        self.logger = Logger('OrderTracker')
+        self.max_status_retries = max_status_retries
+        self.open_orders: Dict[str, dict] = {}
+        self.pending: Dict[str, dict] = {}
+        self._attempts: Dict[str, int] = {}
+    
+    def reconcile(self, open_orders: List[dict]) -> List[dict]:
+        """
+        Store a new open-order snapshot
+        
+        Args:
+            open_orders: Orders currently reported open by the broker
+            
+        Returns:
+            Orders that need a status lookup (disappeared since the last
+            snapshot or still unresolved from an earlier one)
+        """
+        current = {order['id']: order for order in open_orders}
+        
+        for order_id, order in current.items():
+            previous = self.open_orders.get(order_id)
+            if previous is not None and (order.get('filled') or 0) > (previous.get('filled') or 0):
+                self.logger.info(f"Order partially filled: {order_id} ({order.get('filled')}/{order.get('amount')})")
+            
+            # Listed as open again, so an earlier lookup raced the exchange
+            if order_id in self.pending:
+                del self.pending[order_id]
+                self._attempts.pop(order_id, None)
+        
+        for order_id, order in self.open_orders.items():
+            if order_id not in current:
+                self.pending[order_id] = order
+        
+        self.open_orders = current
+        return list(self.pending.values())
+    
+    def resolve(self, order: dict, status: str) -> Optional[str]:
+        """
+        Record the looked-up status of a vanished order
+        
+        Args:
+            order: Order from a previous snapshot
+            status: Status returned by the broker
+            
+        Returns:
+            'filled' or 'cancelled' the first time the order reaches a
+            terminal state, None otherwise
+        """
+        order_id = order['id']
+        if order_id not in self.pending:
+            return None
+        
+        terminal = TERMINAL_STATUSES.get(status)
+        if terminal is not None:
+            del self.pending[order_id]
+            self._attempts.pop(order_id, None)
+            return terminal
+        
+        attempts = self._attempts.get(order_id, 0) + 1
+        if attempts >= self.max_status_retries:
+            self.logger.warning(f"Giving up on order {order_id} after {attempts} inconclusive status lookups ({status})")
+            del self.pending[order_id]
+            self._attempts.pop(order_id, None)
+        else:
+            self._attempts[order_id] = attempts
+        return None
@@ -0,0 +1,65 @@
+"""
+Price Snapshot for NewBot
+
+Immutable symbol -> last price map filled by one bulk ticker request at
+the start of each trading loop iteration.
+"""
+
+import time
+from types import MappingProxyType
+from typing import Dict, Iterator, Optional
+
+
+class PriceSnapshot:
+    """
+    Read-only price map with a staleness bound
+    
+    Lookups return None once the snapshot is older than `max_age` seconds
+    or when the symbol was not part of the bulk fetch, so callers can fall
+    back to a live price request.
+    """
+    
+    def __init__(self, prices: Dict[str, float], max_age: float = 5.0):
+        """
+        Initialize snapshot
+        
+        Args:
+            prices: Mapping of symbol to last traded price
+            max_age: Seconds after which the snapshot is considered stale
+        """
+        self.prices = MappingProxyType(dict(prices))
+        self.max_age = max_age
+        self.created_at = time.monotonic()
+    
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken"""
+        return time.monotonic() - self.created_at
+    
+    def is_stale(self) -> bool:
+        """Check whether the snapshot exceeded its staleness bound"""
+        return self.age > self.max_age
+    
+    def get(self, symbol: str) -> Optional[float]:
+        """
+        Get the snapshot price for a symbol
+        
+        Args:
+            symbol: Trading pair symbol
+            
+        Returns:
+            Price, or None if missing, invalid or stale
+        """
+        if self.is_stale():
+            return None
+        price = self.prices.get(symbol)
+        return price if price else None
+    
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.prices
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.prices)
+    
+    def __len__(self) -> int:
+        return len(self.prices)
@@ -0,0 +1,98 @@
+"""
+Weight-aware rate limiting for NewBot brokers
+
+Exchanges such as Binance budget requests by weight per minute rather
+than by request count. A TokenBucket holds that budget; every call draws
+its weight from it and only waits when the budget is exhausted. The
+bucket is shared by threads and asyncio tasks: a caller reserves its
+tokens immediately (the balance may go negative) and then sleeps for the
+deficit, so concurrent callers queue up in arrival order without
+polling.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread- and asyncio-safe token bucket
+    """
+    
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        Initialize bucket (starts full)
+        
+        Args:
+            capacity: Maximum tokens (burst size)
+            refill_per_second: Tokens added per second
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.waited = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def per_minute(cls, weight: float) -> 'TokenBucket':
+        """
+        Bucket for a `weight per minute` exchange limit
+        
+        Args:
+            weight: Weight budget per minute
+            
+        Returns:
+            TokenBucket instance
+        """
+        return cls(weight, weight / 60.0)
+    
+    def _reserve(self, weight: float) -> float:
+        """Take tokens and return how long the caller must wait for them"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+            self.updated_at = now
+            self.tokens -= weight
+            if self.tokens >= 0:
+                return 0.0
+            delay = -self.tokens / self.refill_per_second
+            self.waited += delay
+            return delay
+    
+    def acquire(self, weight: float = 1) -> float:
+        """
+        Draw weight from the bucket, sleeping if the budget is exhausted
+        
+        Args:
+            weight: Request weight
+            
+        Returns:
+            Seconds waited
+        """
+        delay = self._reserve(weight)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+    
+    async def acquire_async(self, weight: float = 1) -> float:
+        """
+        Draw weight from the bucket without blocking the event loop
+        
+        Args:
+            weight: Request weight
+            
+        Returns:
+            Seconds waited
+        """
+        delay = self._reserve(weight)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+    
+    def available(self) -> float:
+        """Tokens currently available (negative while callers are queued)"""
+        with self._lock:
+            elapsed = time.monotonic() - self.updated_at
+            return min(self.capacity, self.tokens + elapsed * self.refill_per_second)
@@ -0,0 +1,369 @@
+"""
+Resilient exchange calls for NewBot brokers
+
+Wraps individual exchange requests with:
+- Jittered exponential retries for idempotent requests (reads). Orders
+  are never retried: a timed-out create_order may still have executed.
+- No retries after rate limit errors: they would only hit the limit
+  again (and risk an IP ban). The circuit is held open for the
+  exchange's Retry-After instead, so calls fail fast without stalling
+  the loop until the exchange accepts requests again.
+- Per-endpoint timeouts, so a hanging ticker request cannot hold up a
+  loop phase for the full client timeout.
+- A circuit breaker shared by all endpoints of an exchange. After
+  `failure_threshold` consecutive transient failures it opens and calls
+  fail fast with CircuitOpenError for `reset_timeout` seconds; then a
+  single trial call decides whether it closes again.
+
+Only transient errors (the `retry_on` exception types and timeouts)
+are retried and count towards the breaker; an exchange rejecting a
+request (bad symbol, insufficient funds) even shows it is reachable.
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple, Type
+
+from utils.logging.logger import Logger
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an exchange while its circuit is open"""
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter
+    """
+    
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.5, max_delay: float = 8.0,
+                 rate_limit_delay: float = 30.0):
+        """
+        Initialize policy
+        
+        Args:
+            max_retries: Retries after the first attempt
+            base_delay: Upper bound of the first backoff in seconds
+            max_delay: Cap of the backoff in seconds
+            rate_limit_delay: Backoff after a rate limit error without Retry-After
+        """
+        self.max_retries = max(0, int(max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limit_delay = rate_limit_delay
+    
+    def delay(self, attempt: int) -> float:
+        """
+        Backoff before retry number `attempt` (1-based)
+        
+        A uniformly random delay up to the exponential bound keeps clients
+        that failed together from retrying together.
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+    
+    def rate_limit_backoff(self, retry_after: Optional[float]) -> float:
+        """
+        Backoff after a rate limit error
+        
+        Args:
+            retry_after: Seconds the exchange asked to wait (None if not sent)
+            
+        Returns:
+            Seconds to stop calling the exchange
+        """
+        return self.rate_limit_delay if retry_after is None else max(0.0, retry_after)
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0, name: str = 'exchange'):
+        """
+        Initialize breaker
+        
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to fail fast before a trial call
+            name: Name used in log messages
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        # How long the current opening lasts (reset_timeout, or a rate
+        # limit backoff)
+        self.open_for = reset_timeout
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self.logger = Logger(self.__class__.__name__)
+    
+    def allow(self) -> bool:
+        """
+        Whether a call may go through now
+        
+        In the half-open state only one trial call is let through; the
+        others keep failing fast until it reports back.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.open_for:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_running = False
+            if self._trial_running:
+                return False
+            self._trial_running = True
+            return True
+    
+    def record_success(self):
+        """Close the circuit after a successful call"""
+        with self._lock:
+            if self.state != self.CLOSED:
+                self.logger.info(f"Circuit for {self.name} closed, exchange recovered")
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_running = False
+    
+    def record_failure(self):
+        """Count a transient failure and open the circuit at the threshold"""
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or (
+                    self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.open_for = self.reset_timeout
+                self.logger.warning(
+                    f"Circuit for {self.name} opened after {self.failures} failures, "
+                    f"failing fast for {self.reset_timeout:.0f}s"
+                )
+    
+    def hold_open(self, seconds: float):
+        """
+        Open the circuit for a given time, e.g. while the exchange rate limits us
+        
+        An opening that lasts longer is kept.
+        
+        Args:
+            seconds: Time to fail fast
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.state == self.OPEN and self.opened_at + self.open_for >= now + seconds:
+                return
+            self.state = self.OPEN
+            self.opened_at = now
+            self.open_for = seconds
+            self._trial_running = False
+            self.logger.warning(f"Circuit for {self.name} held open for {seconds:.0f}s, exchange is rate limiting")
+    
+    def record_release(self):
+        """Release a half-open trial slot without judging the exchange"""
+        with self._lock:
+            self._trial_running = False
+    
+    def is_open(self) -> bool:
+        """Whether calls are currently failing fast"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self.opened_at < self.open_for
+
+
+class ResilientCaller:
+    """
+    Runs exchange requests with retries, timeouts and a circuit breaker
+    """
+    
+    def __init__(self, retry: Optional[RetryPolicy] = None, breaker: Optional[CircuitBreaker] = None,
+                 timeout: Optional[float] = None, endpoint_timeouts: Optional[Dict[str, float]] = None,
+                 retry_on: Tuple[Type[BaseException], ...] = (ConnectionError,),
+                 rate_limited: Tuple[Type[BaseException], ...] = ()):
+        """
+        Initialize caller
+        
+        Args:
+            retry: Retry policy (default: 3 retries)
+            breaker: Circuit breaker (default: 5 failures, 30s)
+            timeout: Default per-request timeout in seconds (None: client's own)
+            endpoint_timeouts: Timeouts overriding the default per endpoint,
+                e.g. {'fetch_ticker': 5}
+            retry_on: Exception types treated as transient
+            rate_limited: Exception types meaning the exchange is throttling
+                us (hold the circuit open, checked before retry_on)
+        """
+        self.retry = retry or RetryPolicy()
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.endpoint_timeouts = dict(endpoint_timeouts or {})
+        self.retry_on = tuple(dict.fromkeys(
+            tuple(retry_on) + (TimeoutError, asyncio.TimeoutError, concurrent.futures.TimeoutError)
+        ))
+        self.rate_limited = tuple(rate_limited)
+        self.logger = Logger(self.__class__.__name__)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+    
+    def endpoint_timeout(self, endpoint: str) -> Optional[float]:
+        """Timeout for one endpoint in seconds (None: no extra limit)"""
+        return self.endpoint_timeouts.get(endpoint, self.timeout)
+    
+    def _run_with_timeout(self, fn: Callable, args: tuple, kwargs: dict, timeout: float):
+        """Run a blocking request in a helper thread and stop waiting after `timeout`"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=8, thread_name_prefix='exchange-request'
+                    )
+        # The abandoned request still ends at the client's own timeout; the
+        # context carries the loop phase into the helper thread
+        context = contextvars.copy_context()
+        return self._executor.submit(context.run, fn, *args, **kwargs).result(timeout=timeout)
+    
+    def _attempts(self, idempotent: bool) -> int:
+        """Number of attempts for a call"""
+        return 1 + (self.retry.max_retries if idempotent else 0)
+    
+    def _give_up(self, endpoint: str, attempt: int, attempts: int, error: BaseException) -> bool:
+        """Record a transient failure and decide whether to stop retrying"""
+        self.breaker.record_failure()
+        if attempt >= attempts or self.breaker.is_open():
+            return True
+        self.logger.warning(f"{endpoint} failed ({type(error).__name__}: {error}), "
+                            f"retry {attempt}/{attempts - 1}")
+        return False
+    
+    def _rate_limited(self, endpoint: str, error: BaseException,
+                      retry_after: Optional[Callable[[], Optional[float]]]):
+        """Hold the circuit open for the exchange's backoff instead of retrying"""
+        delay = self.retry.rate_limit_backoff(retry_after() if retry_after is not None else None)
+        self.logger.warning(f"{endpoint} rate limited ({type(error).__name__}), "
+                            f"failing fast for {delay:.0f}s")
+        self.breaker.hold_open(delay)
+    
+    def call(self, endpoint: str, fn: Callable, *args, idempotent: bool = True,
+             client_timeout: Optional[float] = None, throttle: Optional[Callable[[], None]] = None,
+             retry_after: Optional[Callable[[], Optional[float]]] = None, **kwargs):
+        """
+        Run a blocking exchange request
+        
+        Args:
+            endpoint: Endpoint name for timeouts and logs (e.g. 'fetch_ticker')
+            fn: Request function
+            *args: Positional arguments for fn
+            idempotent: Retry transient failures (never for orders)
+            client_timeout: The client's own timeout in seconds; a helper
+                thread is only used when the endpoint timeout is shorter
+            throttle: Called before every attempt, outside the endpoint
+                timeout (e.g. to draw from a rate limit budget)
+            retry_after: Returns the Retry-After seconds of the last
+                response, if the exchange sent one
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Result of fn
+            
+        Raises:
+            CircuitOpenError: While the exchange is considered degraded
+        """
+        timeout = self.endpoint_timeout(endpoint)
+        if timeout is not None and client_timeout is not None and timeout >= client_timeout:
+            timeout = None
+        attempts = self._attempts(idempotent)
+        
+        for attempt in range(1, attempts + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {self.breaker.name}, skipping {endpoint}")
+            try:
+                if throttle is not None:
+                    throttle()
+                if timeout is None:
+                    result = fn(*args, **kwargs)
+                else:
+                    result = self._run_with_timeout(fn, args, kwargs, timeout)
+            except self.rate_limited as e:
+                self._rate_limited(endpoint, e, retry_after)
+                raise
+            except self.retry_on as e:
+                if self._give_up(endpoint, attempt, attempts, e):
+                    raise
+                time.sleep(self.retry.delay(attempt))
+            except Exception:
+                # The exchange answered, it just rejected the request
+                self.breaker.record_success()
+                raise
+            except BaseException:
+                self.breaker.record_release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+    
+    async def call_async(self, endpoint: str, fn: Callable, *args, idempotent: bool = True,
+                         throttle: Optional[Callable] = None,
+                         retry_after: Optional[Callable[[], Optional[float]]] = None, **kwargs):
+        """
+        Run an async exchange request
+        
+        Args:
+            endpoint: Endpoint name for timeouts and logs
+            fn: Coroutine function
+            *args: Positional arguments for fn
+            idempotent: Retry transient failures (never for orders)
+            throttle: Coroutine function awaited before every attempt
+            retry_after: Returns the Retry-After seconds of the last response
+            **kwargs: Keyword arguments for fn
+            
+        Returns:
+            Result of fn
+            
+        Raises:
+            CircuitOpenError: While the exchange is considered degraded
+        """
+        timeout = self.endpoint_timeout(endpoint)
+        attempts = self._attempts(idempotent)
+        
+        for attempt in range(1, attempts + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {self.breaker.name}, skipping {endpoint}")
+            try:
+                if throttle is not None:
+                    await throttle()
+                result = await asyncio.wait_for(fn(*args, **kwargs), timeout)
+            except self.rate_limited as e:
+                self._rate_limited(endpoint, e, retry_after)
+                raise
+            except self.retry_on as e:
+                if self._give_up(endpoint, attempt, attempts, e):
+                    raise
+                await asyncio.sleep(self.retry.delay(attempt))
+            except Exception:
+                # The exchange answered, it just rejected the request
+                self.breaker.record_success()
+                raise
+            except BaseException:
+                self.breaker.record_release()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+    
+    def close(self):
+        """Stop the helper threads used for sync timeouts"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
@@ -0,0 +1,242 @@
+"""
+Persistent candle store for NewBot
+
+Append-only columnar OHLCV files, one per (symbol, timeframe), read back
+through NumPy memory maps. Reads return zero-copy views of the mapped
+file, and because every live fetch is appended the bot restarts with its
+full history already on disk (warm start after a crash or restart).
+New candles are appended; the rare backfilled gap is merged in by
+rewriting the file, so it stays sorted and free of holes.
+
+File layout: `<root>/<SYMBOL>/<timeframe>.ohlcv`, a flat array of
+CANDLE_DTYPE records sorted by timestamp.
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from utils.logging.logger import Logger
+
+
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+])
+
+
+class CandleStore:
+    """
+    Memory-mapped, append-only OHLCV storage
+    """
+    
+    def __init__(self, root: str = 'data/candles'):
+        """
+        Initialize candle store
+        
+        Args:
+            root: Directory holding the candle files
+        """
+        self.logger = Logger('CandleStore')
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._maps: Dict[Tuple[str, str], np.memmap] = {}
+        self._lock = threading.Lock()
+    
+    def _path(self, symbol: str, timeframe: str) -> Path:
+        """File path for a symbol and timeframe"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9_.-]', '_', symbol)
+        return self.root / safe_symbol / f"{timeframe}.ohlcv"
+    
+    def _rows_on_disk(self, path: Path) -> int:
+        """Number of complete records in a file, dropping a torn last write"""
+        if not path.exists():
+            return 0
+        size = path.stat().st_size
+        rows, remainder = divmod(size, CANDLE_DTYPE.itemsize)
+        if remainder:
+            # A crash mid-append left a partial record behind
+            with open(path, 'r+b') as f:
+                f.truncate(rows * CANDLE_DTYPE.itemsize)
+            self.logger.warning(f"Truncated partial candle record in {path}")
+        return rows
+    
+    def _map(self, symbol: str, timeframe: str) -> Optional[np.memmap]:
+        """Get a read-only memory map covering the whole file"""
+        key = (symbol, timeframe)
+        path = self._path(symbol, timeframe)
+        rows = self._rows_on_disk(path)
+        if rows == 0:
+            return None
+        
+        mapped = self._maps.get(key)
+        if mapped is None or len(mapped) != rows:
+            mapped = np.memmap(path, dtype=CANDLE_DTYPE, mode='r', shape=(rows,))
+            self._maps[key] = mapped
+        return mapped
+    
+    def count(self, symbol: str, timeframe: str) -> int:
+        """
+        Get the number of stored candles
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            
+        Returns:
+            Number of candles on disk
+        """
+        return self._rows_on_disk(self._path(symbol, timeframe))
+    
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """
+        Get the open time of the newest stored candle
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            
+        Returns:
+            Timestamp in milliseconds, or None if nothing is stored
+        """
+        mapped = self._map(symbol, timeframe)
+        return int(mapped['timestamp'][-1]) if mapped is not None else None
+    
+    def window(self, symbol: str, timeframe: str, limit: int) -> np.ndarray:
+        """
+        Get the newest candles as a zero-copy view
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            limit: Number of candles
+            
+        Returns:
+            Structured array of CANDLE_DTYPE (empty if nothing is stored)
+        """
+        mapped = self._map(symbol, timeframe)
+        if mapped is None:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return mapped[-limit:] if limit else mapped[:0]
+    
+    def range(self, symbol: str, timeframe: str, start: Optional[int] = None,
+              end: Optional[int] = None) -> np.ndarray:
+        """
+        Get candles with start <= timestamp < end as a zero-copy view
+        
+        Timestamps are sorted, so the range is found by binary search over
+        the mapped timestamp column.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            start: First timestamp in milliseconds (inclusive)
+            end: Last timestamp in milliseconds (exclusive)
+            
+        Returns:
+            Structured array of CANDLE_DTYPE
+        """
+        mapped = self._map(symbol, timeframe)
+        if mapped is None:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        
+        timestamps = mapped['timestamp']
+        lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+        hi = len(mapped) if end is None else int(np.searchsorted(timestamps, end, side='left'))
+        return mapped[lo:hi]
+    
+    def append(self, symbol: str, timeframe: str, rows: List[list]) -> int:
+        """
+        Append candles to the store
+        
+        Rows newer than the last stored candle are appended; a row with the
+        same timestamp overwrites it in place (the bar was still forming).
+        Older rows that are missing from the file (backfilled gaps) are
+        merged in by rewriting the file, which only happens for gaps;
+        older rows already stored are left alone.
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            rows: OHLCV rows sorted by timestamp
+            
+        Returns:
+            Number of candles added
+        """
+        if not rows:
+            return 0
+        
+        path = self._path(symbol, timeframe)
+        with self._lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            count = self._rows_on_disk(path)
+            mapped = self._map(symbol, timeframe) if count else None
+            last = int(mapped['timestamp'][-1]) if mapped is not None else None
+            
+            replace = None
+            fresh = []
+            older = []
+            for row in rows:
+                if last is None or row[0] > last:
+                    fresh.append(tuple(row[:6]))
+                    last = row[0]
+                elif row[0] == last and not fresh:
+                    replace = tuple(row[:6])
+                elif not fresh:
+                    older.append(tuple(row[:6]))
+            
+            with open(path, 'r+b' if count else 'wb') as f:
+                if replace is not None:
+                    f.seek((count - 1) * CANDLE_DTYPE.itemsize)
+                    f.write(np.array([replace], dtype=CANDLE_DTYPE).tobytes())
+                if fresh:
+                    f.seek(count * CANDLE_DTYPE.itemsize)
+                    f.write(np.array(fresh, dtype=CANDLE_DTYPE).tobytes())
+            
+            inserted = self._insert(symbol, timeframe, mapped, older) if older else 0
+        
+        return len(fresh) + inserted
+    
+    def _insert(self, symbol: str, timeframe: str, mapped: np.ndarray, rows: List[tuple]) -> int:
+        """Merge older rows missing from the file by rewriting it (caller holds the lock)"""
+        candles = np.array(rows, dtype=CANDLE_DTYPE)
+        positions = np.searchsorted(mapped['timestamp'], candles['timestamp'])
+        present = (positions < len(mapped)) & (
+            mapped['timestamp'][np.minimum(positions, len(mapped) - 1)] == candles['timestamp']
+        )
+        candles = candles[~present]
+        if not len(candles):
+            return 0
+        
+        path = self._path(symbol, timeframe)
+        # Re-read so rows appended above are included
+        existing = np.fromfile(path, dtype=CANDLE_DTYPE)
+        merged = np.concatenate([existing, candles])
+        merged = merged[np.argsort(merged['timestamp'], kind='stable')]
+        
+        temp_path = path.with_suffix('.tmp')
+        merged.tofile(temp_path)
+        os.replace(temp_path, path)
+        self._maps.pop((symbol, timeframe), None)
+        return len(candles)
+    
+    @staticmethod
+    def to_rows(candles: np.ndarray) -> List[list]:
+        """
+        Convert stored candles to CCXT-style OHLCV rows
+        
+        Args:
+            candles: Structured array of CANDLE_DTYPE
+            
+        Returns:
+            List of [timestamp, open, high, low, close, volume]
+        """
+        return [list(row) for row in candles.tolist()]
@@ -0,0 +1,228 @@
+"""
+Columnar market data for NewBot
+
+OHLCV candles held as contiguous NumPy columns instead of a list of
+Python lists. Column accessors are zero-copy read-only views, so
+strategies can hand `market_data.close` straight to the indicator
+kernels; a pandas DataFrame is only built (once) when `to_frame()` is
+called.
+"""
+
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+PRICE_COLUMNS = COLUMNS[1:]
+
+
+class MarketData:
+    """
+    OHLCV candles for one symbol and timeframe, oldest first
+    """
+    
+    __slots__ = ('symbol', 'timeframe', 'timestamps', '_prices', '_frame', '_rows')
+    
+    def __init__(self, symbol: str, timeframe: str, timestamps: np.ndarray, prices: np.ndarray):
+        """
+        Initialize market data
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            timestamps: int64 array of candle open times in milliseconds
+            prices: float64 array of shape (5, n) holding open, high, low,
+                close and volume rows
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        # Read-only views: the arrays may be the caller's own, which must
+        # stay writeable for them
+        self.timestamps = np.ascontiguousarray(timestamps, dtype=np.int64).view()
+        self._prices = np.ascontiguousarray(prices, dtype=np.float64).reshape(len(PRICE_COLUMNS), -1).view()
+        self.timestamps.flags.writeable = False
+        self._prices.flags.writeable = False
+        self._frame: Optional[pd.DataFrame] = None
+        self._rows: Optional[List[list]] = None
+    
+    @classmethod
+    def empty(cls, symbol: str, timeframe: str) -> 'MarketData':
+        """Market data without candles"""
+        return cls(symbol, timeframe, np.empty(0, dtype=np.int64), np.empty((len(PRICE_COLUMNS), 0)))
+    
+    @classmethod
+    def from_rows(cls, symbol: str, timeframe: str, rows: Sequence[Sequence[float]]) -> 'MarketData':
+        """
+        Build market data from CCXT-style OHLCV rows
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            rows: [timestamp, open, high, low, close, volume] rows
+            
+        Returns:
+            MarketData instance
+        """
+        if len(rows) == 0:
+            return cls.empty(symbol, timeframe)
+        
+        table = np.asarray(rows, dtype=np.float64)[:, :len(COLUMNS)]
+        return cls(symbol, timeframe, table[:, 0].astype(np.int64), table[:, 1:].T)
+    
+    @classmethod
+    def from_candles(cls, symbol: str, timeframe: str, candles: np.ndarray) -> 'MarketData':
+        """
+        Build market data from a structured candle array (see CANDLE_DTYPE)
+        
+        Args:
+            symbol: Trading pair symbol
+            timeframe: CCXT timeframe string
+            candles: Structured array with the OHLCV fields
+            
+        Returns:
+            MarketData instance
+        """
+        prices = np.empty((len(PRICE_COLUMNS), len(candles)), dtype=np.float64)
+        for index, column in enumerate(PRICE_COLUMNS):
+            prices[index] = candles[column]
+        return cls(symbol, timeframe, candles['timestamp'], prices)
+    
+    @classmethod
+    def coerce(cls, market_data: Any) -> 'MarketData':
+        """
+        Accept market data in the old {'symbol', 'timeframe', 'data'} form too
+        
+        Args:
+            market_data: MarketData, or a dict whose 'data' holds OHLCV rows
+                or a structured candle array
+                
+        Returns:
+            MarketData instance
+            
+        Raises:
+            TypeError: If market_data is neither
+        """
+        if isinstance(market_data, cls):
+            return market_data
+        if isinstance(market_data, dict) and 'data' in market_data:
+            symbol = market_data.get('symbol', '')
+            timeframe = market_data.get('timeframe', '')
+            data = market_data['data']
+            if isinstance(data, np.ndarray) and data.dtype.names:
+                return cls.from_candles(symbol, timeframe, data)
+            return cls.from_rows(symbol, timeframe, data)
+        raise TypeError(f"Expected MarketData or an OHLCV payload dict, got {type(market_data).__name__}")
+    
+    @property
+    def open(self) -> np.ndarray:
+        """Open prices"""
+        return self._prices[0]
+    
+    @property
+    def high(self) -> np.ndarray:
+        """High prices"""
+        return self._prices[1]
+    
+    @property
+    def low(self) -> np.ndarray:
+        """Low prices"""
+        return self._prices[2]
+    
+    @property
+    def close(self) -> np.ndarray:
+        """Close prices"""
+        return self._prices[3]
+    
+    @property
+    def volume(self) -> np.ndarray:
+        """Volumes"""
+        return self._prices[4]
+    
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Open time of the newest candle"""
+        return int(self.timestamps[-1]) if len(self.timestamps) else None
+    
+    @property
+    def last_close(self) -> Optional[float]:
+        """Close of the newest candle"""
+        return float(self._prices[3, -1]) if len(self.timestamps) else None
+    
+    def tail(self, limit: int) -> 'MarketData':
+        """
+        Get the newest candles as a zero-copy MarketData view
+        
+        Args:
+            limit: Number of candles
+            
+        Returns:
+            MarketData instance
+        """
+        start = max(len(self) - limit, 0)
+        return MarketData(self.symbol, self.timeframe, self.timestamps[start:], self._prices[:, start:])
+    
+    def slice(self, start: int, stop: int) -> 'MarketData':
+        """
+        Get candles start..stop-1 as a zero-copy MarketData view
+        
+        Args:
+            start: First candle index
+            stop: End index (exclusive)
+            
+        Returns:
+            MarketData instance
+        """
+        return MarketData(self.symbol, self.timeframe, self.timestamps[start:stop], self._prices[:, start:stop])
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the candles as a DataFrame (built once, then cached)
+        
+        Returns:
+            DataFrame with timestamp, open, high, low, close, volume columns
+        """
+        if self._frame is None:
+            columns = {'timestamp': self.timestamps}
+            for index, column in enumerate(PRICE_COLUMNS):
+                columns[column] = self._prices[index]
+            self._frame = pd.DataFrame(columns, columns=list(COLUMNS))
+        return self._frame
+    
+    def to_rows(self) -> List[list]:
+        """
+        Get the candles as CCXT-style OHLCV rows
+        
+        Returns:
+            List of [timestamp, open, high, low, close, volume]
+        """
+        if self._rows is None:
+            self._rows = [
+                [timestamp, *prices]
+                for timestamp, prices in zip(self.timestamps.tolist(), self._prices.T.tolist())
+            ]
+        return self._rows
+    
+    def __len__(self) -> int:
+        return len(self.timestamps)
+    
+    def __repr__(self) -> str:
+        return f"MarketData(symbol={self.symbol!r}, timeframe={self.timeframe!r}, candles={len(self)})"
+    
+    # Dictionary-style access for callers written against the old
+    # {'symbol', 'timeframe', 'data'} payload
+    
+    def __getitem__(self, key: str) -> Any:
+        if key == 'data':
+            return self.to_rows()
+        if key in ('symbol', 'timeframe'):
+            return getattr(self, key)
+        raise KeyError(key)
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dictionary-style get() (see __getitem__)"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
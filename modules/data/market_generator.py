@@ -0,0 +1,207 @@
+"""
+Synthetic market data for NewBot
+
+Generates reproducible OHLCV candles for many symbols at once with
+NumPy. Prices follow a geometric Brownian motion whose drift and
+volatility can switch between regimes, with clustered volatility (an
+AR(1) process on log-volatility) and occasional opening gaps. Every call
+continues the series where the previous one stopped, so the same seed
+and sequence of calls always produce the same candles.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from modules.data.market_data import MarketData, PRICE_COLUMNS
+from utils.scheduling.loop_scheduler import timeframe_to_seconds
+
+
+SECONDS_PER_YEAR = 365 * 86400
+
+
+def ar1(shocks: np.ndarray, phi: float, state: np.ndarray, chunk: int = 256) -> np.ndarray:
+    """
+    Run x[t] = phi * x[t-1] + shocks[t] along the last axis
+    
+    Bars are processed in chunks: within a chunk the recursion is a
+    scaled cumulative sum, so only the chunk boundaries are sequential.
+    
+    Args:
+        shocks: Array of shape (symbols, bars)
+        phi: Persistence, 0 <= phi < 1
+        state: x[-1] per symbol
+        chunk: Maximum chunk length
+        
+    Returns:
+        Array of the same shape as shocks
+    """
+    symbols, count = shocks.shape
+    if count == 0:
+        return np.empty_like(shocks)
+    if phi <= 0:
+        return shocks.copy()
+    
+    # Keep phi ** -length well inside float range
+    length = int(max(1, min(chunk, 18 / -np.log(phi))))
+    chunks = -(-count // length)
+    padded = np.zeros((symbols, chunks * length))
+    padded[:, :count] = shocks
+    padded = padded.reshape(symbols, chunks, length)
+    
+    powers = phi ** np.arange(length)
+    local = np.cumsum(padded / powers, axis=2) * powers
+    
+    # Value each chunk starts from, carried across chunk boundaries
+    starts = np.empty((symbols, chunks))
+    carry = np.asarray(state, dtype=np.float64)
+    decay = phi ** length
+    for index in range(chunks):
+        starts[:, index] = carry
+        carry = carry * decay + local[:, index, -1]
+    
+    values = local + starts[:, :, None] * (powers * phi)
+    return values.reshape(symbols, -1)[:, :count]
+
+
+class MarketGenerator:
+    """
+    Seeded generator of continuous OHLCV series for a set of symbols
+    """
+    
+    def __init__(self, symbols: Sequence[str], timeframe: str = '1h', seed=None,
+                 start_price: Union[float, Dict[str, float]] = 50000.0, start_timestamp: int = 0,
+                 drift: float = 0.0, volatility: float = 0.6,
+                 regimes: Optional[Sequence[Tuple[float, float]]] = None,
+                 regime_switch_probability: float = 0.0,
+                 volatility_of_volatility: float = 0.0, volatility_persistence: float = 0.99,
+                 gap_probability: float = 0.0, gap_size: float = 0.02,
+                 base_volume: float = 500.0):
+        """
+        Initialize generator
+        
+        Args:
+            symbols: Symbols to generate
+            timeframe: CCXT timeframe string of the candles
+            seed: NumPy seed (int or sequence of ints; None = random)
+            start_price: Initial price, for all or per symbol
+            start_timestamp: Open time of the first candle in milliseconds
+            drift: Annualized drift (used when no regimes are given)
+            volatility: Annualized volatility (used when no regimes are given)
+            regimes: (annualized drift, annualized volatility) pairs
+            regime_switch_probability: Chance per bar of drawing a new regime
+            volatility_of_volatility: Standard deviation of log-volatility
+                (0 = constant volatility)
+            volatility_persistence: AR(1) coefficient of log-volatility;
+                higher values give longer volatility clusters
+            gap_probability: Chance per bar that it opens away from the
+                previous close
+            gap_size: Standard deviation of a gap (log return)
+            base_volume: Typical volume per bar
+        """
+        self.symbols: List[str] = list(symbols)
+        self.timeframe = timeframe
+        self.period_ms = timeframe_to_seconds(timeframe) * 1000
+        self.dt = timeframe_to_seconds(timeframe) / SECONDS_PER_YEAR
+        self.rng = np.random.default_rng(seed)
+        
+        regimes = regimes or [(drift, volatility)]
+        self.regime_drift = np.array([regime[0] for regime in regimes], dtype=np.float64)
+        self.regime_volatility = np.array([regime[1] for regime in regimes], dtype=np.float64)
+        self.regime_switch_probability = regime_switch_probability
+        self.volatility_of_volatility = volatility_of_volatility
+        self.volatility_persistence = volatility_persistence
+        self.gap_probability = gap_probability
+        self.gap_size = gap_size
+        self.base_volume = base_volume
+        
+        # Per-symbol state carried from one call to the next
+        if isinstance(start_price, dict):
+            prices = [start_price[symbol] for symbol in self.symbols]
+        else:
+            prices = [start_price] * len(self.symbols)
+        self.last_close = np.array(prices, dtype=np.float64)
+        self.log_volatility = np.zeros(len(self.symbols))
+        self.regime = np.zeros(len(self.symbols), dtype=np.int64)
+        self.next_timestamp = int(start_timestamp)
+    
+    def generate_arrays(self, count: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate the next candles of every symbol
+        
+        Args:
+            count: Candles per symbol
+            
+        Returns:
+            Tuple of (int64 timestamps of shape (count,), float64 prices of
+            shape (symbols, 5, count) holding open, high, low, close and
+            volume)
+        """
+        symbols = len(self.symbols)
+        rng = self.rng
+        timestamps = self.next_timestamp + np.arange(count, dtype=np.int64) * self.period_ms
+        prices = np.empty((symbols, len(PRICE_COLUMNS), count))
+        if count == 0:
+            return timestamps, prices
+        
+        # Regimes: a new segment starts at every switch, each segment draws a regime
+        if len(self.regime_drift) > 1 and self.regime_switch_probability > 0:
+            segment = np.cumsum(rng.random((symbols, count)) < self.regime_switch_probability, axis=1)
+            choices = rng.integers(0, len(self.regime_drift), (symbols, int(segment.max()) + 1))
+            choices[:, 0] = self.regime
+            regime = np.take_along_axis(choices, segment, axis=1)
+        else:
+            regime = np.broadcast_to(self.regime[:, None], (symbols, count))
+        self.regime = regime[:, -1].copy()
+        
+        # Clustered volatility: stationary AR(1) on log-volatility
+        if self.volatility_of_volatility > 0:
+            phi = self.volatility_persistence
+            shocks = rng.normal(0.0, self.volatility_of_volatility * np.sqrt(1 - phi * phi), (symbols, count))
+            log_volatility = ar1(shocks, phi, self.log_volatility)
+            self.log_volatility = log_volatility[:, -1].copy()
+            scale = np.exp(log_volatility - self.volatility_of_volatility ** 2 / 2)
+        else:
+            scale = np.ones((symbols, count))
+        
+        sigma = self.regime_volatility[regime] * scale * np.sqrt(self.dt)
+        mu = self.regime_drift[regime] * self.dt
+        returns = mu - sigma * sigma / 2 + sigma * rng.standard_normal((symbols, count))
+        
+        gaps = np.zeros((symbols, count))
+        if self.gap_probability > 0:
+            gapped = rng.random((symbols, count)) < self.gap_probability
+            gaps[gapped] = rng.normal(0.0, self.gap_size, int(gapped.sum()))
+        
+        # Log prices: each bar opens at the previous close plus its gap
+        log_close = np.log(self.last_close)[:, None] + np.cumsum(returns + gaps, axis=1)
+        close = np.exp(log_close)
+        open_ = np.exp(log_close - returns)
+        
+        # Wicks reach beyond the body by a fraction of the bar's volatility
+        wicks = np.abs(rng.standard_normal((2, symbols, count))) * sigma * 0.5
+        prices[:, 0] = open_
+        prices[:, 1] = np.maximum(open_, close) * np.exp(wicks[0])
+        prices[:, 2] = np.minimum(open_, close) * np.exp(-wicks[1])
+        prices[:, 3] = close
+        prices[:, 4] = self.base_volume * scale * rng.lognormal(0.0, 0.5, (symbols, count))
+        
+        self.last_close = close[:, -1].copy()
+        self.next_timestamp += count * self.period_ms
+        return timestamps, prices
+    
+    def generate(self, count: int) -> Dict[str, MarketData]:
+        """
+        Generate the next candles of every symbol
+        
+        Args:
+            count: Candles per symbol
+            
+        Returns:
+            Dictionary of symbol -> MarketData
+        """
+        timestamps, prices = self.generate_arrays(count)
+        return {
+            symbol: MarketData(symbol, self.timeframe, timestamps, prices[index])
+            for index, symbol in enumerate(self.symbols)
+        }
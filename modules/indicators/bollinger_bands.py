@@ -4,21 +4,27 @@ Bollinger Bands Indicator
 Calculates Bollinger Bands for volatility analysis
 """
 
+import numpy as np
 import pandas as pd
 
+from modules.indicators.kernels import bollinger_kernel
+
 
 def calculate_bollinger_bands(prices: pd.Series, period: int = 20, num_std: float = 2.0) -> tuple:
     """
     Calculate Bollinger Bands
     
     Args:
-        prices: Series of closing prices
+        prices: Series of closing prices (a numpy array uses the NumPy kernel)
         period: Moving average period
         num_std: Number of standard deviations
         
     Returns:
         Tuple of (Upper Band, Middle Band, Lower Band)
     """
+    if isinstance(prices, np.ndarray):
+        return bollinger_kernel(prices, period, num_std)
+    
     # Calculate middle band (SMA)
     middle_band = prices.rolling(window=period).mean()
     
@@ -0,0 +1,146 @@
+"""
+Indicator Cache
+
+Memoizes indicator results per (symbol, timeframe, indicator, params,
+last bar) so strategies and loop iterations that ask for the same
+indicator on the same candles share one computation. Entries are evicted
+least-recently-used once the configured memory cap is exceeded.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import config
+from modules.data.market_data import MarketData
+
+
+def _size_of(value: Any) -> int:
+    """Approximate memory footprint of a cached value in bytes"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.sum(value.memory_usage(index=True, deep=False)))
+    if isinstance(value, (tuple, list)):
+        return sum(_size_of(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def _freeze(value: Any) -> Any:
+    """Mark arrays read-only so a shared cached result cannot be mutated"""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            _freeze(item)
+    return value
+
+
+class IndicatorCache:
+    """
+    Thread-safe LRU cache for indicator results with a memory cap
+    """
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize indicator cache
+        
+        Args:
+            max_bytes: Memory cap for cached results
+        """
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(market_data: MarketData, indicator: str, params: Tuple) -> Optional[Tuple[Hashable, ...]]:
+        """
+        Build the cache key for an indicator over a market data payload
+        
+        The last bar's timestamp identifies the candle set; its close is
+        included too so a revised, still-forming bar is not served stale.
+        
+        Args:
+            market_data: Broker market data
+            indicator: Indicator name (e.g. 'ema')
+            params: Indicator parameters
+            
+        Returns:
+            Key tuple, or None if the payload cannot be identified
+        """
+        if market_data.symbol is None or len(market_data) == 0:
+            return None
+        return (market_data.symbol, market_data.timeframe, indicator, tuple(params),
+                market_data.last_timestamp, market_data.last_close, len(market_data))
+    
+    def get_or_compute(self, key: Optional[Tuple[Hashable, ...]], compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached result for a key, computing it on a miss
+        
+        Args:
+            key: Key from make_key() (None bypasses the cache)
+            compute: Function producing the indicator result
+            
+        Returns:
+            Indicator result (arrays are read-only)
+        """
+        if key is None or self.max_bytes <= 0:
+            return compute()
+        
+        with self._lock:
+            if key in self.entries:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return self.entries[key][0]
+            self.misses += 1
+        
+        value = _freeze(compute())
+        size = _size_of(value)
+        
+        with self._lock:
+            if key not in self.entries and size <= self.max_bytes:
+                self.entries[key] = (value, size)
+                self.bytes += size
+                while self.bytes > self.max_bytes:
+                    _, (_, evicted_size) = self.entries.popitem(last=False)
+                    self.bytes -= evicted_size
+                    self.evictions += 1
+        return value
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Returns:
+            Dictionary with hits, misses, hit_rate, evictions, entries, bytes
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+            }
+    
+    def clear(self):
+        """Drop all cached results (counters are kept)"""
+        with self._lock:
+            self.entries.clear()
+            self.bytes = 0
+
+
+# Shared cache instance
+indicator_cache = IndicatorCache(
+    max_bytes=int(config.get('strategy.indicator_cache_mb', 64) * 1024 * 1024)
+)
@@ -0,0 +1,336 @@
+"""
+NumPy Indicator Kernels
+
+Indicator implementations on plain float64 numpy arrays, without pandas'
+per-call overhead. The calculate_* functions dispatch here when given a
+numpy array instead of a pandas Series.
+
+Every kernel accepts an optional preallocated `out` array (same length as
+the input) so hot loops can reuse buffers. Leading values that are not
+yet defined are NaN, exactly as in the pandas implementations. Inputs are
+expected to be finite (no NaN gaps).
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# Below this length a plain Python recursion beats the blocked matmul
+_EMA_LOOP_THRESHOLD = 256
+_EMA_BLOCK = 64
+
+# Rolling std switches from per-window to chunked cumulative sums above this
+_STD_CHUNK = 1024
+
+
+def _output(values: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+    """Return `out` (validated) or a fresh output array"""
+    if out is None:
+        return np.empty(len(values), dtype=np.float64)
+    if out.shape != (len(values),):
+        raise ValueError(f"Output buffer has shape {out.shape}, expected ({len(values)},)")
+    return out
+
+
+def sma_kernel(values: np.ndarray, period: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Simple Moving Average via cumulative sums
+    
+    Args:
+        values: Array of prices
+        period: Moving average period
+        out: Optional preallocated output array
+        
+    Returns:
+        Array of SMA values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = _output(values, out)
+    count = len(values)
+    
+    if period > count:
+        out[:] = np.nan
+        return out
+    
+    # Centering on the first value keeps the running sum small
+    base = values[0]
+    csum = np.empty(count + 1)
+    csum[0] = 0.0
+    np.cumsum(values - base, out=csum[1:])
+    
+    out[:period - 1] = np.nan
+    np.subtract(csum[period:], csum[:-period], out=out[period - 1:])
+    out[period - 1:] /= period
+    out[period - 1:] += base
+    return out
+
+
+def wma_kernel(values: np.ndarray, period: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Weighted Moving Average as a linear-weight convolution
+    
+    Weights 1..period (newest bar heaviest), normalized once. Windows that
+    contain NaN produce NaN, as with pandas rolling windows.
+    
+    Args:
+        values: Array of prices
+        period: Moving average period
+        out: Optional preallocated output array
+        
+    Returns:
+        Array of WMA values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = _output(values, out)
+    
+    if period > len(values):
+        out[:] = np.nan
+        return out
+    
+    # np.convolve flips the kernel, so oldest-to-newest weights go in reversed
+    weights = np.arange(period, 0, -1, dtype=np.float64)
+    weights /= weights.sum()
+    
+    out[:period - 1] = np.nan
+    out[period - 1:] = np.convolve(values, weights, mode='valid')
+    return out
+
+
+def hma_kernel(values: np.ndarray, period: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Hull Moving Average: WMA(2 * WMA(x, period/2) - WMA(x, period), sqrt(period))
+    
+    Args:
+        values: Array of prices
+        period: Moving average period
+        out: Optional preallocated output array
+        
+    Returns:
+        Array of HMA values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    half = max(int(period / 2), 1)
+    root = max(int(np.sqrt(period)), 1)
+    
+    raw = wma_kernel(values, half)
+    raw *= 2.0
+    raw -= wma_kernel(values, period)
+    
+    out = _output(values, out)
+    valid = period - 1
+    out[:valid] = np.nan
+    if valid < len(values):
+        wma_kernel(raw[valid:], root, out=out[valid:])
+    return out
+
+
+def _linear_recurrence(inputs: np.ndarray, decay: float, initial: float) -> np.ndarray:
+    """
+    Solve y[t] = decay * y[t-1] + inputs[t] with y[-1] = initial
+    
+    Blocks of _EMA_BLOCK steps are solved with one matrix product. The
+    block-end values follow the same recurrence with decay**block, so they
+    are solved recursively and broadcast back into each block.
+    """
+    count = len(inputs)
+    if count <= _EMA_LOOP_THRESHOLD:
+        result = []
+        value = initial
+        for item in inputs.tolist():
+            value = decay * value + item
+            result.append(value)
+        return np.array(result, dtype=np.float64)
+    
+    block = _EMA_BLOCK
+    powers = decay ** np.arange(block + 1)
+    # lower[t, k] = decay**(t - k) for k <= t
+    lags = np.subtract.outer(np.arange(block), np.arange(block))
+    lower = np.where(lags >= 0, powers[np.clip(lags, 0, block)], 0.0)
+    
+    full = count // block * block
+    local = inputs[:full].reshape(-1, block) @ lower.T
+    
+    # Value entering each block, then its decayed contribution per step
+    ends = _linear_recurrence(local[:, -1], powers[block], initial)
+    entering = np.empty(len(ends))
+    entering[0] = initial
+    entering[1:] = ends[:-1]
+    local += np.multiply.outer(entering, powers[1:])
+    
+    result = np.empty(count)
+    result[:full] = local.ravel()
+    value = ends[-1]
+    for index in range(full, count):
+        value = decay * value + inputs[index]
+        result[index] = value
+    return result
+
+
+def ema_kernel(values: np.ndarray, period: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Exponential Moving Average (pandas ewm(span=period, adjust=False))
+    
+    Evaluated as the linear recurrence ema[t] = (1 - a) * ema[t-1] + a * x[t]
+    seeded with x[0], in blocks so long inputs avoid a per-element loop.
+    
+    Args:
+        values: Array of prices
+        period: EMA span
+        out: Optional preallocated output array
+        
+    Returns:
+        Array of EMA values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = _output(values, out)
+    if len(values) == 0:
+        return out
+    
+    alpha = 2.0 / (period + 1)
+    out[:] = _linear_recurrence(alpha * values, 1.0 - alpha, values[0])
+    return out
+
+
+def rsi_kernel(values: np.ndarray, period: int = 14, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    RSI with rolling-mean averages (same definition as calculate_rsi)
+    
+    Args:
+        values: Array of closing prices
+        period: RSI period
+        out: Optional preallocated output array
+        
+    Returns:
+        Array of RSI values
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = _output(values, out)
+    count = len(values)
+    if count == 0:
+        return out
+    
+    delta = np.empty(count)
+    delta[0] = 0.0
+    np.subtract(values[1:], values[:-1], out=delta[1:])
+    
+    avg_gains = sma_kernel(np.maximum(delta, 0.0), period)
+    avg_losses = sma_kernel(np.maximum(-delta, 0.0), period)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        np.divide(avg_gains, avg_losses, out=out)
+        out += 1.0
+        np.divide(100.0, out, out=out)
+        np.subtract(100.0, out, out=out)
+    return out
+
+
+def rolling_std_kernel(values: np.ndarray, period: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Rolling sample standard deviation (ddof=1)
+    
+    Long inputs are split into overlapping chunks, each centered on its own
+    mean before taking cumulative sums, which keeps the sum-of-squares
+    formula accurate without a per-window pass.
+    
+    Args:
+        values: Array of prices
+        period: Window length
+        out: Optional preallocated output array
+        
+    Returns:
+        Array of standard deviations
+    """
+    values = np.asarray(values, dtype=np.float64)
+    out = _output(values, out)
+    count = len(values)
+    
+    if period > count or period < 2:
+        out[:] = np.nan
+        return out
+    
+    out[:period - 1] = np.nan
+    if count <= _STD_CHUNK:
+        np.std(sliding_window_view(values, period), axis=1, ddof=1, out=out[period - 1:])
+        return out
+    
+    outputs = count - period + 1
+    chunks = -(-outputs // _STD_CHUNK)
+    span = _STD_CHUNK + period - 1
+    padded = np.empty(chunks * _STD_CHUNK + period - 1)
+    padded[:count] = values
+    padded[count:] = values[-1]
+    
+    rows = sliding_window_view(padded, span)[::_STD_CHUNK]
+    centered = rows - rows.mean(axis=1, keepdims=True)
+    sums = np.zeros((chunks, span + 1))
+    np.cumsum(centered, axis=1, out=sums[:, 1:])
+    centered *= centered
+    squares = np.zeros((chunks, span + 1))
+    np.cumsum(centered, axis=1, out=squares[:, 1:])
+    
+    window_sums = sums[:, period:] - sums[:, :-period]
+    variance = squares[:, period:] - squares[:, :-period]
+    window_sums *= window_sums
+    window_sums /= period
+    variance -= window_sums
+    variance /= period - 1
+    np.maximum(variance, 0.0, out=variance)
+    np.sqrt(variance.ravel()[:outputs], out=out[period - 1:])
+    return out
+
+
+def bollinger_kernel(values: np.ndarray, period: int = 20, num_std: float = 2.0,
+                     out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands
+    
+    Args:
+        values: Array of closing prices
+        period: Moving average period
+        num_std: Number of standard deviations
+        out: Optional preallocated (3, n) array receiving upper, middle, lower
+        
+    Returns:
+        Tuple of (Upper Band, Middle Band, Lower Band) arrays
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if out is None:
+        out = np.empty((3, len(values)), dtype=np.float64)
+    upper, middle, lower = out[0], out[1], out[2]
+    
+    sma_kernel(values, period, out=middle)
+    rolling_std_kernel(values, period, out=upper)
+    upper *= num_std
+    np.subtract(middle, upper, out=lower)
+    upper += middle
+    return upper, middle, lower
+
+
+def macd_kernel(values: np.ndarray, fast_period: int = 12, slow_period: int = 26,
+                signal_period: int = 9, out: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    MACD
+    
+    Args:
+        values: Array of closing prices
+        fast_period: Fast EMA period
+        slow_period: Slow EMA period
+        signal_period: Signal line period
+        out: Optional preallocated (3, n) array receiving macd, signal, histogram
+        
+    Returns:
+        Tuple of (MACD line, Signal line, Histogram) arrays
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if out is None:
+        out = np.empty((3, len(values)), dtype=np.float64)
+    macd_line, signal_line, histogram = out[0], out[1], out[2]
+    
+    ema_kernel(values, fast_period, out=macd_line)
+    ema_kernel(values, slow_period, out=histogram)
+    macd_line -= histogram
+    ema_kernel(macd_line, signal_period, out=signal_line)
+    np.subtract(macd_line, signal_line, out=histogram)
+    return macd_line, signal_line, histogram
@@ -4,20 +4,25 @@ Moving Average Indicators
 Various moving average calculations
 """
 
+import numpy as np
 import pandas as pd
 
+from modules.indicators.kernels import sma_kernel, ema_kernel, wma_kernel, hma_kernel, macd_kernel
+
 
 def calculate_sma(prices: pd.Series, period: int) -> pd.Series:
     """
     Calculate Simple Moving Average (SMA)
     
     Args:
-        prices: Series of prices
+        prices: Series of prices (a numpy array uses the NumPy kernel)
         period: Moving average period
         
     Returns:
-        Series of SMA values
+        Series of SMA values (array for array input)
     """
+    if isinstance(prices, np.ndarray):
+        return sma_kernel(prices, period)
     return prices.rolling(window=period).mean()
 
 
@@ -26,12 +31,14 @@ def calculate_ema(prices: pd.Series, period: int) -> pd.Series:
     Calculate Exponential Moving Average (EMA)
     
     Args:
-        prices: Series of prices
+        prices: Series of prices (a numpy array uses the NumPy kernel)
         period: Moving average period
         
     Returns:
-        Series of EMA values
+        Series of EMA values (array for array input)
     """
+    if isinstance(prices, np.ndarray):
+        return ema_kernel(prices, period)
     return prices.ewm(span=period, adjust=False).mean()
 
 
@@ -40,18 +47,33 @@ def calculate_wma(prices: pd.Series, period: int) -> pd.Series:
     Calculate Weighted Moving Average (WMA)
     
     Args:
-        prices: Series of prices
+        prices: Series of prices (a numpy array returns an array)
         period: Moving average period
         
     Returns:
         Series of WMA values
     """
-    weights = pd.Series(range(1, period + 1))
+    if isinstance(prices, np.ndarray):
+        return wma_kernel(prices, period)
+    return pd.Series(wma_kernel(prices.to_numpy(dtype=float), period), index=prices.index)
+
+
+def calculate_hma(prices: pd.Series, period: int) -> pd.Series:
+    """
+    Calculate Hull Moving Average (HMA)
     
-    def weighted_mean(x):
-        return (x * weights).sum() / weights.sum()
+    HMA = WMA(2 * WMA(prices, period / 2) - WMA(prices, period), sqrt(period))
     
-    return prices.rolling(window=period).apply(weighted_mean, raw=True)
+    Args:
+        prices: Series of prices (a numpy array returns an array)
+        period: Moving average period
+        
+    Returns:
+        Series of HMA values
+    """
+    if isinstance(prices, np.ndarray):
+        return hma_kernel(prices, period)
+    return pd.Series(hma_kernel(prices.to_numpy(dtype=float), period), index=prices.index)
 
 
 def calculate_macd(prices: pd.Series, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> tuple:
@@ -59,7 +81,7 @@ def calculate_macd(prices: pd.Series, fast_period: int = 12, slow_period: int =
     Calculate MACD (Moving Average Convergence Divergence)
     
     Args:
-        prices: Series of closing prices
+        prices: Series of closing prices (a numpy array uses the NumPy kernel)
         fast_period: Fast EMA period
         slow_period: Slow EMA period
         signal_period: Signal line period
@@ -67,6 +89,9 @@ def calculate_macd(prices: pd.Series, fast_period: int = 12, slow_period: int =
     Returns:
         Tuple of (MACD line, Signal line, Histogram)
     """
+    if isinstance(prices, np.ndarray):
+        return macd_kernel(prices, fast_period, slow_period, signal_period)
+    
     # Calculate EMAs
     fast_ema = calculate_ema(prices, fast_period)
     slow_ema = calculate_ema(prices, slow_period)
@@ -4,20 +4,26 @@ RSI (Relative Strength Index) Indicator
 Calculates RSI values for price data
 """
 
+import numpy as np
 import pandas as pd
 
+from modules.indicators.kernels import rsi_kernel
+
 
 def calculate_rsi(prices: pd.Series, period: int = 14) -> pd.Series:
     """
     Calculate RSI (Relative Strength Index)
     
     Args:
-        prices: Series of closing prices
+        prices: Series of closing prices (a numpy array uses the NumPy kernel)
         period: RSI period (default: 14)
         
     Returns:
-        Series of RSI values
+        Series of RSI values (array for array input)
     """
+    if isinstance(prices, np.ndarray):
+        return rsi_kernel(prices, period)
+    
     # Calculate price changes
     delta = prices.diff()
     
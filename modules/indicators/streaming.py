@@ -0,0 +1,317 @@
+"""
+Streaming Indicators
+
+Stateful counterparts of the batch indicator functions. Each indicator
+takes one bar at a time and updates its value in O(1):
+
+- update(value): a new bar was added
+- revise(value): the last (still-forming) bar changed
+
+Values match calculate_sma, calculate_ema, calculate_rsi,
+calculate_bollinger_bands and calculate_macd within floating point
+tolerance, including NaN during the warm-up period.
+"""
+
+import math
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+
+NAN = float('nan')
+
+
+class StreamingSMA:
+    """
+    Simple Moving Average from a running window sum
+    """
+    
+    def __init__(self, period: int):
+        """
+        Initialize SMA
+        
+        Args:
+            period: Moving average period
+        """
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.total = 0.0
+        self._updates = 0
+    
+    def update(self, value: float) -> float:
+        """Add a new bar and return the current SMA"""
+        if len(self.window) == self.period:
+            self.total -= self.window[0]
+        self.window.append(value)
+        self.total += value
+        
+        # Re-sum once per period to stop rounding error from accumulating
+        self._updates += 1
+        if self._updates >= self.period:
+            self.total = math.fsum(self.window)
+            self._updates = 0
+        return self.value
+    
+    def revise(self, value: float) -> float:
+        """Replace the last bar and return the current SMA"""
+        if not self.window:
+            return self.update(value)
+        self.total += value - self.window[-1]
+        self.window[-1] = value
+        self._updates += 1
+        return self.value
+    
+    @property
+    def value(self) -> float:
+        """Current SMA (NaN until `period` bars were seen)"""
+        if len(self.window) < self.period:
+            return NAN
+        return self.total / self.period
+
+
+class StreamingEMA:
+    """
+    Exponential Moving Average (same recursion as pandas ewm(adjust=False))
+    """
+    
+    def __init__(self, period: int):
+        """
+        Initialize EMA
+        
+        Args:
+            period: EMA span
+        """
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self.ema: Optional[float] = None
+        self._previous: Optional[float] = None
+    
+    def update(self, value: float) -> float:
+        """Add a new bar and return the current EMA"""
+        self._previous = self.ema
+        self.ema = self._step(self._previous, value)
+        return self.ema
+    
+    def revise(self, value: float) -> float:
+        """Replace the last bar and return the current EMA"""
+        self.ema = self._step(self._previous, value)
+        return self.ema
+    
+    def _step(self, previous: Optional[float], value: float) -> float:
+        """Apply one EMA step on top of a previous value"""
+        if previous is None:
+            return value
+        return previous + self.alpha * (value - previous)
+    
+    @property
+    def value(self) -> float:
+        """Current EMA (NaN before the first bar)"""
+        return NAN if self.ema is None else self.ema
+
+
+class StreamingRSI:
+    """
+    Relative Strength Index
+    
+    smoothing='sma' (default) averages gains and losses over a rolling
+    window exactly like calculate_rsi; smoothing='wilder' uses Wilder's
+    recursive averages seeded with that first window.
+    """
+    
+    def __init__(self, period: int = 14, smoothing: str = 'sma'):
+        """
+        Initialize RSI
+        
+        Args:
+            period: RSI period
+            smoothing: 'sma' or 'wilder'
+        """
+        if smoothing not in ('sma', 'wilder'):
+            raise ValueError(f"Unsupported RSI smoothing: {smoothing}")
+        
+        self.period = period
+        self.smoothing = smoothing
+        self.gains = StreamingSMA(period)
+        self.losses = StreamingSMA(period)
+        self.closes = deque(maxlen=2)
+        self.avg_gain: Optional[float] = None
+        self.avg_loss: Optional[float] = None
+        self._previous_avgs: Tuple[Optional[float], Optional[float]] = (None, None)
+    
+    def _change(self, value: float) -> Tuple[float, float]:
+        """Gain and loss of `value` relative to the previous close"""
+        # The first bar has no previous close; calculate_rsi counts it as 0
+        if len(self.closes) < 2:
+            return 0.0, 0.0
+        delta = value - self.closes[0]
+        return max(delta, 0.0), max(-delta, 0.0)
+    
+    def update(self, value: float) -> float:
+        """Add a new bar and return the current RSI"""
+        self.closes.append(value)
+        gain, loss = self._change(value)
+        self.gains.update(gain)
+        self.losses.update(loss)
+        
+        if self.smoothing == 'wilder':
+            self._previous_avgs = (self.avg_gain, self.avg_loss)
+            self._wilder_step(gain, loss)
+        return self.value
+    
+    def revise(self, value: float) -> float:
+        """Replace the last bar and return the current RSI"""
+        if not self.closes:
+            return self.update(value)
+        
+        self.closes[-1] = value
+        gain, loss = self._change(value)
+        self.gains.revise(gain)
+        self.losses.revise(loss)
+        
+        if self.smoothing == 'wilder':
+            self.avg_gain, self.avg_loss = self._previous_avgs
+            self._wilder_step(gain, loss)
+        return self.value
+    
+    def _wilder_step(self, gain: float, loss: float):
+        """Advance Wilder's averages by one bar"""
+        if self.avg_gain is None:
+            # Seed with the simple average of the first full window
+            if not math.isnan(self.gains.value):
+                self.avg_gain = self.gains.value
+                self.avg_loss = self.losses.value
+            return
+        self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+        self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+    
+    @property
+    def value(self) -> float:
+        """Current RSI (NaN during warm-up)"""
+        if self.smoothing == 'wilder':
+            if self.avg_gain is None:
+                return NAN
+            avg_gain, avg_loss = self.avg_gain, self.avg_loss
+        else:
+            avg_gain, avg_loss = self.gains.value, self.losses.value
+            if math.isnan(avg_gain):
+                return NAN
+        
+        if avg_loss == 0:
+            return NAN if avg_gain == 0 else 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+
+class StreamingBollingerBands:
+    """
+    Bollinger Bands from a sliding-window Welford mean/variance
+    """
+    
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        """
+        Initialize Bollinger Bands
+        
+        Args:
+            period: Moving average period
+            num_std: Number of standard deviations
+        """
+        self.period = period
+        self.num_std = num_std
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+    
+    def update(self, value: float) -> Tuple[float, float, float]:
+        """Add a new bar and return (upper, middle, lower)"""
+        if len(self.window) < self.period:
+            # Growing window: classic Welford step
+            self.window.append(value)
+            delta = value - self.mean
+            self.mean += delta / len(self.window)
+            self.m2 += delta * (value - self.mean)
+        else:
+            self._replace(self.window[0], value)
+            self.window.append(value)
+        return self.value
+    
+    def revise(self, value: float) -> Tuple[float, float, float]:
+        """Replace the last bar and return (upper, middle, lower)"""
+        if not self.window:
+            return self.update(value)
+        self._replace(self.window[-1], value)
+        self.window[-1] = value
+        return self.value
+    
+    def _replace(self, old: float, new: float):
+        """Swap one value of a fixed-size window"""
+        count = len(self.window)
+        old_mean = self.mean
+        self.mean += (new - old) / count
+        self.m2 += (new - old) * (new - self.mean + old - old_mean)
+        # Guard against tiny negative values from cancellation
+        if self.m2 < 0:
+            self.m2 = 0.0
+    
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        """Current (upper, middle, lower) bands (NaN during warm-up)"""
+        if len(self.window) < self.period or self.period < 2:
+            return NAN, NAN, NAN
+        std_dev = math.sqrt(self.m2 / (self.period - 1))
+        return (
+            self.mean + std_dev * self.num_std,
+            self.mean,
+            self.mean - std_dev * self.num_std,
+        )
+
+
+class StreamingMACD:
+    """
+    MACD line, signal line and histogram from three EMA states
+    """
+    
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        """
+        Initialize MACD
+        
+        Args:
+            fast_period: Fast EMA period
+            slow_period: Slow EMA period
+            signal_period: Signal line period
+        """
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal = StreamingEMA(signal_period)
+    
+    def update(self, value: float) -> Tuple[float, float, float]:
+        """Add a new bar and return (macd, signal, histogram)"""
+        macd_line = self.fast.update(value) - self.slow.update(value)
+        signal_line = self.signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+    
+    def revise(self, value: float) -> Tuple[float, float, float]:
+        """Replace the last bar and return (macd, signal, histogram)"""
+        macd_line = self.fast.revise(value) - self.slow.revise(value)
+        signal_line = self.signal.revise(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+    
+    @property
+    def value(self) -> Tuple[float, float, float]:
+        """Current (macd, signal, histogram)"""
+        macd_line = self.fast.value - self.slow.value
+        signal_line = self.signal.value
+        return macd_line, signal_line, macd_line - signal_line
+
+
+def prime(indicator, values: Iterable[float]):
+    """
+    Feed historical values into a streaming indicator
+    
+    Args:
+        indicator: Any streaming indicator instance
+        values: Historical closing prices, oldest first
+        
+    Returns:
+        The indicator's value after the last bar
+    """
+    for value in values:
+        indicator.update(value)
+    return indicator.value
@@ -0,0 +1,161 @@
+"""
+Background notification delivery for NewBot
+
+Notifications are raised from the trading path (order fills, failed
+orders, loop errors), so delivery must not wait for a mail server or a
+webhook endpoint. The dispatcher keeps one bounded queue per channel,
+drained by that channel's own worker threads: a slow SMTP server only
+backs up the email queue, and each channel's concurrency is configured
+separately. On shutdown the queues are flushed within a deadline.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from utils.logging.logger import Logger
+from utils.monitoring.metrics import metrics
+
+
+# Tells a worker thread to exit
+_STOP = object()
+
+
+class _Channel:
+    """Queue and worker threads of one delivery channel"""
+    
+    def __init__(self, name: str, workers: int, queue_size: int):
+        self.name = name
+        self.workers = max(1, int(workers))
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.threads: List[threading.Thread] = []
+
+
+class NotificationDispatcher:
+    """
+    Bounded per-channel queues drained by background worker threads
+    """
+    
+    def __init__(self, queue_size: int = 1000, workers: Optional[Dict[str, int]] = None):
+        """
+        Initialize dispatcher (worker threads start on first use)
+        
+        Args:
+            queue_size: Maximum pending deliveries per channel
+            workers: Worker threads per channel name (default 1)
+        """
+        self.queue_size = queue_size
+        self.workers = dict(workers or {})
+        self.channels: Dict[str, _Channel] = {}
+        self.dropped = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        self.logger = Logger('NotificationDispatcher')
+    
+    def _channel(self, name: str) -> _Channel:
+        """Get a channel, starting its workers on first use"""
+        channel = self.channels.get(name)
+        if channel is not None:
+            return channel
+        with self._lock:
+            channel = self.channels.get(name)
+            if channel is None:
+                channel = _Channel(name, self.workers.get(name, 1), self.queue_size)
+                for index in range(channel.workers):
+                    thread = threading.Thread(
+                        target=self._work, args=(channel,),
+                        name=f"notify-{name}-{index}", daemon=True
+                    )
+                    thread.start()
+                    channel.threads.append(thread)
+                self.channels[name] = channel
+        return channel
+    
+    def _work(self, channel: _Channel):
+        """Worker loop: deliver queued notifications until told to stop"""
+        while True:
+            item = channel.queue.get()
+            try:
+                if item is _STOP:
+                    return
+                func, args = item
+                with metrics.time('notification_delivery_seconds', channel=channel.name):
+                    func(*args)
+            except Exception as e:
+                self.logger.error(f"{channel.name} delivery failed: {e}")
+            finally:
+                channel.queue.task_done()
+    
+    def submit(self, channel: str, func: Callable, *args) -> bool:
+        """
+        Queue a delivery without blocking the caller
+        
+        Args:
+            channel: Channel name (e.g. 'email', 'webhook')
+            func: Delivery function, called in a worker thread
+            *args: Arguments for func
+            
+        Returns:
+            True if queued, False if the channel queue is full or closed
+        """
+        if self.closed:
+            return False
+        try:
+            self._channel(channel).queue.put_nowait((func, args))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            metrics.increment('notifications_dropped_total', channel=channel)
+            self.logger.error(f"{channel} notification queue full, dropping notification")
+            return False
+    
+    def pending(self) -> int:
+        """Deliveries queued or in progress across all channels"""
+        return sum(channel.queue.unfinished_tasks for channel in list(self.channels.values()))
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued delivery has finished
+        
+        Args:
+            timeout: Deadline in seconds (None waits indefinitely)
+            
+        Returns:
+            True if all queues drained before the deadline
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for channel in list(self.channels.values()):
+            pending = channel.queue
+            with pending.all_tasks_done:
+                while pending.unfinished_tasks:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    pending.all_tasks_done.wait(remaining)
+        return True
+    
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """
+        Stop accepting notifications, flush the queues and stop the workers
+        
+        Deliveries still pending at the deadline are abandoned; the worker
+        threads are daemons and do not keep the process alive.
+        
+        Args:
+            timeout: Flush deadline in seconds
+            
+        Returns:
+            True if everything was delivered
+        """
+        self.closed = True
+        flushed = self.flush(timeout)
+        if not flushed:
+            self.logger.warning(f"Notification flush timed out, {self.pending()} deliveries abandoned")
+            return False
+        for channel in self.channels.values():
+            for _ in channel.threads:
+                channel.queue.put(_STOP)
+            for thread in channel.threads:
+                thread.join(timeout=1.0)
+        return True
@@ -4,11 +4,15 @@ Notification system for NewBot
 Sends alerts via multiple channels (email, webhooks, etc.)
 """
 
-import requests
-from typing import Optional
+import os
+import threading
+from typing import List, Optional, Tuple
 from datetime import datetime
 
 from config import config
+from modules.notifications.dispatcher import NotificationDispatcher
+from modules.notifications.smtp_client import PooledSMTP
+from modules.notifications.webhook_client import WebhookClient
 from utils.logging.logger import Logger
 
 
@@ -21,6 +25,35 @@ class Notifier:
         """Initialize notifier"""
         self.logger = Logger('Notifier')
         self.enabled = config.get('notifications.enabled', True)
+        
+        # Deliver in background workers so the trading path never waits
+        # for a mail server or webhook endpoint
+        self.dispatcher = None
+        if config.get('notifications.async_delivery', True):
+            self.dispatcher = NotificationDispatcher(
+                queue_size=config.get('notifications.queue_size', 1000),
+                workers={
+                    'email': config.get('notifications.email.workers', 1),
+                    'webhook': config.get('notifications.webhook.workers', 2),
+                }
+            )
+        
+        # Shared SMTP session and webhook client, created on first use
+        self._smtp: Optional[PooledSMTP] = None
+        self._webhook: Optional[WebhookClient] = None
+        self._client_lock = threading.Lock()
+        
+        # Replay webhooks spooled by a previous run now, not only after
+        # the next notification
+        spool_path = config.get('notifications.webhook.spool_path')
+        if (self.enabled and config.get('notifications.webhook.enabled', False)
+                and spool_path and os.path.exists(spool_path)):
+            self._webhook_client()
+        
+        # Low/medium priority emails waiting for the next digest
+        self._digest: List[Tuple[str, str]] = []
+        self._digest_timer: Optional[threading.Timer] = None
+        self._digest_lock = threading.Lock()
     
     def send_notification(self, title: str, message: str, priority: str = 'low'):
         """
@@ -42,11 +75,101 @@ class Notifier:
         
         # Send via email
         if config.get('notifications.email.enabled', False):
-            self._send_email(title, full_message)
+            digest_window = config.get('notifications.email.digest_window_seconds', 0)
+            if digest_window > 0 and priority != 'high':
+                self._add_to_digest(title, full_message, digest_window)
+            else:
+                self._deliver('email', self._send_email, title, full_message)
         
         # Send via webhook
         if config.get('notifications.webhook.enabled', False):
-            self._send_webhook(title, full_message, priority)
+            self._deliver('webhook', self._send_webhook, title, full_message, priority)
+    
+    def _deliver(self, channel: str, func, *args):
+        """Queue a delivery, or run it inline when async delivery is off or closed"""
+        if self.dispatcher is not None and self.dispatcher.submit(channel, func, *args):
+            return
+        # submit() also refuses when the queue is full; that notification
+        # is dropped, but one raced by close() is still delivered
+        if self.dispatcher is None or self.dispatcher.closed:
+            func(*args)
+    
+    def _add_to_digest(self, title: str, message: str, window: float):
+        """Buffer an email until the digest window closes"""
+        with self._digest_lock:
+            self._digest.append((title, message))
+            if self._digest_timer is None:
+                self._digest_timer = threading.Timer(window, self.flush_digest)
+                self._digest_timer.daemon = True
+                self._digest_timer.start()
+    
+    def flush_digest(self):
+        """Send buffered low/medium priority emails as one digest email"""
+        with self._digest_lock:
+            entries, self._digest = self._digest, []
+            if self._digest_timer is not None:
+                self._digest_timer.cancel()
+                self._digest_timer = None
+        
+        if not entries:
+            return
+        if len(entries) == 1:
+            subject, body = entries[0]
+        else:
+            subject = f"{len(entries)} notifications"
+            body = f"\n\n{'-' * 40}\n\n".join(message for _, message in entries)
+        self._deliver('email', self._send_email, subject, body)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for queued notifications to be delivered
+        
+        Args:
+            timeout: Deadline in seconds (None waits indefinitely)
+            
+        Returns:
+            True if nothing is left pending
+        """
+        if self.dispatcher is None:
+            return True
+        return self.dispatcher.flush(timeout)
+    
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Flush pending notifications and stop the delivery workers
+        
+        Args:
+            timeout: Deadline in seconds (default notifications.flush_timeout_seconds)
+            
+        Returns:
+            True if everything was delivered
+        """
+        self.flush_digest()
+        delivered = True
+        if self.dispatcher is not None:
+            if timeout is None:
+                timeout = config.get('notifications.flush_timeout_seconds', 10)
+            delivered = self.dispatcher.close(timeout)
+        if self._webhook is not None and delivered:
+            self._webhook.close()
+        if self._smtp is not None and delivered:
+            self._smtp.close()
+        return delivered
+    
+    def _smtp_client(self) -> PooledSMTP:
+        """Get the shared SMTP session"""
+        with self._client_lock:
+            if self._smtp is None:
+                self._smtp = PooledSMTP(
+                    config.get('notifications.email.smtp_server'),
+                    config.get('notifications.email.smtp_port', 587),
+                    username=config.get('notifications.email.from_address'),
+                    password=config.get('notifications.email.password'),
+                    starttls=config.get('notifications.email.starttls', True),
+                    idle_timeout=config.get('notifications.email.idle_timeout_seconds', 60),
+                    timeout=config.get('monitoring.network_timeout_seconds', 30)
+                )
+            return self._smtp
     
     def _send_email(self, subject: str, message: str):
         """
@@ -57,15 +180,11 @@ class Notifier:
             message: Email message
         """
         try:
-            import smtplib
             from email.mime.text import MIMEText
             from email.mime.multipart import MIMEMultipart
             
-            smtp_server = config.get('notifications.email.smtp_server')
-            smtp_port = config.get('notifications.email.smtp_port', 587)
             from_address = config.get('notifications.email.from_address')
             to_address = config.get('notifications.email.to_address')
-            password = config.get('notifications.email.password')
             
             msg = MIMEMultipart()
             msg['From'] = from_address
@@ -74,16 +193,30 @@ class Notifier:
             
             msg.attach(MIMEText(message, 'plain'))
             
-            with smtplib.SMTP(smtp_server, smtp_port) as server:
-                server.starttls()
-                server.login(from_address, password)
-                server.send_message(msg)
+            self._smtp_client().send(msg)
             
             self.logger.info(f"Email sent to {to_address}")
-            
+        
         except Exception as e:
             self.logger.error(f"Failed to send email: {e}")
     
+    def _webhook_client(self) -> WebhookClient:
+        """Get the shared webhook client"""
+        with self._client_lock:
+            if self._webhook is None:
+                self._webhook = WebhookClient(
+                    config.get('notifications.webhook.url'),
+                    timeout=config.get('notifications.webhook.timeout_seconds', 10),
+                    batch_size=config.get('notifications.webhook.batch_size', 1),
+                    batch_window=config.get('notifications.webhook.batch_window_seconds', 2),
+                    spool_path=config.get('notifications.webhook.spool_path'),
+                    retry_base_delay=config.get('notifications.webhook.retry_base_delay_seconds', 5),
+                    retry_max_delay=config.get('notifications.webhook.retry_max_delay_seconds', 300),
+                    pool_size=config.get('notifications.webhook.workers', 2),
+                    dead_letter_path=config.get('notifications.webhook.dead_letter_path')
+                )
+            return self._webhook
+    
     def _send_webhook(self, title: str, message: str, priority: str):
         """
         Send webhook notification
@@ -94,8 +227,6 @@ class Notifier:
             priority: Priority level
         """
         try:
-            webhook_url = config.get('notifications.webhook.url')
-            
             payload = {
                 'title': title,
                 'message': message,
@@ -103,10 +234,8 @@ class Notifier:
                 'timestamp': datetime.now().isoformat()
             }
             
-            response = requests.post(webhook_url, json=payload, timeout=10)
-            response.raise_for_status()
-            
-            self.logger.info("Webhook notification sent")
-            
+            # Failed deliveries are spooled and retried by the client
+            self._webhook_client().send(payload)
+        
         except Exception as e:
             self.logger.error(f"Failed to send webhook: {e}")
@@ -0,0 +1,150 @@
+"""
+Reusable SMTP connection for NewBot notifications
+
+Opening an SMTP session costs a TCP connect, EHLO, a STARTTLS handshake
+and a login, far more than sending the message itself. PooledSMTP keeps
+one authenticated session open between messages, closes it from a timer
+after `idle_timeout` seconds without traffic (servers close idle sessions
+anyway, and an open socket should not outlive a burst of alerts) and
+transparently reconnects once when the server has hung up.
+"""
+
+import smtplib
+import threading
+import time
+from email.message import Message
+from typing import Optional
+
+from utils.logging.logger import Logger
+
+
+class PooledSMTP:
+    """
+    Thread-safe, lazily (re)connected SMTP session
+    """
+    
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None,
+                 password: Optional[str] = None, starttls: bool = True,
+                 idle_timeout: float = 60.0, timeout: float = 30.0):
+        """
+        Initialize client (connects on first send)
+        
+        Args:
+            host: SMTP server
+            port: SMTP port
+            username: Login name (no login if password is empty)
+            password: Login password
+            starttls: Upgrade the session with STARTTLS
+            idle_timeout: Close the session after this many idle seconds
+            timeout: Socket timeout in seconds
+        """
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.connects = 0
+        self.sent = 0
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._idle_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+        self.logger = Logger('PooledSMTP')
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new session"""
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.ehlo()
+            if self.starttls:
+                server.starttls()
+                server.ehlo()
+            if self.password:
+                server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self.connects += 1
+        return server
+    
+    def _disconnect(self):
+        """Close the current session, ignoring a server that already left"""
+        server, self._server = self._server, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            server.close()
+    
+    def _schedule_idle_close(self):
+        """Arm the idle timer unless it is already running (caller holds _lock)"""
+        if self._idle_timer is None:
+            self._start_idle_timer(self.idle_timeout)
+    
+    def _start_idle_timer(self, delay: float):
+        """Start the idle timer (caller holds _lock)"""
+        self._idle_timer = threading.Timer(delay, self._close_idle)
+        self._idle_timer.daemon = True
+        self._idle_timer.start()
+    
+    def _close_idle(self):
+        """Close the session if it stayed idle, otherwise wait for the rest"""
+        with self._lock:
+            self._idle_timer = None
+            if self._server is None:
+                return
+            # One timer per idle period: sends since it started only
+            # move the deadline
+            remaining = self._last_used + self.idle_timeout - time.monotonic()
+            if remaining > 0:
+                self._start_idle_timer(remaining)
+                return
+            self.logger.debug(f"Closing SMTP session idle for {self.idle_timeout:.0f}s")
+            self._disconnect()
+    
+    def send(self, msg: Message):
+        """
+        Send a message over the shared session
+        
+        Args:
+            msg: Email message
+            
+        Raises:
+            smtplib.SMTPException, OSError: If sending fails after a reconnect
+        """
+        with self._lock:
+            if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                self._disconnect()
+            
+            for attempt in (1, 2):
+                reused = self._server is not None
+                if not reused:
+                    self._server = self._connect()
+                try:
+                    self._server.send_message(msg)
+                    break
+                except (smtplib.SMTPServerDisconnected, smtplib.SMTPResponseException, OSError) as e:
+                    # 421 means the server is closing the session
+                    lost = not isinstance(e, smtplib.SMTPResponseException) or e.smtp_code == 421
+                    if lost:
+                        self._disconnect()
+                    # A reused session may have timed out on the server
+                    # side; retry once on a fresh one
+                    if not (lost and reused and attempt == 1):
+                        raise
+                    self.logger.debug(f"SMTP session lost ({e}), reconnecting")
+            
+            self._last_used = time.monotonic()
+            self.sent += 1
+            self._schedule_idle_close()
+    
+    def close(self):
+        """Close the session"""
+        with self._lock:
+            if self._idle_timer is not None:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            self._disconnect()
@@ -0,0 +1,307 @@
+"""
+Webhook delivery for NewBot notifications
+
+WebhookClient posts events over a pooled keep-alive requests.Session, so
+only the first request pays DNS, TCP and TLS setup. Optionally events
+are batched: up to `batch_size` events, or whatever arrived within
+`batch_window` seconds, go out as one JSON array per POST.
+
+Deliveries that fail transiently (connection errors, timeouts, HTTP 5xx
+and 429) are appended to an on-disk spool (one JSON array of events per
+line) and replayed in order by a background thread with exponential
+backoff, so alerts raised during an outage arrive once the endpoint is
+back, including after a restart. Batches the endpoint rejects (other
+4xx) would fail the same way on every retry and block the spool behind
+them, so they are moved to a dead-letter file, or logged and dropped.
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.logging.logger import Logger
+
+
+class RetrySpool:
+    """
+    Append-only JSON-lines file of undelivered event batches
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize spool
+        
+        Args:
+            path: Spool file (created on first append)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.logger = Logger('RetrySpool')
+    
+    def append(self, events: List[Dict]):
+        """Durably add one batch of events"""
+        line = json.dumps(events, separators=(',', ':')) + '\n'
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def read(self) -> List[List[Dict]]:
+        """All spooled batches, oldest first (unreadable lines are skipped)"""
+        with self._lock:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    lines = f.readlines()
+            except FileNotFoundError:
+                return []
+        
+        batches = []
+        for line in lines:
+            try:
+                batches.append(json.loads(line))
+            except ValueError:
+                # A crash mid-append leaves a partial last line
+                self.logger.warning(f"Skipping unreadable spool entry in {self.path}")
+                batches.append(None)
+        return batches
+    
+    def discard(self, count: int):
+        """
+        Drop the first `count` lines after they were delivered
+        
+        Lines appended since read() are kept.
+        """
+        if count <= 0:
+            return
+        with self._lock:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    remaining = f.readlines()[count:]
+            except FileNotFoundError:
+                return
+            if not remaining:
+                os.remove(self.path)
+                return
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(remaining)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+    
+    def __len__(self) -> int:
+        """Number of spooled batches"""
+        with self._lock:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    return sum(1 for _ in f)
+            except FileNotFoundError:
+                return 0
+
+
+class WebhookClient:
+    """
+    Keep-alive webhook poster with batching and a retry spool
+    """
+    
+    def __init__(self, url: str, timeout: float = 10.0, batch_size: int = 1,
+                 batch_window: float = 2.0, spool_path: Optional[str] = None,
+                 retry_base_delay: float = 5.0, retry_max_delay: float = 300.0,
+                 pool_size: int = 4, dead_letter_path: Optional[str] = None):
+        """
+        Initialize client
+        
+        Args:
+            url: Webhook URL
+            timeout: Request timeout in seconds
+            batch_size: Events per POST (1 posts each event as an object,
+                more posts JSON arrays)
+            batch_window: Longest time an event waits for its batch to fill
+            spool_path: Spool file for failed deliveries (None: log and drop)
+            retry_base_delay: First replay delay in seconds (doubles per failure)
+            retry_max_delay: Cap of the replay delay
+            pool_size: Kept-alive connections (match the webhook workers)
+            dead_letter_path: File for batches the endpoint rejected
+                (None: log and drop)
+        """
+        self.url = url
+        self.timeout = timeout
+        self.batch_size = max(1, int(batch_size))
+        self.batch_window = batch_window
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.logger = Logger('WebhookClient')
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        self._batch: List[Dict] = []
+        self._batch_timer: Optional[threading.Timer] = None
+        self._batch_lock = threading.Lock()
+        
+        self.spool = RetrySpool(spool_path) if spool_path else None
+        self.dead_letter = RetrySpool(dead_letter_path) if dead_letter_path else None
+        self._stopping = threading.Event()
+        self._replay_thread: Optional[threading.Thread] = None
+        self._replay_lock = threading.Lock()
+        if self.spool is not None and len(self.spool):
+            # Left over from a previous run
+            self._start_replay()
+    
+    def send(self, event: Dict):
+        """
+        Deliver an event now, or add it to the current batch
+        
+        Args:
+            event: JSON-serialisable event
+        """
+        if self.batch_size == 1:
+            self._deliver([event])
+            return
+        
+        with self._batch_lock:
+            self._batch.append(event)
+            if len(self._batch) >= self.batch_size:
+                events = self._take_batch()
+            else:
+                events = None
+                if self._batch_timer is None:
+                    self._batch_timer = threading.Timer(self.batch_window, self.flush)
+                    self._batch_timer.daemon = True
+                    self._batch_timer.start()
+        if events:
+            self._deliver(events)
+    
+    def _take_batch(self) -> List[Dict]:
+        """Take the pending batch (caller holds _batch_lock)"""
+        events, self._batch = self._batch, []
+        if self._batch_timer is not None:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        return events
+    
+    def flush(self):
+        """Deliver the pending batch now"""
+        with self._batch_lock:
+            events = self._take_batch()
+        if events:
+            self._deliver(events)
+    
+    def _post(self, events: List[Dict]):
+        """POST events (a single object when batching is off)"""
+        payload = events[0] if self.batch_size == 1 and len(events) == 1 else events
+        response = self.session.post(self.url, json=payload, timeout=self.timeout)
+        response.raise_for_status()
+    
+    @staticmethod
+    def is_transient(error: Exception) -> bool:
+        """
+        Whether a failed delivery may succeed if sent again
+        
+        Args:
+            error: Exception raised by _post()
+            
+        Returns:
+            True for connection errors, timeouts, HTTP 5xx and 429
+        """
+        if isinstance(error, requests.HTTPError):
+            status = error.response.status_code if error.response is not None else 0
+            return status >= 500 or status == 429
+        return isinstance(error, (requests.ConnectionError, requests.Timeout))
+    
+    def _reject(self, events: List[Dict], error: Exception):
+        """Set aside a batch the endpoint will never accept"""
+        if self.dead_letter is None:
+            self.logger.error(f"Webhook rejected {len(events)} event(s), dropping them: {error}")
+            return
+        self.dead_letter.append(events)
+        self.logger.error(f"Webhook rejected {len(events)} event(s), moved them to "
+                          f"{self.dead_letter.path}: {error}")
+    
+    def _deliver(self, events: List[Dict]):
+        """Post events, spooling them if the endpoint is unavailable"""
+        try:
+            self._post(events)
+            self.logger.info(f"Webhook notification sent ({len(events)} event(s))")
+        except Exception as e:
+            if not self.is_transient(e):
+                self._reject(events, e)
+                return
+            if self.spool is None:
+                self.logger.error(f"Failed to send webhook: {e}")
+                return
+            self.spool.append(events)
+            self.logger.error(f"Failed to send webhook, spooled {len(events)} event(s) for retry: {e}")
+            self._start_replay()
+    
+    def _start_replay(self):
+        """Make sure the replay thread is running and awake"""
+        with self._replay_lock:
+            if self._replay_thread is None:
+                self._replay_thread = threading.Thread(
+                    target=self._replay_loop, name='webhook-replay', daemon=True
+                )
+                self._replay_thread.start()
+    
+    def replay(self) -> bool:
+        """
+        Post spooled batches in order until one fails transiently
+        
+        Batches the endpoint rejects are set aside so they cannot block
+        the ones behind them.
+        
+        Returns:
+            True if the spool is empty afterwards
+        """
+        batches = self.spool.read()
+        done = 0
+        try:
+            for events in batches:
+                if events:
+                    try:
+                        self._post(events)
+                    except Exception as e:
+                        if self.is_transient(e):
+                            raise
+                        self._reject(events, e)
+                done += 1
+        except Exception as e:
+            self.logger.warning(f"Webhook replay failed after {done} batch(es): {e}")
+        finally:
+            self.spool.discard(done)
+        if done:
+            self.logger.info(f"Replayed {done} spooled webhook batch(es)")
+        return done == len(batches)
+    
+    def _replay_loop(self):
+        """Replay the spool with exponential backoff until it is empty"""
+        delay = self.retry_base_delay
+        while not self._stopping.wait(delay):
+            if self.replay():
+                delay = self.retry_base_delay
+            else:
+                delay = min(self.retry_max_delay, delay * 2)
+            with self._replay_lock:
+                # Checked under the lock so a batch spooled right now
+                # either is seen here or starts a new thread
+                if not len(self.spool):
+                    self._replay_thread = None
+                    return
+    
+    def close(self):
+        """Deliver the pending batch and stop replaying (the spool is kept)"""
+        self.flush()
+        self._stopping.set()
+        if self._replay_thread is not None:
+            self._replay_thread.join(timeout=1.0)
+        self.session.close()
@@ -9,8 +9,11 @@ Buy when fast MA crosses above slow MA
 Sell when fast MA crosses below slow MA
 """
 
+import numpy as np
 import pandas as pd
-from modules.strategies.strategy_factory import BaseStrategy
+from modules.strategies.strategy_factory import BaseStrategy, BUY, SELL, HOLD
+from modules.data.market_data import MarketData
+from modules.indicators.moving_averages import calculate_sma
 
 
 class MovingAverageCrossover(BaseStrategy):
@@ -34,7 +37,16 @@ class MovingAverageCrossover(BaseStrategy):
         
         self.logger.info(f"MA Crossover initialized (fast={self.fast_period}, slow={self.slow_period})")
     
-    def generate_signal(self, market_data: dict) -> str:
+    def validate_parameters(self) -> bool:
+        """
+        Validate strategy parameters
+        
+        Returns:
+            True if the fast period is positive and shorter than the slow period
+        """
+        return 0 < self.fast_period < self.slow_period
+    
+    def generate_signal(self, market_data: MarketData) -> str:
         """
         Generate trading signal based on MA crossover
         
@@ -45,51 +57,85 @@ class MovingAverageCrossover(BaseStrategy):
             Signal: 'BUY', 'SELL', or 'HOLD'
         """
         try:
-            ohlcv_data = market_data.get('data', [])
-            
-            if len(ohlcv_data) < self.slow_period:
+            market_data = MarketData.coerce(market_data)
+            if len(market_data) < self.slow_period:
                 self.logger.warning("Insufficient data for MA calculation")
                 return 'HOLD'
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            close = market_data.close
             
             # Calculate moving averages
-            df['fast_ma'] = df['close'].rolling(window=self.fast_period).mean()
-            df['slow_ma'] = df['close'].rolling(window=self.slow_period).mean()
+            fast_ma = self.cached_indicator(market_data, 'sma', (self.fast_period,),
+                                            lambda: calculate_sma(close, self.fast_period))
+            slow_ma = self.cached_indicator(market_data, 'sma', (self.slow_period,),
+                                            lambda: calculate_sma(close, self.slow_period))
             
-            # Get last two rows for crossover detection
-            current = df.iloc[-1]
-            previous = df.iloc[-2]
+            # Get last two values for crossover detection
+            current_fast, current_slow = fast_ma[-1], slow_ma[-1]
+            previous_fast, previous_slow = fast_ma[-2], slow_ma[-2]
             
             # Check for crossover
-            if pd.isna(current['fast_ma']) or pd.isna(current['slow_ma']):
+            if pd.isna(current_fast) or pd.isna(current_slow):
                 return 'HOLD'
             
             # Bullish crossover (buy signal)
-            if (previous['fast_ma'] <= previous['slow_ma'] and 
-                current['fast_ma'] > current['slow_ma']):
+            if (previous_fast <= previous_slow and 
+                current_fast > current_slow):
                 
                 # Check if crossover is significant
-                diff = (current['fast_ma'] - current['slow_ma']) / current['slow_ma']
+                diff = (current_fast - current_slow) / current_slow
                 if diff >= self.signal_threshold:
                     self.logger.info("Bullish crossover detected - BUY signal")
                     self.last_signal = 'BUY'
                     return 'BUY'
             
             # Bearish crossover (sell signal)
-            elif (previous['fast_ma'] >= previous['slow_ma'] and 
-                  current['fast_ma'] < current['slow_ma']):
+            elif (previous_fast >= previous_slow and 
+                  current_fast < current_slow):
                 
                 # Check if crossover is significant
-                diff = abs(current['fast_ma'] - current['slow_ma']) / current['slow_ma']
+                diff = abs(current_fast - current_slow) / current_slow
                 if diff >= self.signal_threshold:
                     self.logger.info("Bearish crossover detected - SELL signal")
                     self.last_signal = 'SELL'
                     return 'SELL'
             
             return 'HOLD'
-            
+        
         except Exception as e:
             self.logger.error(f"Signal generation failed: {e}")
             return 'HOLD'
+    
+    def generate_signals(self, market_data: MarketData) -> np.ndarray:
+        """
+        Generate MA crossover signals for every bar
+        
+        Args:
+            market_data: Market data with OHLCV
+            
+        Returns:
+            int8 array of BUY/SELL/HOLD codes
+        """
+        market_data = MarketData.coerce(market_data)
+        close = market_data.close
+        fast_ma = self.cached_indicator(market_data, 'sma', (self.fast_period,),
+                                        lambda: calculate_sma(close, self.fast_period))
+        slow_ma = self.cached_indicator(market_data, 'sma', (self.slow_period,),
+                                        lambda: calculate_sma(close, self.slow_period))
+        
+        signals = np.full(len(close), HOLD, dtype=np.int8)
+        if len(close) < 2:
+            return signals
+        
+        # Comparisons against NaN are False, so warm-up bars stay HOLD
+        current_fast, current_slow = fast_ma[1:], slow_ma[1:]
+        previous_fast, previous_slow = fast_ma[:-1], slow_ma[:-1]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            diff = np.abs(current_fast - current_slow) / current_slow
+        significant = diff >= self.signal_threshold
+        
+        bullish = (previous_fast <= previous_slow) & (current_fast > current_slow) & significant
+        bearish = (previous_fast >= previous_slow) & (current_fast < current_slow) & significant
+        signals[1:][bullish] = BUY
+        signals[1:][bearish] = SELL
+        return signals
@@ -6,8 +6,10 @@ Trading strategy based on RSI indicator:
 - Overbought condition (RSI > 70): Sell signal
 """
 
+import numpy as np
 import pandas as pd
-from modules.strategies.strategy_factory import BaseStrategy
+from modules.strategies.strategy_factory import BaseStrategy, BUY, SELL, HOLD
+from modules.data.market_data import MarketData
 from modules.indicators.rsi import calculate_rsi
 
 
@@ -30,7 +32,16 @@ class RSIStrategy(BaseStrategy):
         
         self.logger.info(f"RSI Strategy initialized (period={self.period}, oversold={self.oversold}, overbought={self.overbought})")
     
-    def generate_signal(self, market_data: dict) -> str:
+    def validate_parameters(self) -> bool:
+        """
+        Validate strategy parameters
+        
+        Returns:
+            True if the period is positive and oversold < overbought within 0-100
+        """
+        return self.period > 0 and 0 <= self.oversold < self.overbought <= 100
+    
+    def generate_signal(self, market_data: MarketData) -> str:
         """
         Generate trading signal based on RSI
         
@@ -41,20 +52,18 @@ class RSIStrategy(BaseStrategy):
             Signal: 'BUY', 'SELL', or 'HOLD'
         """
         try:
-            ohlcv_data = market_data.get('data', [])
-            
-            if len(ohlcv_data) < self.period + 1:
+            market_data = MarketData.coerce(market_data)
+            if len(market_data) < self.period + 1:
                 self.logger.warning("Insufficient data for RSI calculation")
                 return 'HOLD'
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            
             # Calculate RSI
-            df['rsi'] = calculate_rsi(df['close'], self.period)
+            close = market_data.close
+            rsi = self.cached_indicator(market_data, 'rsi', (self.period,),
+                                        lambda: calculate_rsi(close, self.period))
             
             # Get current RSI
-            current_rsi = df['rsi'].iloc[-1]
+            current_rsi = rsi[-1]
             
             if pd.isna(current_rsi):
                 return 'HOLD'
@@ -69,7 +78,29 @@ class RSIStrategy(BaseStrategy):
                 return 'SELL'
             
             return 'HOLD'
-            
+        
         except Exception as e:
             self.logger.error(f"Signal generation failed: {e}")
             return 'HOLD'
+    
+    def generate_signals(self, market_data: MarketData) -> np.ndarray:
+        """
+        Generate RSI signals for every bar
+        
+        Args:
+            market_data: Market data with OHLCV
+            
+        Returns:
+            int8 array of BUY/SELL/HOLD codes
+        """
+        market_data = MarketData.coerce(market_data)
+        close = market_data.close
+        rsi = self.cached_indicator(market_data, 'rsi', (self.period,),
+                                    lambda: calculate_rsi(close, self.period))
+        
+        signals = np.full(len(close), HOLD, dtype=np.int8)
+        signals[rsi < self.oversold] = BUY
+        signals[rsi > self.overbought] = SELL
+        # generate_signal() needs period + 1 bars before it answers
+        signals[:self.period] = HOLD
+        return signals
@@ -4,7 +4,19 @@ Strategy Factory for NewBot
 Creates trading strategy instances based on configuration
 """
 
+from typing import Any, Callable
+
+import numpy as np
+
 from utils.logging.logger import Logger
+from modules.indicators.cache import indicator_cache
+from modules.data.market_data import MarketData
+
+
+# Per-bar signal codes used by generate_signals()
+BUY = 1
+SELL = -1
+HOLD = 0
 
 
 class StrategyFactory:
@@ -57,7 +69,7 @@ class BaseStrategy:
         self.parameters = parameters
         self.logger = Logger(self.__class__.__name__)
     
-    def generate_signal(self, market_data: dict) -> str:
+    def generate_signal(self, market_data: MarketData) -> str:
         """
         Generate trading signal based on market data
         
@@ -69,6 +81,41 @@ class BaseStrategy:
         """
         raise NotImplementedError("Subclass must implement generate_signal()")
     
+    def generate_signals(self, market_data: MarketData) -> np.ndarray:
+        """
+        Generate trading signals for every bar at once
+        
+        Element t equals what generate_signal() returns when given the
+        candles up to and including bar t, encoded as BUY, SELL or HOLD.
+        
+        Args:
+            market_data: Market data (OHLCV)
+            
+        Returns:
+            int8 array of signal codes, one per bar
+        """
+        raise NotImplementedError("Subclass must implement generate_signals()")
+    
+    def cached_indicator(self, market_data: MarketData, name: str, params: tuple,
+                         compute: Callable[[], Any]) -> Any:
+        """
+        Compute an indicator through the shared indicator cache
+        
+        Strategies (and loop iterations) asking for the same indicator on
+        the same candles reuse one result.
+        
+        Args:
+            market_data: Market data the indicator is computed from
+            name: Indicator name (e.g. 'sma')
+            params: Indicator parameters
+            compute: Function computing the indicator on a cache miss
+            
+        Returns:
+            Indicator result (arrays are read-only)
+        """
+        key = indicator_cache.make_key(market_data, name, params)
+        return indicator_cache.get_or_compute(key, compute)
+    
     def validate_parameters(self) -> bool:
         """
         Validate strategy parameters
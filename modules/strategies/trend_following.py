@@ -4,8 +4,11 @@ Trend Following Strategy
 Identifies and follows market trends using multiple indicators
 """
 
+import numpy as np
 import pandas as pd
-from modules.strategies.strategy_factory import BaseStrategy
+from modules.strategies.strategy_factory import BaseStrategy, BUY, SELL, HOLD
+from modules.data.market_data import MarketData
+from modules.indicators.moving_averages import calculate_ema
 
 
 class TrendFollowing(BaseStrategy):
@@ -26,7 +29,16 @@ class TrendFollowing(BaseStrategy):
         
         self.logger.info(f"Trend Following initialized (ema_period={self.ema_period})")
     
-    def generate_signal(self, market_data: dict) -> str:
+    def validate_parameters(self) -> bool:
+        """
+        Validate strategy parameters
+        
+        Returns:
+            True if the EMA period is positive and the threshold non-negative
+        """
+        return self.ema_period > 0 and self.trend_threshold >= 0
+    
+    def generate_signal(self, market_data: MarketData) -> str:
         """
         Generate trading signal based on trend
         
@@ -37,20 +49,18 @@ class TrendFollowing(BaseStrategy):
             Signal: 'BUY', 'SELL', or 'HOLD'
         """
         try:
-            ohlcv_data = market_data.get('data', [])
-            
-            if len(ohlcv_data) < self.ema_period:
+            market_data = MarketData.coerce(market_data)
+            if len(market_data) < self.ema_period:
                 return 'HOLD'
             
-            # Convert to DataFrame
-            df = pd.DataFrame(ohlcv_data, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            
             # Calculate EMA
-            df['ema'] = df['close'].ewm(span=self.ema_period, adjust=False).mean()
+            close = market_data.close
+            ema = self.cached_indicator(market_data, 'ema', (self.ema_period,),
+                                        lambda: calculate_ema(close, self.ema_period))
             
             # Get current values
-            current_price = df['close'].iloc[-1]
-            current_ema = df['ema'].iloc[-1]
+            current_price = close[-1]
+            current_ema = ema[-1]
             
             if pd.isna(current_ema):
                 return 'HOLD'
@@ -69,7 +79,30 @@ class TrendFollowing(BaseStrategy):
                 return 'SELL'
             
             return 'HOLD'
-            
+        
         except Exception as e:
             self.logger.error(f"Signal generation failed: {e}")
             return 'HOLD'
+    
+    def generate_signals(self, market_data: MarketData) -> np.ndarray:
+        """
+        Generate trend signals for every bar
+        
+        Args:
+            market_data: Market data with OHLCV
+            
+        Returns:
+            int8 array of BUY/SELL/HOLD codes
+        """
+        market_data = MarketData.coerce(market_data)
+        close = market_data.close
+        ema = self.cached_indicator(market_data, 'ema', (self.ema_period,),
+                                    lambda: calculate_ema(close, self.ema_period))
+        
+        price_diff = (close - ema) / ema
+        signals = np.full(len(close), HOLD, dtype=np.int8)
+        signals[price_diff > self.trend_threshold] = BUY
+        signals[price_diff < -self.trend_threshold] = SELL
+        # generate_signal() needs ema_period bars before it answers
+        signals[:self.ema_period - 1] = HOLD
+        return signals
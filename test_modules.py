@@ -6,12 +6,18 @@ This script runs basic tests on the core modules to ensure
 everything is working correctly.
 """
 
+import os
 import sys
+import tempfile
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Logs, backups and the encryption key written below go to a scratch
+# directory instead of the repository
+os.chdir(tempfile.mkdtemp(prefix='newbot-test-'))
+
 print("=" * 60)
 print("NewBot Module Tests")
 print("=" * 60)
@@ -0,0 +1,31 @@
+"""
+Shared pytest setup
+
+Makes the repository root importable and isolates tests from each other's
+configuration changes and from the repository's runtime files.
+"""
+
+import copy
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import config  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def restore_config():
+    """Undo config.set() calls made by a test"""
+    saved = copy.deepcopy(config.config)
+    yield config
+    config.config = saved
+
+
+@pytest.fixture(autouse=True)
+def isolate_runtime_files(tmp_path, monkeypatch):
+    """Write logs, backups, keys and data files under tmp_path, not the repository"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,103 @@
+"""Tests for per-request rate limit weight accounting"""
+
+import ccxt
+import pytest
+
+from modules.brokers import ohlcv_cache, resilience
+from modules.brokers.accounting import CALL_SECONDS, REQUEST_SECONDS, WEIGHT_TOTAL, broker_methods, meter_broker
+from modules.brokers.binance_broker import BinanceBroker
+from modules.brokers.ohlcv_cache import OHLCVCache
+from modules.brokers.rate_limit import TokenBucket
+from modules.brokers.resilience import ResilientCaller
+from utils.monitoring.metrics import MetricsRegistry
+
+PERIOD = 60_000
+
+
+class FakeExchange:
+    """ccxt stand-in serving one bar per minute up to `now`"""
+    
+    def __init__(self, now: int):
+        self.now = now
+        self.requests = 0
+        self.failures = []
+        self.last_http_response = ''
+    
+    def fetch_ticker(self, symbol):
+        self.requests += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        return {'symbol': symbol, 'last': 1.5}
+    
+    def fetch_ohlcv(self, symbol, timeframe, since=None, limit=None):
+        self.requests += 1
+        end = self.now - self.now % PERIOD + PERIOD
+        start = end - limit * PERIOD if since is None else -(-since // PERIOD) * PERIOD
+        rows = [[t, 1.0, 2.0, 0.5, 1.5, 1.0] for t in range(start, end, PERIOD)][:limit]
+        self.last_http_response = 'x' * 40 * len(rows)
+        return rows
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock for the OHLCV cache"""
+    now = {'ms': 1_700_000_000_000}
+    monkeypatch.setattr(ohlcv_cache.time, 'time', lambda: now['ms'] / 1000)
+    return now
+
+
+@pytest.fixture
+def broker(monkeypatch, clock):
+    """BinanceBroker on a fake exchange with metering and a rate limiter"""
+    monkeypatch.setattr(BinanceBroker, '_init_exchange', lambda self: None)
+    broker = BinanceBroker('key', 'secret')
+    broker.exchange = FakeExchange(clock['ms'])
+    broker.ohlcv_cache = OHLCVCache(capacity=200, page_limit=10)
+    broker.rate_limiter = TokenBucket.per_minute(4800)
+    broker.registry = MetricsRegistry()
+    return meter_broker(broker, broker.registry)
+
+
+def _totals(registry):
+    histograms, counters = registry.snapshot()
+    weight = sum(counters.get(WEIGHT_TOTAL, {}).values())
+    requests = sum(data[1] for data in histograms.get(REQUEST_SECONDS, {}).values())
+    return weight, requests
+
+
+def test_weight_is_charged_per_exchange_request(broker, clock):
+    broker.get_market_data('BTC/EUR', '1m', 10)
+    assert _totals(broker.registry) == (2, 1)
+    
+    # A refresh within the same bar sends one small request
+    broker.get_market_data('BTC/EUR', '1m', 10)
+    assert _totals(broker.registry) == (4, 2)
+    
+    # A 25 bar gap is paged in requests of 10 bars, each one charged
+    clock['ms'] += 25 * PERIOD
+    broker.exchange.now = clock['ms']
+    broker.get_market_data('BTC/EUR', '1m', 10)
+    requests = broker.exchange.requests
+    assert requests >= 5
+    assert _totals(broker.registry) == (2 * requests, requests)
+    assert broker.rate_limiter.available() == pytest.approx(4800 - 2 * requests, abs=1)
+
+
+def test_every_retry_attempt_is_charged(broker, monkeypatch):
+    monkeypatch.setattr(resilience.time, 'sleep', lambda seconds: None)
+    broker.resilience = ResilientCaller(retry_on=broker.TRANSIENT_ERRORS,
+                                        rate_limited=broker.RATE_LIMIT_ERRORS)
+    broker.exchange.failures = [ccxt.NetworkError('reset'), ccxt.NetworkError('reset')]
+    
+    assert broker.get_current_price('BTC/EUR') == 1.5
+    assert _totals(broker.registry) == (6, 3)
+
+
+def test_local_helpers_are_not_metered(broker):
+    assert not {'is_connected', 'request_weight', 'last_response_size', 'retry_after'} & set(broker_methods())
+    
+    broker.retry_after()
+    broker.get_current_price('BTC/EUR')
+    histograms, _ = broker.registry.snapshot()
+    methods = {dict(labels)['method'] for labels in histograms.get(CALL_SECONDS, {})}
+    assert methods == {'get_current_price'}
@@ -0,0 +1,119 @@
+"""Tests for batch signals and the backtester's exit rules"""
+
+import numpy as np
+import pytest
+
+from modules.backtesting.engine import Backtester
+from modules.data.market_data import MarketData
+from modules.data.market_generator import MarketGenerator
+from modules.strategies.moving_average_crossover import MovingAverageCrossover
+from modules.strategies.rsi_strategy import RSIStrategy
+from modules.strategies.strategy_factory import BUY, HOLD, SELL
+from modules.strategies.trend_following import TrendFollowing
+
+CODES = {'BUY': BUY, 'SELL': SELL, 'HOLD': HOLD}
+
+
+@pytest.mark.parametrize('strategy', [
+    MovingAverageCrossover({'fast_period': 5, 'slow_period': 20, 'signal_threshold': 0.0}),
+    RSIStrategy({'period': 14}),
+    TrendFollowing({'ema_period': 20}),
+], ids=['ma_crossover', 'rsi', 'trend_following'])
+def test_batch_signals_match_bar_by_bar_signals(strategy):
+    market_data = MarketGenerator(['BTC/EUR'], '1h', seed=21).generate(300)['BTC/EUR']
+    
+    batch = strategy.generate_signals(market_data)
+    live = [CODES[strategy.generate_signal(market_data.slice(0, stop))] for stop in range(1, len(market_data) + 1)]
+    
+    assert np.array_equal(batch, live)
+    assert {BUY, SELL} <= set(live)
+
+
+class FixedSignals:
+    """Strategy stand-in replaying a prepared signal array"""
+    
+    def __init__(self, signals):
+        self.signals = np.asarray(signals, dtype=np.int8)
+    
+    def generate_signals(self, market_data):
+        return self.signals
+
+
+def _bars(open_, high, low, close) -> MarketData:
+    timestamps = 1_700_000_000_000 + np.arange(len(close)) * 3_600_000
+    return MarketData('BTC/EUR', '1h', timestamps,
+                      np.vstack([open_, high, low, close, np.ones(len(close))]).astype(float))
+
+
+def _flat(count: int, price: float = 100.0):
+    return [np.full(count, price) for _ in range(4)]
+
+
+def _exit(bars: MarketData, signals, **risk):
+    options = dict(amount=1.0, stop_loss_percent=2.0, take_profit_percent=5.0, use_trailing_stop=False)
+    options.update(risk)
+    trades = Backtester(FixedSignals(signals), **options).run(bars).trades
+    assert len(trades) == 1
+    return trades[0]['exit_index'], trades[0]['exit_price'], trades[0]['exit_reason']
+
+
+def _buy_first(count: int):
+    signals = np.zeros(count, dtype=np.int8)
+    signals[0] = BUY
+    return signals
+
+
+def test_stop_loss_fills_at_the_stop_or_a_lower_open():
+    open_, high, low, close = _flat(10)
+    low[3] = 97.0
+    assert _exit(_bars(open_, high, low, close), _buy_first(10)) == (3, pytest.approx(98.0), 'stop_loss')
+    
+    # Gapping through the stop fills at the open
+    open_[3] = low[3] = 96.0
+    assert _exit(_bars(open_, high, low, close), _buy_first(10)) == (3, pytest.approx(96.0), 'stop_loss')
+
+
+def test_take_profit_fills_at_the_target_or_a_higher_open():
+    open_, high, low, close = _flat(10)
+    high[4] = 106.0
+    assert _exit(_bars(open_, high, low, close), _buy_first(10)) == (4, pytest.approx(105.0), 'take_profit')
+    
+    open_[4] = 107.0
+    assert _exit(_bars(open_, high, low, close), _buy_first(10)) == (4, pytest.approx(107.0), 'take_profit')
+
+
+def test_stop_is_assumed_to_trigger_before_the_target_within_a_bar():
+    open_, high, low, close = _flat(10)
+    high[2], low[2] = 106.0, 97.0
+    assert _exit(_bars(open_, high, low, close), _buy_first(10))[2] == 'stop_loss'
+
+
+def test_sell_signal_and_end_of_data_close_at_the_close():
+    open_, high, low, close = _flat(10)
+    close[5] = 101.0
+    signals = _buy_first(10)
+    signals[5] = SELL
+    assert _exit(_bars(open_, high, low, close), signals) == (5, 101.0, 'signal')
+    assert _exit(_bars(*_flat(10)), _buy_first(10)) == (9, 100.0, 'end')
+
+
+def test_trailing_stop_follows_closes_across_search_windows():
+    # A slow rally longer than the first exit search window, then a drop
+    count = 200
+    close = np.concatenate([np.linspace(100, 104, 150), np.full(50, 104.0)])
+    open_, high, low = close.copy(), close.copy(), close.copy()
+    low[170] = 101.0
+    
+    exit_index, exit_price, reason = _exit(_bars(open_, high, low, close), _buy_first(count),
+                                           use_trailing_stop=True, trailing_stop_percent=1.5)
+    
+    assert (exit_index, reason) == (170, 'trailing_stop')
+    assert exit_price == pytest.approx(104.0 * 0.985)
+
+
+def test_trailing_stop_never_drops_below_the_initial_stop():
+    open_, high, low, close = _flat(10)
+    low[3] = 97.5
+    # A 3% trail from the entry would sit below the 2% stop loss
+    assert _exit(_bars(open_, high, low, close), _buy_first(10), use_trailing_stop=True,
+                 trailing_stop_percent=3.0) == (3, pytest.approx(98.0), 'stop_loss')
@@ -0,0 +1,52 @@
+"""Tests for the benchmark suite's baseline comparison"""
+
+import json
+import logging
+
+import pytest
+
+from benchmarks import suite
+
+
+def test_compare_flags_only_slowdowns_beyond_threshold_and_min_delta():
+    baseline = {'slower': 100.0, 'within': 100.0, 'tiny': 0.2, 'faster': 50.0}
+    results = {'slower': 130.0, 'within': 124.0, 'tiny': 0.6, 'faster': 10.0, 'new': 5.0}
+    
+    assert suite.compare(results, baseline, threshold=0.25, min_delta_us=0.5) == [('slower', 100.0, 130.0)]
+
+
+def test_min_delta_suppresses_relative_noise_on_fast_calls():
+    baseline, results = {'fast': 1.0}, {'fast': 2.0}
+    
+    assert suite.compare(results, baseline, threshold=0.25, min_delta_us=1.0) == []
+    assert suite.compare(results, baseline, threshold=0.25, min_delta_us=0.5) == [('fast', 1.0, 2.0)]
+
+
+def test_results_round_trip_through_the_baseline_file(tmp_path):
+    path = tmp_path / 'baseline.json'
+    assert suite.load_baseline(path) is None
+    
+    suite.write_results(path, {'sma': 12.5})
+    
+    assert suite.load_baseline(path) == {'sma': 12.5}
+    assert 'python' in json.loads(path.read_text())['metadata']
+
+
+@pytest.fixture
+def logger_levels():
+    """Restore the logger levels main() turns down"""
+    loggers = [logger for logger in logging.root.manager.loggerDict.values() if isinstance(logger, logging.Logger)]
+    levels = [logger.level for logger in loggers]
+    yield
+    for logger, level in zip(loggers, levels):
+        logger.setLevel(level)
+
+
+@pytest.mark.parametrize('current, exit_code', [(10.0, 0), (20.0, 1)])
+def test_main_fails_on_regression(tmp_path, monkeypatch, logger_levels, current, exit_code):
+    path = tmp_path / 'baseline.json'
+    suite.write_results(path, {'sma': 10.0})
+    monkeypatch.setattr(suite, 'collect', lambda quick: [])
+    monkeypatch.setattr(suite, 'run', lambda cases, repeat: {'sma': current})
+    
+    assert suite.main(['--baseline', str(path)]) == exit_code
@@ -0,0 +1,65 @@
+"""Tests for the Binance broker's async client lifecycle"""
+
+import asyncio
+
+import pytest
+
+from modules.brokers import binance_broker
+from modules.brokers.binance_broker import BinanceBroker
+
+
+class FakeAsyncExchange:
+    """ccxt.async_support stand-in counting clients and closes"""
+    
+    created = []
+    
+    def __init__(self, config):
+        self.closed = False
+        FakeAsyncExchange.created.append(self)
+    
+    def set_sandbox_mode(self, enabled):
+        pass
+    
+    async def load_markets(self):
+        await asyncio.sleep(0.01)
+        return {}
+    
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    """BinanceBroker without network access and with a fake async client"""
+    FakeAsyncExchange.created = []
+    monkeypatch.setattr(BinanceBroker, '_init_exchange', lambda self: None)
+    monkeypatch.setattr(binance_broker.ccxt_async, 'binance', FakeAsyncExchange)
+    return BinanceBroker('key', 'secret')
+
+
+def test_concurrent_first_use_builds_one_client(broker):
+    async def scenario():
+        clients = await asyncio.gather(*(broker._get_async_exchange() for _ in range(5)))
+        assert all(client is clients[0] for client in clients)
+        await broker.close_async()
+    
+    asyncio.run(scenario())
+    assert len(FakeAsyncExchange.created) == 1
+    assert FakeAsyncExchange.created[0].closed
+
+
+def test_reconnect_closes_the_replaced_client(broker):
+    async def first_loop():
+        return await broker._get_async_exchange()
+    
+    async def second_loop():
+        client = await broker._get_async_exchange()
+        await broker.close_async()
+        return client
+    
+    old = asyncio.run(first_loop())
+    broker.reconnect()
+    new = asyncio.run(second_loop())
+    
+    assert new is not old
+    assert old.closed and new.closed
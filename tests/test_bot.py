@@ -0,0 +1,96 @@
+"""Tests for the asyncio trading loop's phase handling"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+import bot
+from config import config
+
+
+@pytest.fixture
+def trading_bot(monkeypatch, tmp_path):
+    """NewBot on the mock broker, without credentials, backups or signal handlers"""
+    monkeypatch.setattr(bot, 'CredentialManager', lambda: None)
+    monkeypatch.setattr(bot.signal, 'signal', lambda *args: None)
+    config.set('broker.name', 'mock')
+    config.set('broker.mock_order_archive', None)
+    config.set('backup.enabled', False)
+    config.set('monitoring.metrics_enabled', False)
+    config.set('notifications.enabled', False)
+    return bot.NewBot()
+
+
+def test_phase_with_running_threads_is_not_restarted(trading_bot):
+    config.set('monitoring.phase_timeout_seconds', 0.05)
+    release = threading.Event()
+    runs = []
+    
+    async def phase():
+        runs.append(1)
+        await trading_bot._to_thread(release.wait, 5)
+    
+    async def scenario():
+        await trading_bot._run_phase('evaluate_signals', phase())
+        # Timed out, but its worker thread cannot be cancelled
+        assert trading_bot._phase_threads['evaluate_signals'] == 1
+        await trading_bot._run_phase('evaluate_signals', phase())
+        assert len(runs) == 1
+        
+        release.set()
+        while trading_bot._phase_threads['evaluate_signals']:
+            await asyncio.sleep(0.01)
+        await trading_bot._run_phase('evaluate_signals', phase())
+        assert len(runs) == 2
+    
+    asyncio.run(scenario())
+
+
+def test_order_work_for_one_symbol_is_serialized(trading_bot, monkeypatch):
+    config.set('risk_management.use_trailing_stop', True)
+    active, overlaps = [0], []
+    place_order = trading_bot.broker.place_order
+    
+    def slow_place_order(*args, **kwargs):
+        active[0] += 1
+        overlaps.append(active[0])
+        time.sleep(0.05)
+        active[0] -= 1
+        return place_order(*args, **kwargs)
+    
+    monkeypatch.setattr(trading_bot.broker, 'place_order', slow_place_order)
+    symbol = 'BTC/EUR'
+    trading_bot.positions[symbol] = {'symbol': symbol, 'amount': 0.01, 'stop_loss': 0}
+    
+    async def scenario():
+        await asyncio.gather(
+            trading_bot._to_thread(trading_bot._adjust_risk_levels, trading_bot.positions[symbol]),
+            trading_bot._to_thread(trading_bot._execute_sell, symbol),
+        )
+    
+    asyncio.run(scenario())
+    assert overlaps and max(overlaps) == 1
+
+
+def test_snapshot_without_bulk_tickers_covers_only_held_symbols(trading_bot, monkeypatch):
+    config.set('trading.symbols', ['BTC/EUR', 'ETH/EUR', 'SOL/EUR', 'ADA/EUR'])
+    requested = []
+    monkeypatch.setattr(trading_bot.broker, 'get_current_price',
+                        lambda symbol: requested.append(symbol) or 1.0)
+    
+    trading_bot._refresh_price_snapshot()
+    assert requested == []
+    
+    trading_bot.positions['ETH/EUR'] = {'symbol': 'ETH/EUR', 'amount': 1.0}
+    trading_bot.open_orders = [{'id': '1', 'symbol': 'SOL/EUR'}]
+    trading_bot._refresh_price_snapshot()
+    assert sorted(requested) == ['ETH/EUR', 'SOL/EUR']
+
+
+def test_snapshot_with_bulk_tickers_covers_watchlist(trading_bot, monkeypatch):
+    config.set('trading.symbols', ['BTC/EUR', 'ETH/EUR'])
+    monkeypatch.setattr(type(trading_bot.broker), 'BULK_TICKERS', True)
+    
+    assert trading_bot._snapshot_symbols() == ['BTC/EUR', 'ETH/EUR']
@@ -0,0 +1,80 @@
+"""Tests for the shared indicator result cache"""
+
+import numpy as np
+import pytest
+
+from modules.data.market_data import MarketData
+from modules.indicators.cache import IndicatorCache
+
+
+def _data(closes, symbol: str = 'BTC/EUR') -> MarketData:
+    closes = np.asarray(closes, dtype=float)
+    timestamps = 1_700_000_000_000 + np.arange(len(closes)) * 60_000
+    return MarketData(symbol, '1m', timestamps, np.vstack([closes, closes, closes, closes, np.ones_like(closes)]))
+
+
+class Compute:
+    """Counts how often the indicator is actually computed"""
+    
+    def __init__(self, size: int = 10):
+        self.size = size
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        return np.zeros(self.size)
+
+
+def test_same_candles_hit_and_new_bar_misses():
+    cache = IndicatorCache()
+    compute = Compute()
+    key = cache.make_key(_data([1.0, 2.0, 3.0]), 'sma', (2,))
+    
+    first = cache.get_or_compute(key, compute)
+    assert cache.get_or_compute(cache.make_key(_data([1.0, 2.0, 3.0]), 'sma', (2,)), compute) is first
+    # Revised forming bar, a new bar, other params and another symbol all miss
+    cache.get_or_compute(cache.make_key(_data([1.0, 2.0, 3.5]), 'sma', (2,)), compute)
+    cache.get_or_compute(cache.make_key(_data([1.0, 2.0, 3.0, 4.0]), 'sma', (2,)), compute)
+    cache.get_or_compute(cache.make_key(_data([1.0, 2.0, 3.0]), 'sma', (3,)), compute)
+    cache.get_or_compute(cache.make_key(_data([1.0, 2.0, 3.0], 'ETH/EUR'), 'sma', (2,)), compute)
+    
+    assert compute.calls == 5
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 5, 5)
+    assert stats['hit_rate'] == pytest.approx(1 / 6)
+
+
+def test_cached_arrays_are_read_only():
+    cache = IndicatorCache()
+    value = cache.get_or_compute(cache.make_key(_data([1.0, 2.0]), 'ema', (2,)), Compute())
+    with pytest.raises(ValueError):
+        value[0] = 1.0
+
+
+def test_least_recently_used_entry_is_evicted():
+    # Room for two 80 byte results
+    cache = IndicatorCache(max_bytes=160)
+    keys = [cache.make_key(_data([1.0, float(close)]), 'sma', (2,)) for close in range(3)]
+    compute = Compute()
+    
+    cache.get_or_compute(keys[0], compute)
+    cache.get_or_compute(keys[1], compute)
+    cache.get_or_compute(keys[0], compute)  # keys[1] is now the oldest
+    cache.get_or_compute(keys[2], compute)
+    
+    assert list(cache.entries) == [keys[0], keys[2]]
+    assert cache.stats()['evictions'] == 1 and cache.bytes == 160
+    cache.get_or_compute(keys[1], compute)
+    assert compute.calls == 4
+
+
+def test_unidentifiable_payload_and_oversized_result_bypass_the_cache():
+    cache = IndicatorCache(max_bytes=40)
+    compute = Compute()
+    
+    assert cache.make_key(_data([1.0], symbol=None), 'sma', (2,)) is None
+    cache.get_or_compute(None, compute)
+    cache.get_or_compute(None, compute)
+    cache.get_or_compute(cache.make_key(_data([1.0]), 'sma', (2,)), compute)
+    
+    assert compute.calls == 3 and cache.stats()['entries'] == 0
@@ -0,0 +1,85 @@
+"""Tests for the NumPy indicator kernels against the pandas implementations"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.indicators import kernels
+from modules.indicators.bollinger_bands import calculate_bollinger_bands
+from modules.indicators.moving_averages import calculate_ema, calculate_macd, calculate_sma
+from modules.indicators.rsi import calculate_rsi
+
+# Short inputs take the loop paths, long ones the blocked EMA and chunked std
+LENGTHS = [50, 3000]
+
+
+def _prices(count: int) -> np.ndarray:
+    rng = np.random.default_rng(count)
+    return 20_000 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+
+
+def _close(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected, dtype=float), rtol=1e-8, atol=1e-8, equal_nan=True)
+
+
+@pytest.mark.parametrize('count', LENGTHS)
+def test_single_output_kernels_match_pandas(count):
+    values = _prices(count)
+    series = pd.Series(values)
+    
+    _close(kernels.sma_kernel(values, 20), calculate_sma(series, 20))
+    _close(kernels.ema_kernel(values, 20), calculate_ema(series, 20))
+    _close(kernels.rsi_kernel(values, 14), calculate_rsi(series, 14))
+    _close(kernels.rolling_std_kernel(values, 20), series.rolling(20).std())
+
+
+@pytest.mark.parametrize('count', LENGTHS)
+def test_band_kernels_match_pandas(count):
+    values = _prices(count)
+    series = pd.Series(values)
+    
+    for actual, expected in zip(kernels.bollinger_kernel(values, 20, 2.0), calculate_bollinger_bands(series, 20, 2.0)):
+        _close(actual, expected)
+    for actual, expected in zip(kernels.macd_kernel(values, 12, 26, 9), calculate_macd(series, 12, 26, 9)):
+        _close(actual, expected)
+
+
+def test_calculate_functions_dispatch_arrays_to_kernels():
+    values = _prices(100)
+    result = calculate_sma(values, 10)
+    assert isinstance(result, np.ndarray)
+    _close(result, kernels.sma_kernel(values, 10))
+
+
+@pytest.mark.parametrize('kernel', [kernels.sma_kernel, kernels.ema_kernel, kernels.wma_kernel,
+                                    kernels.hma_kernel, kernels.rsi_kernel, kernels.rolling_std_kernel])
+def test_out_buffer_is_filled_in_place(kernel):
+    values = _prices(400)
+    out = np.full(400, -1.0)
+    
+    result = kernel(values, 16, out=out)
+    
+    assert result is out
+    _close(out, kernel(values, 16))
+
+
+def test_band_kernels_fill_a_shared_out_buffer():
+    values = _prices(400)
+    out = np.empty((3, 400))
+    
+    upper, middle, lower = kernels.bollinger_kernel(values, 20, 2.0, out=out)
+    assert np.shares_memory(upper, out) and np.shares_memory(lower, out)
+    _close(out, np.vstack(kernels.bollinger_kernel(values, 20, 2.0)))
+    
+    kernels.macd_kernel(values, 12, 26, 9, out=out)
+    _close(out, np.vstack(kernels.macd_kernel(values, 12, 26, 9)))
+
+
+def test_out_buffer_of_wrong_length_is_rejected():
+    with pytest.raises(ValueError):
+        kernels.sma_kernel(_prices(10), 3, out=np.empty(9))
+
+
+def test_period_longer_than_input_is_all_nan():
+    assert np.isnan(kernels.sma_kernel(_prices(5), 10)).all()
+    assert np.isnan(kernels.rolling_std_kernel(_prices(5), 10)).all()
@@ -0,0 +1,91 @@
+"""Tests for candle-aligned loop scheduling"""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from utils.scheduling.loop_scheduler import (
+    MONITOR, SIGNALS, LoopScheduler, candle_open_time, next_candle_close, timeframe_to_seconds
+)
+
+# Tuesday 2024-01-02 10:17:30 UTC
+NOW = datetime(2024, 1, 2, 10, 17, 30, tzinfo=timezone.utc).timestamp()
+
+
+def _utc(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+class Clock:
+    def __init__(self, now: float):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize('timeframe, opened, closes', [
+    ('1m', _utc(2024, 1, 2, 10, 17), _utc(2024, 1, 2, 10, 18)),
+    ('15m', _utc(2024, 1, 2, 10, 15), _utc(2024, 1, 2, 10, 30)),
+    ('4h', _utc(2024, 1, 2, 8), _utc(2024, 1, 2, 12)),
+    ('1d', _utc(2024, 1, 2), _utc(2024, 1, 3)),
+    ('1w', _utc(2024, 1, 1), _utc(2024, 1, 8)),
+    ('1M', _utc(2024, 1, 1), _utc(2024, 2, 1)),
+])
+def test_candle_boundaries(timeframe, opened, closes):
+    assert candle_open_time(NOW, timeframe) == opened
+    assert next_candle_close(NOW, timeframe) == closes
+
+
+def test_unsupported_timeframe_is_rejected():
+    assert timeframe_to_seconds('2h') == 7200
+    with pytest.raises(ValueError):
+        timeframe_to_seconds('1y')
+
+
+def test_signals_run_once_per_closed_candle_after_the_delay():
+    clock = Clock(NOW)
+    scheduler = LoopScheduler(check_interval=60, timeframe='1h', close_delay=2.0, clock=clock)
+    
+    assert scheduler.due() == {MONITOR, SIGNALS}
+    assert scheduler.next_signals == _utc(2024, 1, 2, 11, 0, 2)
+    
+    clock.now = _utc(2024, 1, 2, 11, 0, 1)
+    assert SIGNALS not in scheduler.due()
+    clock.now = _utc(2024, 1, 2, 11, 0, 2)
+    assert SIGNALS in scheduler.due()
+    assert scheduler.next_signals == _utc(2024, 1, 2, 12, 0, 2)
+
+
+def test_monitor_deadlines_do_not_drift_with_work_time():
+    clock = Clock(NOW)
+    scheduler = LoopScheduler(check_interval=10, timeframe='1h', clock=clock)
+    scheduler.due()
+    
+    # Each iteration takes 3s of work before sleeping
+    for step in range(1, 6):
+        clock.now += 3
+        clock.now += scheduler.seconds_until_next()
+        assert clock.now == NOW + 10 * step
+        assert MONITOR in scheduler.due()
+
+
+def test_overrun_skips_missed_monitor_slots():
+    clock = Clock(NOW)
+    scheduler = LoopScheduler(check_interval=10, timeframe='1h', clock=clock)
+    scheduler.due()
+    
+    clock.now = NOW + 35
+    assert MONITOR in scheduler.due()
+    # Back on the original grid, without a burst of catch-up runs
+    assert scheduler.next_monitor == NOW + 40
+    assert scheduler.seconds_until_next() == 5
+
+
+def test_signals_follow_the_check_interval_without_candle_close():
+    clock = Clock(NOW)
+    scheduler = LoopScheduler(check_interval=30, timeframe='1h', on_candle_close=False, clock=clock)
+    
+    assert scheduler.due() == {MONITOR, SIGNALS}
+    clock.now += 30
+    assert scheduler.due() == {MONITOR, SIGNALS}
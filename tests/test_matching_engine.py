@@ -0,0 +1,95 @@
+"""Tests for the mock broker's order matching engine"""
+
+import pytest
+
+from modules.brokers.matching_engine import MatchingEngine
+
+
+def _order(order_id: str, side: str, order_type: str, price: float, amount: float = 1.0) -> dict:
+    return {'id': order_id, 'symbol': 'BTC/EUR', 'side': side, 'type': order_type,
+            'price': price, 'amount': amount}
+
+
+def test_limit_order_fills_partially_from_candle_volume():
+    engine = MatchingEngine(max_fill_ratio=0.5)
+    order = _order('1', 'buy', 'limit', 100.0)
+    engine.add(order)
+    
+    fills = engine.on_candle('BTC/EUR', 101.0, 102.0, 99.0, 101.0, volume=1.2, timestamp=1)
+    assert [(fill['amount'], fill['price']) for fill in fills] == [(pytest.approx(0.6), 100.0)]
+    assert order['status'] == 'open' and order['remaining'] == pytest.approx(0.4)
+    
+    # The rest keeps its place and fills on the next crossing
+    fills = engine.on_candle('BTC/EUR', 101.0, 102.0, 99.5, 101.0, volume=10.0, timestamp=2)
+    assert [fill['amount'] for fill in fills] == [pytest.approx(0.4)]
+    assert order['status'] == 'filled' and order['average'] == pytest.approx(100.0)
+    assert engine.resting() == 0
+
+
+def test_candle_that_does_not_reach_the_trigger_leaves_orders_resting():
+    engine = MatchingEngine()
+    engine.add(_order('1', 'buy', 'limit', 95.0))
+    engine.add(_order('2', 'sell', 'limit', 105.0))
+    
+    assert engine.on_candle('BTC/EUR', 100.0, 104.0, 96.0, 101.0) == []
+    assert engine.resting('BTC/EUR') == 2
+
+
+def test_gap_through_limit_fills_at_the_better_open():
+    engine = MatchingEngine()
+    engine.add(_order('1', 'buy', 'limit', 100.0))
+    engine.add(_order('2', 'sell', 'take_profit', 110.0))
+    
+    fills = engine.on_candle('BTC/EUR', 97.0, 98.0, 96.0, 97.5)
+    assert [(fill['order_id'], fill['price']) for fill in fills] == [('1', 97.0)]
+    
+    fills = engine.on_candle('BTC/EUR', 112.0, 113.0, 111.0, 112.0)
+    assert [(fill['order_id'], fill['price']) for fill in fills] == [('2', 112.0)]
+
+
+def test_stop_fills_at_market_with_slippage():
+    engine = MatchingEngine(slippage_percent=1.0, fee_percent=0.1)
+    stop = _order('1', 'sell', 'stop_loss', 95.0)
+    engine.add(stop)
+    
+    # Traded through within the bar: the stop price plus slippage
+    fills = engine.on_candle('BTC/EUR', 100.0, 100.0, 94.0, 96.0)
+    assert fills[0]['price'] == pytest.approx(95.0 * 0.99)
+    assert fills[0]['fee'] == pytest.approx(95.0 * 0.99 * 0.001)
+    
+    # Gapped through: the open plus slippage
+    engine.add(_order('2', 'sell', 'stop_loss', 95.0))
+    fills = engine.on_candle('BTC/EUR', 90.0, 91.0, 89.0, 90.0)
+    assert fills[0]['price'] == pytest.approx(90.0 * 0.99)
+
+
+def test_market_order_slippage_is_adverse_for_both_sides():
+    engine = MatchingEngine(slippage_percent=0.5)
+    buy = engine.fill_market(_order('1', 'buy', 'market', 100.0), 100.0)
+    sell = engine.fill_market(_order('2', 'sell', 'market', 100.0), 100.0)
+    
+    assert buy['price'] == pytest.approx(100.5)
+    assert sell['price'] == pytest.approx(99.5)
+
+
+def test_partially_filled_stop_completes_before_new_triggers():
+    engine = MatchingEngine()
+    engine.add(_order('1', 'sell', 'stop_loss', 95.0, amount=2.0))
+    engine.add(_order('2', 'buy', 'limit', 90.0))
+    
+    fills = engine.on_candle('BTC/EUR', 100.0, 100.0, 94.0, 94.0, volume=1.0)
+    assert [(fill['order_id'], fill['amount']) for fill in fills] == [('1', 1.0)]
+    
+    # The triggered remainder drains at the next open, ahead of the limit
+    fills = engine.on_candle('BTC/EUR', 93.0, 93.0, 89.0, 89.0, volume=1.5)
+    assert [(fill['order_id'], fill['amount'], fill['price']) for fill in fills] == [
+        ('1', 1.0, 93.0), ('2', 0.5, 90.0)
+    ]
+
+
+def test_cancelled_order_is_skipped():
+    engine = MatchingEngine()
+    engine.add(_order('1', 'buy', 'limit', 100.0))
+    
+    assert engine.cancel('1') and not engine.cancel('1')
+    assert engine.on_candle('BTC/EUR', 99.0, 99.0, 98.0, 98.0) == []
@@ -0,0 +1,81 @@
+"""Tests for the latency metrics registry and loop phase attribution"""
+
+import asyncio
+import urllib.request
+
+from utils.monitoring.metrics import MetricsRegistry, MetricsServer, current_phase, loop_phase
+
+
+def test_render_prometheus_histogram_and_counter_format():
+    registry = MetricsRegistry(buckets=(0.1, 1.0))
+    registry.describe('call_seconds', 'Call latency')
+    registry.observe('call_seconds', 0.05, method='get_ticker')
+    registry.observe('call_seconds', 0.5, method='get_ticker')
+    registry.observe('call_seconds', 2.0, error=True, method='get_ticker')
+    registry.increment('weight_total', 3, endpoint='fetch_ohlcv', phase='signals')
+    
+    assert registry.render_prometheus().splitlines() == [
+        '# HELP newbot_call_seconds Call latency',
+        '# TYPE newbot_call_seconds histogram',
+        'newbot_call_seconds_bucket{method="get_ticker",le="0.1"} 1',
+        'newbot_call_seconds_bucket{method="get_ticker",le="1.0"} 2',
+        'newbot_call_seconds_bucket{method="get_ticker",le="+Inf"} 3',
+        'newbot_call_seconds_sum{method="get_ticker"} 2.55',
+        'newbot_call_seconds_count{method="get_ticker"} 3',
+        '# TYPE newbot_call_seconds_errors counter',
+        'newbot_call_seconds_errors{method="get_ticker"} 1',
+        '# TYPE newbot_weight_total counter',
+        'newbot_weight_total{endpoint="fetch_ohlcv",phase="signals"} 3',
+    ]
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry(buckets=(1.0,))
+    registry.increment('errors_total', symbol='a"b\\c')
+    
+    assert 'newbot_errors_total{symbol="a\\"b\\\\c"} 1' in registry.render_prometheus()
+
+
+def test_loop_phase_is_carried_into_worker_threads():
+    registry = MetricsRegistry()
+    
+    async def scenario():
+        with loop_phase('monitor_orders', registry):
+            inner = await asyncio.to_thread(current_phase.get)
+            with loop_phase('price_snapshot', registry):
+                nested = await asyncio.to_thread(current_phase.get)
+            after = current_phase.get()
+        return inner, nested, after
+    
+    assert asyncio.run(scenario()) == ('monitor_orders', 'price_snapshot', 'monitor_orders')
+    assert current_phase.get() == 'idle'
+    
+    histograms, _ = registry.snapshot()
+    phases = {dict(labels)['phase']: data[1] for labels, data in histograms['loop_phase_seconds'].items()}
+    assert phases == {'monitor_orders': 1, 'price_snapshot': 1}
+
+
+def test_concurrent_phases_keep_their_own_label():
+    registry = MetricsRegistry()
+    
+    async def phase(name):
+        with loop_phase(name, registry):
+            await asyncio.sleep(0.01)
+            return await asyncio.to_thread(current_phase.get)
+    
+    async def scenario():
+        return await asyncio.gather(phase('monitor_orders'), phase('evaluate_signals'))
+    
+    assert asyncio.run(scenario()) == ['monitor_orders', 'evaluate_signals']
+
+
+def test_metrics_server_serves_the_exposition_text():
+    registry = MetricsRegistry(buckets=(1.0,))
+    registry.increment('requests_total')
+    server = MetricsServer(registry, port=0).start()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=5) as response:
+            assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+            assert response.read().decode() == registry.render_prometheus()
+    finally:
+        server.stop()
@@ -0,0 +1,90 @@
+"""Tests for MockBroker order bookkeeping and candle matching"""
+
+import threading
+
+from modules.brokers.mock_broker import MockBroker
+
+
+def _broker(archive, **options):
+    return MockBroker('key', 'secret', seed=1, order_retention=1, order_archive=str(archive), **options)
+
+
+def test_archived_orders_from_previous_run_do_not_shadow_new_ones(tmp_path):
+    archive = tmp_path / 'orders.jsonl'
+    
+    first_run = _broker(archive)
+    first_ids = [first_run.place_order('BTC/EUR', 'buy', 1.0)['id'] for _ in range(5)]
+    assert first_run.get_order_status(first_ids[0]) == 'filled'
+    
+    second_run = _broker(archive)
+    price = second_run.get_current_price('BTC/EUR')
+    resting = second_run.place_order('BTC/EUR', 'buy', 1.0, order_type='limit', price=price * 0.5)
+    assert second_run.cancel_order(resting['id'])
+    for _ in range(5):
+        second_run.place_order('BTC/EUR', 'buy', 1.0)
+    
+    assert resting['id'] not in first_ids
+    assert second_run.get_order_status(resting['id']) == 'cancelled'
+    assert second_run.get_order_status(first_ids[0]) == 'filled'
+
+
+class Clock:
+    def __init__(self, now: float = 1_700_000_000.0):
+        self.now = now
+    
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_stop_fills_when_a_new_candle_trades_through_it():
+    # A second broker with the same seed and clock previews the next bars
+    clock, preview_clock = Clock(), Clock()
+    broker = MockBroker('key', 'secret', seed=3, clock=clock)
+    preview = MockBroker('key', 'secret', seed=3, clock=preview_clock)
+    broker.get_current_price('BTC/EUR')
+    preview.get_current_price('BTC/EUR')
+    preview_clock.now += 3600
+    bars = preview.get_market_data('BTC/EUR', '1m', limit=60)
+    lowest, last_close = float(bars.low.min()), bars.last_close
+    assert lowest < last_close
+    
+    # Only an intrabar low reaches the stop; the latest close stays above it
+    trigger = (lowest + last_close) / 2
+    order = broker.place_order('BTC/EUR', 'sell', 1.0, order_type='stop_loss', price=trigger)
+    clock.now += 3600
+    assert broker.get_current_price('BTC/EUR') == last_close
+    assert broker.get_order_status(order['id']) == 'filled'
+
+
+def test_current_price_does_not_depend_on_requested_timeframes():
+    broker = MockBroker('key', 'secret', seed=5, clock=Clock())
+    price = broker.get_current_price('BTC/EUR')
+    broker.get_market_data('BTC/EUR', '1h')
+    assert broker.get_current_price('BTC/EUR') == price
+
+
+def test_concurrent_order_work_keeps_the_books_consistent():
+    clock = Clock()
+    broker = MockBroker('key', 'secret', seed=7, clock=clock)
+    price = broker.get_current_price('BTC/EUR')
+    placed = []
+    
+    def trade(worker: int):
+        for _ in range(50):
+            order = broker.place_order('BTC/EUR', 'sell', 1.0, order_type='stop_loss', price=price * 0.5)
+            placed.append(order['id'])
+            if worker % 2:
+                broker.cancel_order(order['id'])
+            clock.now += 60
+            broker.get_current_price('BTC/EUR')
+    
+    threads = [threading.Thread(target=trade, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(set(placed)) == len(placed) == 400
+    open_ids = {order['id'] for order in broker.get_open_orders()}
+    assert open_ids == set(broker.matching_engine.orders)
+    assert all(broker.get_order_status(order_id) in ('open', 'filled', 'cancelled') for order_id in placed)
@@ -0,0 +1,294 @@
+"""Tests for webhook and SMTP notification delivery against local stand-in servers"""
+
+import json
+import socket
+import socketserver
+import threading
+import time
+from email.message import EmailMessage
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from config import config
+from modules.notifications.notifier import Notifier
+from modules.notifications.smtp_client import PooledSMTP
+from modules.notifications.webhook_client import RetrySpool, WebhookClient
+
+
+class WebhookServer(ThreadingHTTPServer):
+    """Records posted JSON bodies; answers with queued status codes, then 200"""
+    
+    daemon_threads = True
+    
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), WebhookHandler)
+        self.bodies = []
+        self.peers = []
+        self.statuses = []
+        self.url = f"http://127.0.0.1:{self.server_address[1]}/notify"
+        threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    
+    def wait_for(self, count: int, timeout: float = 5.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while len(self.bodies) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return len(self.bodies) >= count
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        status = self.server.statuses.pop(0) if self.server.statuses else 200
+        if status == 200:
+            self.server.bodies.append(body)
+            self.server.peers.append(self.client_address)
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def log_message(self, *args):
+        pass
+
+
+class SMTPServer(socketserver.ThreadingTCPServer):
+    """Minimal SMTP stand-in recording messages and sessions"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.port = self.server_address[1]
+        self.messages = []
+        self.connects = 0
+        self.quits = 0
+        # Answer MAIL FROM with 421 after this many messages per session
+        self.messages_per_session = None
+        self.sessions = []
+        threading.Thread(target=self.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True).start()
+    
+    def hang_up(self):
+        """Close every open session from the server side"""
+        for connection in self.sessions:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+    
+    def handle(self):
+        server = self.server
+        server.connects += 1
+        server.sessions.append(self.connection)
+        sent = 0
+        self.reply('220 localhost ESMTP')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip().upper()
+            if command.startswith('MAIL') and server.messages_per_session is not None \
+                    and sent >= server.messages_per_session:
+                self.reply('421 Too many messages, closing connection')
+                return
+            if command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while True:
+                    data = self.rfile.readline()
+                    if data in (b'.\r\n', b''):
+                        break
+                    lines.append(data)
+                server.messages.append(b''.join(lines).decode())
+                sent += 1
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                server.quits += 1
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+
+@pytest.fixture
+def smtp_server():
+    server = SMTPServer()
+    yield server
+    server.hang_up()
+    server.shutdown()
+    server.server_close()
+
+
+def _message(subject: str) -> EmailMessage:
+    msg = EmailMessage()
+    msg['From'], msg['To'], msg['Subject'] = 'bot@localhost', 'me@localhost', subject
+    msg.set_content(subject)
+    return msg
+
+
+def _smtp(server: SMTPServer, idle_timeout: float = 60) -> PooledSMTP:
+    return PooledSMTP('127.0.0.1', server.port, starttls=False, idle_timeout=idle_timeout, timeout=5)
+
+
+def test_smtp_reuses_one_session(smtp_server):
+    client = _smtp(smtp_server)
+    for index in range(3):
+        client.send(_message(f"alert {index}"))
+    client.close()
+    
+    assert len(smtp_server.messages) == 3
+    assert client.connects == smtp_server.connects == 1
+
+
+def test_smtp_reconnects_after_421(smtp_server):
+    smtp_server.messages_per_session = 1
+    client = _smtp(smtp_server)
+    client.send(_message('first'))
+    client.send(_message('second'))
+    client.close()
+    
+    assert len(smtp_server.messages) == 2
+    assert client.connects == 2
+
+
+def test_smtp_reconnects_after_server_hang_up(smtp_server):
+    client = _smtp(smtp_server)
+    client.send(_message('first'))
+    smtp_server.hang_up()
+    client.send(_message('second'))
+    client.close()
+    
+    assert len(smtp_server.messages) == 2
+    assert client.connects == 2
+
+
+def test_smtp_closes_idle_session_without_another_send(smtp_server):
+    client = _smtp(smtp_server, idle_timeout=0.1)
+    client.send(_message('only'))
+    
+    deadline = time.monotonic() + 5
+    while smtp_server.quits == 0 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert smtp_server.quits == 1
+    assert client._server is None
+    client.close()
+
+
+def test_email_digest_batches_low_priority_notifications(smtp_server):
+    config.set('notifications.email.enabled', True)
+    config.set('notifications.email.smtp_server', '127.0.0.1')
+    config.set('notifications.email.smtp_port', smtp_server.port)
+    config.set('notifications.email.from_address', 'bot@localhost')
+    config.set('notifications.email.to_address', 'me@localhost')
+    config.set('notifications.email.password', '')
+    config.set('notifications.email.starttls', False)
+    config.set('notifications.email.digest_window_seconds', 60)
+    notifier = Notifier()
+    
+    for index in range(3):
+        notifier.send_notification(f"note {index}", 'details', priority='low')
+    notifier.send_notification('urgent', 'details', priority='high')
+    notifier.flush(5)
+    assert len(smtp_server.messages) == 1 and 'urgent' in smtp_server.messages[0]
+    
+    notifier.flush_digest()
+    notifier.close(5)
+    assert len(smtp_server.messages) == 2
+    assert 'Subject: NewBot: 3 notifications' in smtp_server.messages[1]
+    assert smtp_server.connects == 1
+
+
+@pytest.fixture
+def webhook_server():
+    server = WebhookServer()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_webhook_reuses_one_connection(webhook_server):
+    client = WebhookClient(webhook_server.url)
+    for index in range(3):
+        client.send({'n': index})
+    client.close()
+    
+    assert webhook_server.bodies == [{'n': 0}, {'n': 1}, {'n': 2}]
+    assert len(set(webhook_server.peers)) == 1
+
+
+def test_webhook_posts_batches_as_arrays(webhook_server):
+    client = WebhookClient(webhook_server.url, batch_size=3, batch_window=60)
+    for index in range(4):
+        client.send({'n': index})
+    client.flush()
+    client.close()
+    
+    assert webhook_server.bodies == [[{'n': 0}, {'n': 1}, {'n': 2}], [{'n': 3}]]
+
+
+def test_webhook_spools_transient_failures_and_replays_them(webhook_server, tmp_path):
+    webhook_server.statuses = [503]
+    client = WebhookClient(webhook_server.url, spool_path=str(tmp_path / 'spool.jsonl'),
+                           retry_base_delay=0.05)
+    client.send({'n': 1})
+    
+    assert webhook_server.wait_for(1)
+    assert webhook_server.bodies == [{'n': 1}]
+    client.close()
+    assert len(client.spool) == 0
+
+
+def test_webhook_rejected_batches_do_not_block_the_spool(webhook_server, tmp_path):
+    spool = RetrySpool(str(tmp_path / 'spool.jsonl'))
+    spool.append([{'n': 1}])
+    spool.append([{'n': 2}])
+    webhook_server.statuses = [400]
+    client = WebhookClient(webhook_server.url, spool_path=spool.path, retry_base_delay=60,
+                           dead_letter_path=str(tmp_path / 'rejected.jsonl'))
+    
+    assert client.replay()
+    client.send({'n': 3})
+    webhook_server.statuses = [404]
+    client.send({'n': 4})
+    client.close()
+    
+    assert webhook_server.bodies == [{'n': 2}, {'n': 3}]
+    assert len(spool) == 0
+    assert client.dead_letter.read() == [[{'n': 1}], [{'n': 4}]]
+
+
+def test_notifier_replays_leftover_spool_at_startup(webhook_server, tmp_path):
+    spool = RetrySpool(str(tmp_path / 'spool.jsonl'))
+    spool.append([{'title': 'left over'}])
+    config.set('notifications.webhook.enabled', True)
+    config.set('notifications.webhook.url', webhook_server.url)
+    config.set('notifications.webhook.spool_path', spool.path)
+    config.set('notifications.webhook.retry_base_delay_seconds', 0.05)
+    
+    notifier = Notifier()
+    
+    assert webhook_server.wait_for(1)
+    assert webhook_server.bodies == [{'title': 'left over'}]
+    notifier.close(5)
+
+
+def test_notification_raced_by_close_is_delivered_inline():
+    notifier = Notifier()
+    delivered = []
+    
+    def submit_while_closing(channel, func, *args):
+        # close() flips the flag after _deliver() looked at the dispatcher
+        notifier.dispatcher.closed = True
+        return False
+    
+    notifier.dispatcher.submit = submit_while_closing
+    notifier._deliver('webhook', delivered.append, 'event')
+    
+    assert delivered == ['event']
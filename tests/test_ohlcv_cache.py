@@ -0,0 +1,161 @@
+"""Tests for the incremental OHLCV cache and its candle store"""
+
+import asyncio
+
+import pytest
+
+from modules.brokers import ohlcv_cache
+from modules.brokers.ohlcv_cache import OHLCVCache
+from modules.data.candle_store import CandleStore
+
+PERIOD = 60_000
+
+
+class FakeExchange:
+    """Serves one bar per minute up to `now`, like fetch_ohlcv"""
+    
+    def __init__(self, now: int):
+        self.now = now
+        self.calls = []
+    
+    def bars(self, start: int, end: int):
+        first = -(-start // PERIOD) * PERIOD
+        return [[t, t / 1e3, t / 1e3 + 1, t / 1e3 - 1, t / 1e3, 1.0] for t in range(first, end, PERIOD)]
+    
+    def fetch(self, since, limit):
+        self.calls.append((since, limit))
+        end = self.now - self.now % PERIOD + PERIOD
+        if since is None:
+            return self.bars(end - limit * PERIOD, end)
+        return self.bars(since, end)[:limit]
+    
+    async def fetch_async(self, since, limit):
+        return self.fetch(since, limit)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable wall clock for OHLCVCache._plan"""
+    now = {'ms': 1_700_000_000_000}
+    monkeypatch.setattr(ohlcv_cache.time, 'time', lambda: now['ms'] / 1000)
+    return now
+
+
+def _contiguous(rows):
+    return all(b[0] - a[0] == PERIOD for a, b in zip(rows, rows[1:]))
+
+
+def test_sync_and_async_paths_make_the_same_requests(clock):
+    sync_exchange, async_exchange = FakeExchange(clock['ms']), FakeExchange(clock['ms'])
+    sync_cache, async_cache = OHLCVCache(capacity=200, page_limit=50), OHLCVCache(capacity=200, page_limit=50)
+    
+    for step in range(4):
+        clock['ms'] += (1 + 30 * step) * PERIOD
+        sync_exchange.now = async_exchange.now = clock['ms']
+        rows = sync_cache.fetch_window('BTC/EUR', '1m', 40, sync_exchange.fetch)
+        async_rows = asyncio.run(
+            async_cache.fetch_window_async('BTC/EUR', '1m', 40, async_exchange.fetch_async)
+        )
+        assert rows == async_rows
+        assert len(rows) == 40 and _contiguous(rows)
+    
+    assert sync_exchange.calls == async_exchange.calls
+
+
+class HoleyExchange(FakeExchange):
+    """FakeExchange that omits bars in [hole_start, hole_end) until healed"""
+    
+    def __init__(self, now: int, hole_start: int, hole_end: int):
+        super().__init__(now)
+        self.hole = (hole_start, hole_end)
+        self.healed = False
+    
+    def bars(self, start: int, end: int):
+        rows = super().bars(start, end)
+        if self.healed:
+            return rows
+        return [row for row in rows if not self.hole[0] <= row[0] < self.hole[1]]
+
+
+def test_store_backfills_older_rows_without_duplicates(tmp_path):
+    store = CandleStore(str(tmp_path))
+    exchange = FakeExchange(0)
+    store.append('BTC/EUR', '1m', exchange.bars(0, 10 * PERIOD))
+    store.append('BTC/EUR', '1m', exchange.bars(15 * PERIOD, 20 * PERIOD))
+    
+    assert store.append('BTC/EUR', '1m', exchange.bars(8 * PERIOD, 16 * PERIOD)) == 5
+    stored = store.window('BTC/EUR', '1m', 100)
+    assert len(stored) == 20 and _contiguous(CandleStore.to_rows(stored))
+
+
+def test_warm_start_backfills_holes_in_stored_history(tmp_path, clock):
+    start = clock['ms'] - clock['ms'] % PERIOD - 99 * PERIOD
+    exchange = HoleyExchange(clock['ms'], start + 40 * PERIOD, start + 45 * PERIOD)
+    first = OHLCVCache(capacity=200, page_limit=100, store=CandleStore(str(tmp_path)))
+    rows = first.fetch_window('BTC/EUR', '1m', 100, exchange.fetch)
+    assert len(rows) == 95
+    
+    # After a restart the hole found on load is fetched again
+    exchange.healed = True
+    restarted = OHLCVCache(capacity=200, page_limit=100, store=CandleStore(str(tmp_path)))
+    rows = restarted.fetch_window('BTC/EUR', '1m', 100, exchange.fetch)
+    assert len(rows) == 100 and _contiguous(rows)
+    stored = CandleStore.to_rows(CandleStore(str(tmp_path)).window('BTC/EUR', '1m', 1000))
+    assert len(stored) == 100 and _contiguous(stored)
+
+
+def test_expired_buffer_does_not_leave_a_hole_in_the_store(tmp_path, clock):
+    store = CandleStore(str(tmp_path))
+    exchange = FakeExchange(clock['ms'])
+    cache = OHLCVCache(capacity=50, page_limit=40, store=store)
+    cache.fetch_window('BTC/EUR', '1m', 30, exchange.fetch)
+    
+    # Longer than the buffer covers: the buffer restarts from the latest window
+    clock['ms'] += 120 * PERIOD
+    exchange.now = clock['ms']
+    rows = cache.fetch_window('BTC/EUR', '1m', 30, exchange.fetch)
+    assert len(rows) == 30 and _contiguous(rows)
+    
+    stored = CandleStore.to_rows(store.window('BTC/EUR', '1m', 1000))
+    assert len(stored) == 150 and _contiguous(stored)
+
+
+class ListedExchange(FakeExchange):
+    """FakeExchange for a pair with no bars before `listed`"""
+    
+    def __init__(self, now: int, listed: int):
+        super().__init__(now)
+        self.listed = listed
+    
+    def bars(self, start: int, end: int):
+        return super().bars(max(start, self.listed), end)
+
+
+def test_short_history_is_not_downloaded_again(clock):
+    listed = clock['ms'] - clock['ms'] % PERIOD - 29 * PERIOD
+    exchange = ListedExchange(clock['ms'], listed)
+    cache = OHLCVCache(capacity=200, page_limit=100)
+    assert len(cache.fetch_window('NEW/EUR', '1m', 100, exchange.fetch)) == 30
+    
+    clock['ms'] += PERIOD
+    exchange.now = clock['ms']
+    exchange.calls.clear()
+    rows = cache.fetch_window('NEW/EUR', '1m', 100, exchange.fetch)
+    
+    assert len(rows) == 31 and _contiguous(rows)
+    assert len(exchange.calls) == 1 and exchange.calls[0][0] is not None
+
+
+def test_larger_window_backfills_older_bars_only(clock):
+    exchange = FakeExchange(clock['ms'])
+    cache = OHLCVCache(capacity=200, page_limit=100)
+    cache.fetch_window('BTC/EUR', '1m', 10, exchange.fetch)
+    first = cache.get_buffer('BTC/EUR', '1m').candles[0][0]
+    
+    exchange.calls.clear()
+    rows = cache.fetch_window('BTC/EUR', '1m', 40, exchange.fetch)
+    
+    assert len(rows) == 40 and _contiguous(rows)
+    # A catch-up request for new bars and one for the 30 older ones
+    assert all(since is not None for since, _ in exchange.calls)
+    assert (first - 30 * PERIOD, 30) in exchange.calls
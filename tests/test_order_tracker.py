@@ -0,0 +1,72 @@
+"""Tests for deriving fills and cancellations from open-order snapshots"""
+
+from modules.brokers.mock_broker import MockBroker
+from modules.brokers.order_tracker import OrderTracker
+
+
+class Clock:
+    def __call__(self) -> float:
+        return 1_700_000_000.0
+
+
+def _order(order_id: str, filled: float = 0.0) -> dict:
+    return {'id': order_id, 'symbol': 'BTC/EUR', 'amount': 1.0, 'filled': filled, 'status': 'open'}
+
+
+def test_partial_fill_on_mock_broker_is_seen_between_snapshots(monkeypatch):
+    broker = MockBroker('key', 'secret', seed=1, clock=Clock())
+    tracker = OrderTracker()
+    partial = []
+    monkeypatch.setattr(tracker.logger, 'info', partial.append)
+    price = broker.get_current_price('BTC/EUR')
+    order = broker.place_order('BTC/EUR', 'buy', 1.0, order_type='limit', price=price * 0.9)
+    assert tracker.reconcile(broker.get_open_orders()) == []
+    
+    broker.update_price('BTC/EUR', price * 0.89, volume=0.4)
+    
+    assert tracker.reconcile(broker.get_open_orders()) == []
+    assert tracker.open_orders[order['id']]['filled'] == 0.4
+    assert len(partial) == 1 and 'partially filled' in partial[0]
+
+
+def test_vanished_order_resolves_once_as_filled():
+    tracker = OrderTracker()
+    tracker.reconcile([_order('1', filled=0.5), _order('2')])
+    
+    vanished = tracker.reconcile([_order('2')])
+    
+    assert [order['id'] for order in vanished] == ['1']
+    assert tracker.resolve(vanished[0], 'closed') == 'filled'
+    assert tracker.resolve(vanished[0], 'closed') is None
+    assert tracker.reconcile([_order('2')]) == []
+
+
+def test_vanished_order_resolves_as_cancelled():
+    tracker = OrderTracker()
+    tracker.reconcile([_order('1')])
+    
+    vanished = tracker.reconcile([])
+    
+    assert tracker.resolve(vanished[0], 'canceled') == 'cancelled'
+    assert tracker.pending == {}
+
+
+def test_inconclusive_lookups_are_retried_then_given_up():
+    tracker = OrderTracker(max_status_retries=2)
+    tracker.reconcile([_order('1')])
+    vanished = tracker.reconcile([])
+    
+    assert tracker.resolve(vanished[0], 'open') is None
+    # Still pending, so the next snapshot asks again
+    assert tracker.reconcile([]) == vanished
+    assert tracker.resolve(vanished[0], 'unknown') is None
+    assert tracker.reconcile([]) == []
+
+
+def test_order_listed_open_again_is_no_longer_pending():
+    tracker = OrderTracker()
+    tracker.reconcile([_order('1')])
+    tracker.reconcile([])
+    
+    assert tracker.reconcile([_order('1')]) == []
+    assert tracker.pending == {}
@@ -0,0 +1,87 @@
+"""Tests for retries, rate limit backoff and the circuit breaker"""
+
+import ccxt
+import pytest
+
+from modules.brokers import resilience
+from modules.brokers.resilience import CircuitBreaker, ResilientCaller, RetryPolicy
+
+
+class Flaky:
+    """Raises the given errors in turn, then returns 'ok'"""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return 'ok'
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record backoff sleeps instead of sleeping"""
+    slept = []
+    monkeypatch.setattr(resilience.time, 'sleep', slept.append)
+    return slept
+
+
+def _caller():
+    return ResilientCaller(
+        retry=RetryPolicy(max_retries=2, base_delay=0.5, max_delay=8,
+                          rate_limit_delay=30),
+        breaker=CircuitBreaker(failure_threshold=2),
+        retry_on=(ccxt.NetworkError,),
+        rate_limited=(ccxt.RateLimitExceeded, ccxt.DDoSProtection)
+    )
+
+
+def test_rate_limit_fails_fast_and_holds_circuit_for_retry_after(sleeps):
+    caller = _caller()
+    fn = Flaky(ccxt.RateLimitExceeded('429'))
+    throttled = []
+    
+    with pytest.raises(ccxt.RateLimitExceeded):
+        caller.call('fetch_ticker', fn, throttle=lambda: throttled.append(1), retry_after=lambda: 45.0)
+    
+    # No inline wait: the next loop iteration skips the call instead
+    assert sleeps == []
+    assert len(throttled) == fn.calls == 1
+    assert caller.breaker.is_open() and caller.breaker.open_for == 45.0
+    with pytest.raises(resilience.CircuitOpenError):
+        caller.call('fetch_ohlcv', fn)
+    assert fn.calls == 1
+
+
+def test_rate_limit_without_retry_after_holds_circuit_for_default_backoff(sleeps):
+    caller = _caller()
+    fn = Flaky(ccxt.DDoSProtection('418'))
+    
+    with pytest.raises(ccxt.DDoSProtection):
+        caller.call('fetch_ohlcv', fn)
+    assert sleeps == []
+    assert caller.breaker.is_open() and caller.breaker.open_for == 30
+
+
+def test_circuit_closes_after_rate_limit_hold(sleeps, monkeypatch):
+    caller = _caller()
+    now = [1000.0]
+    monkeypatch.setattr(resilience.time, 'monotonic', lambda: now[0])
+    fn = Flaky(ccxt.RateLimitExceeded('429'))
+    
+    with pytest.raises(ccxt.RateLimitExceeded):
+        caller.call('fetch_ticker', fn, retry_after=lambda: 45.0)
+    now[0] += 46
+    
+    assert caller.call('fetch_ticker', fn) == 'ok'
+    assert caller.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_network_errors_use_short_jittered_backoff(sleeps):
+    fn = Flaky(ccxt.NetworkError('reset'))
+    
+    assert _caller().call('fetch_ticker', fn) == 'ok'
+    assert len(sleeps) == 1 and 0 <= sleeps[0] <= 0.5
@@ -0,0 +1,61 @@
+"""Tests for strategy input handling"""
+
+import numpy as np
+import pytest
+
+from modules.data.market_data import MarketData
+from modules.indicators.cache import indicator_cache
+from modules.strategies.moving_average_crossover import MovingAverageCrossover
+from modules.strategies.rsi_strategy import RSIStrategy
+from modules.strategies.trend_following import TrendFollowing
+
+STRATEGIES = [
+    lambda: MovingAverageCrossover({'fast_period': 5, 'slow_period': 20}),
+    lambda: RSIStrategy({'period': 14}),
+    lambda: TrendFollowing({'ema_period': 20}),
+]
+
+
+def _rows(count: int = 120):
+    """A rally followed by a steady decline"""
+    closes = np.concatenate([np.linspace(100, 150, count // 2), np.linspace(150, 90, count - count // 2)])
+    return [[1_700_000_000_000 + i * 3_600_000, c, c + 1, c - 1, c, 10.0] for i, c in enumerate(closes)]
+
+
+@pytest.mark.parametrize('make_strategy', STRATEGIES)
+def test_old_style_payload_gives_the_same_signals(make_strategy):
+    rows = _rows()
+    strategy = make_strategy()
+    expected_signal = strategy.generate_signal(MarketData.from_rows('BTC/EUR', '1h', rows))
+    expected_signals = strategy.generate_signals(MarketData.from_rows('BTC/EUR', '1h', rows))
+    indicator_cache.clear()
+    
+    payload = {'symbol': 'BTC/EUR', 'timeframe': '1h', 'data': rows}
+    assert strategy.generate_signal(payload) == expected_signal
+    assert np.array_equal(strategy.generate_signals(payload), expected_signals)
+
+
+def test_old_style_payload_is_not_mistaken_for_three_candles():
+    payload = {'symbol': 'BTC/EUR', 'timeframe': '1h', 'data': _rows()}
+    assert RSIStrategy({'period': 14}).generate_signal(payload) == 'BUY'
+
+
+@pytest.mark.parametrize('make_strategy', STRATEGIES)
+def test_unsupported_market_data_holds(make_strategy):
+    strategy = make_strategy()
+    assert strategy.generate_signal(_rows()) == 'HOLD'
+    # Batch signals have no fallback and still reject it
+    with pytest.raises(TypeError):
+        strategy.generate_signals(_rows())
+
+
+def test_market_data_leaves_caller_arrays_writeable():
+    timestamps = np.arange(3, dtype=np.int64)
+    prices = np.ones((5, 3))
+    data = MarketData('BTC/EUR', '1h', timestamps, prices)
+    
+    timestamps[0] = 7
+    prices[3, 0] = 2.0
+    assert not data.timestamps.flags.writeable and not data.close.flags.writeable
+    with pytest.raises(ValueError):
+        data.close[0] = 5.0
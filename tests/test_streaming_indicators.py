@@ -0,0 +1,72 @@
+"""Tests for the streaming indicators against their batch versions"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.indicators.bollinger_bands import calculate_bollinger_bands
+from modules.indicators.moving_averages import calculate_ema, calculate_macd, calculate_sma
+from modules.indicators.rsi import calculate_rsi
+from modules.indicators.streaming import (
+    StreamingBollingerBands, StreamingEMA, StreamingMACD, StreamingRSI, StreamingSMA
+)
+
+CASES = [
+    (lambda: StreamingSMA(10), lambda prices: [calculate_sma(prices, 10)]),
+    (lambda: StreamingEMA(10), lambda prices: [calculate_ema(prices, 10)]),
+    (lambda: StreamingRSI(14), lambda prices: [calculate_rsi(prices, 14)]),
+    (lambda: StreamingBollingerBands(20, 2.0), lambda prices: list(calculate_bollinger_bands(prices, 20, 2.0))),
+    (lambda: StreamingMACD(12, 26, 9), lambda prices: list(calculate_macd(prices, 12, 26, 9))),
+]
+
+
+def _prices(count: int = 300) -> pd.Series:
+    rng = np.random.default_rng(7)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, count))))
+
+
+def _as_columns(values):
+    return np.array([np.atleast_1d(value) for value in values], dtype=float).T
+
+
+@pytest.mark.parametrize('make_indicator, batch', CASES)
+def test_streaming_matches_batch_bar_by_bar(make_indicator, batch):
+    prices = _prices()
+    indicator = make_indicator()
+    
+    streamed = _as_columns([indicator.update(price) for price in prices])
+    
+    for column, expected in zip(streamed, batch(prices)):
+        np.testing.assert_allclose(column, expected.to_numpy(), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('make_indicator, batch', CASES)
+def test_revise_replaces_the_forming_bar(make_indicator, batch):
+    prices = _prices()
+    indicator = make_indicator()
+    for price in prices.iloc[:-1]:
+        indicator.update(price)
+    
+    # The last bar is first seen at another price, then revised twice
+    indicator.update(prices.iloc[-1] * 1.05)
+    indicator.revise(prices.iloc[-1] * 0.97)
+    final = np.atleast_1d(indicator.revise(prices.iloc[-1]))
+    
+    expected = [series.iloc[-1] for series in batch(prices)]
+    np.testing.assert_allclose(final, expected, rtol=1e-9)
+    np.testing.assert_allclose(np.atleast_1d(indicator.value), expected, rtol=1e-9)
+
+
+def test_wilder_rsi_revise_matches_update():
+    prices = _prices()
+    updated, revised = StreamingRSI(14, smoothing='wilder'), StreamingRSI(14, smoothing='wilder')
+    for price in prices.iloc[:-1]:
+        updated.update(price)
+        revised.update(price)
+    
+    updated.update(prices.iloc[-1])
+    revised.update(prices.iloc[-1] + 3.0)
+    revised.revise(prices.iloc[-1])
+    
+    assert revised.value == pytest.approx(updated.value, rel=1e-12)
+    assert 0 < updated.value < 100
@@ -0,0 +1,47 @@
+"""Tests for walk-forward result caching"""
+
+from modules.backtesting.result_cache import ResultCache
+from modules.backtesting.walk_forward import WalkForward
+from modules.data.market_generator import MarketGenerator
+
+
+def _analysis(cache):
+    analysis = WalkForward('moving_average_crossover', in_sample=200, out_of_sample=100, warmup=50,
+                           workers=1, cache=cache)
+    computed = []
+    run_segments = analysis.sweep.run_segments
+    
+    def counting(market_data, tasks):
+        computed.extend(tasks)
+        return run_segments(market_data, tasks)
+    
+    analysis.sweep.run_segments = counting
+    return analysis, computed
+
+
+def _run(cache, market_data):
+    analysis, computed = _analysis(cache)
+    analysis.run(market_data, [{'fast_period': 5, 'slow_period': 20}, {'fast_period': 10, 'slow_period': 30}])
+    return len(computed)
+
+
+def test_cache_hits_with_unchanged_settings(tmp_path):
+    market_data = MarketGenerator(['BTC/EUR'], '1h', seed=7).generate(600)['BTC/EUR']
+    cache = ResultCache(str(tmp_path / 'cache.db'))
+    
+    assert _run(cache, market_data) > 0
+    assert _run(cache, market_data) == 0
+
+
+def test_cache_misses_after_risk_config_change(tmp_path, restore_config):
+    market_data = MarketGenerator(['BTC/EUR'], '1h', seed=7).generate(600)['BTC/EUR']
+    cache = ResultCache(str(tmp_path / 'cache.db'))
+    first = _run(cache, market_data)
+    
+    trailing = restore_config.get('risk_management.use_trailing_stop', False)
+    for key, value in [('risk_management.stop_loss_percent', 7.5),
+                       ('trading.trade_amount', 250.0),
+                       ('risk_management.use_trailing_stop', not trailing),
+                       ('risk_management.trailing_stop_percent', 3.0)]:
+        restore_config.set(key, value)
+        assert _run(cache, market_data) == first, key
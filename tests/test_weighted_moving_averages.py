@@ -0,0 +1,55 @@
+"""Tests for the vectorized WMA and the Hull moving average"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules.indicators.moving_averages import calculate_hma, calculate_wma
+
+
+def _rolling_wma(prices: pd.Series, period: int) -> pd.Series:
+    """The former rolling-apply implementation, as a reference"""
+    weights = np.arange(1, period + 1, dtype=float)
+    return prices.rolling(window=period).apply(lambda x: (x * weights).sum() / weights.sum(), raw=True)
+
+
+def _prices(count: int = 500) -> pd.Series:
+    rng = np.random.default_rng(11)
+    index = pd.date_range('2024-01-01', periods=count, freq='min')
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, count))), index=index)
+
+
+@pytest.mark.parametrize('period', [1, 2, 9, 50])
+def test_wma_matches_rolling_apply(period):
+    prices = _prices()
+    result = calculate_wma(prices, period)
+    
+    pd.testing.assert_series_equal(result, _rolling_wma(prices, period), check_names=False, rtol=1e-10)
+    np.testing.assert_allclose(calculate_wma(prices.to_numpy(), period), result.to_numpy(), equal_nan=True)
+
+
+def test_wma_propagates_nan_like_rolling_windows():
+    prices = _prices(60)
+    prices.iloc[30] = np.nan
+    
+    result = calculate_wma(prices, 5)
+    
+    pd.testing.assert_series_equal(result, _rolling_wma(prices, 5), check_names=False, rtol=1e-10)
+    assert result.iloc[30:35].isna().all() and not np.isnan(result.iloc[35])
+
+
+def test_wma_period_longer_than_input_is_all_nan():
+    assert calculate_wma(_prices(5), 10).isna().all()
+
+
+@pytest.mark.parametrize('period', [4, 9, 16, 21])
+def test_hma_matches_its_wma_definition(period):
+    prices = _prices()
+    half, root = _rolling_wma(prices, period // 2), _rolling_wma(prices, period)
+    expected = _rolling_wma(2 * half - root, int(np.sqrt(period)))
+    
+    result = calculate_hma(prices, period)
+    
+    pd.testing.assert_series_equal(result, expected, check_names=False, rtol=1e-9)
+    # Warm-up: the full WMA, then the sqrt(period) smoothing window
+    assert result.first_valid_index() == prices.index[period + int(np.sqrt(period)) - 2]
@@ -0,0 +1,425 @@
+"""
+Latency metrics for NewBot
+
+Low-overhead histograms and counters for the trading loop phases and
+broker calls. Observations go into fixed buckets (one bisect and a few
+integer updates, about a microsecond per call), so the cost does not
+depend on how many samples were recorded. The registry renders the
+Prometheus text format for a local HTTP endpoint and a compact summary
+for the log.
+"""
+
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Upper bounds in seconds, from sub-millisecond cache hits to slow API calls
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+# Trading loop phase the current code runs in (see loop_phase)
+current_phase: ContextVar[str] = ContextVar('current_phase', default='idle')
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram
+    """
+    
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max', 'errors')
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Initialize histogram
+        
+        Args:
+            buckets: Increasing bucket upper bounds in seconds
+        """
+        self.buckets = buckets
+        # One extra slot for observations above the last bound (+Inf)
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.errors = 0
+    
+    def observe(self, seconds: float, error: bool = False):
+        """
+        Record one observation
+        
+        Args:
+            seconds: Duration
+            error: Whether the timed call failed
+        """
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if error:
+            self.errors += 1
+    
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile from the buckets
+        
+        Args:
+            q: Quantile between 0 and 1
+            
+        Returns:
+            Upper bound of the bucket holding the quantile (the maximum for
+            the overflow bucket)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.buckets[index], self.max) if index < len(self.buckets) else self.max
+        return self.max
+
+
+class _Timer:
+    """Context manager recording the duration of its block"""
+    
+    __slots__ = ('histogram', 'lock', 'start')
+    
+    def __init__(self, histogram: Histogram, lock: threading.Lock):
+        self.histogram = histogram
+        self.lock = lock
+    
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        elapsed = time.perf_counter() - self.start
+        with self.lock:
+            self.histogram.observe(elapsed, exc_type is not None)
+
+
+def _format_seconds(seconds: float) -> str:
+    """Short human-readable duration"""
+    if seconds < 0.001:
+        return f"{seconds * 1e6:.0f}us"
+    if seconds < 1:
+        return f"{seconds * 1000:.1f}ms"
+    return f"{seconds:.2f}s"
+
+
+class MetricsRegistry:
+    """
+    Named, labelled histograms and counters
+    """
+    
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        """
+        Initialize registry
+        
+        Args:
+            buckets: Bucket bounds for new histograms
+        """
+        self.buckets = buckets
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.descriptions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def describe(self, name: str, description: str):
+        """Set the HELP text of a metric"""
+        self.descriptions[name] = description
+    
+    def histogram(self, name: str, **labels: str) -> Histogram:
+        """
+        Get (or create) a histogram
+        
+        Callers on hot paths should keep the returned histogram instead of
+        looking it up on every call.
+        
+        Args:
+            name: Metric name
+            **labels: Label values
+            
+        Returns:
+            Histogram instance
+        """
+        key = tuple(sorted(labels.items())) if len(labels) > 1 else tuple(labels.items())
+        series = self.histograms.get(name)
+        if series is None or key not in series:
+            with self._lock:
+                series = self.histograms.setdefault(name, {})
+                series.setdefault(key, Histogram(self.buckets))
+        return series[key]
+    
+    def observe(self, name: str, seconds: float, error: bool = False, **labels: str):
+        """
+        Record a duration
+        
+        Args:
+            name: Histogram name
+            seconds: Duration
+            error: Whether the timed call failed
+            **labels: Label values
+        """
+        histogram = self.histogram(name, **labels)
+        with self._lock:
+            histogram.observe(seconds, error)
+    
+    def increment(self, name: str, amount: float = 1, **labels: str):
+        """
+        Increase a counter
+        
+        Args:
+            name: Counter name
+            amount: Increment
+            **labels: Label values
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+    
+    def time(self, name: str, **labels: str) -> '_Timer':
+        """
+        Time a block of code
+        
+        Example:
+            with metrics.time('loop_phase_seconds', phase='monitor_orders'):
+                self._monitor_orders()
+        """
+        return _Timer(self.histogram(name, **labels), self._lock)
+    
+    def timed(self, func: Callable, name: str, **labels: str) -> Callable:
+        """
+        Wrap a function (or coroutine function) so every call is timed
+        
+        Args:
+            func: Function to wrap
+            name: Histogram name
+            **labels: Label values
+            
+        Returns:
+            Wrapped function
+        """
+        histogram = self.histogram(name, **labels)
+        lock = self._lock
+        
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                error = True
+                try:
+                    result = await func(*args, **kwargs)
+                    error = False
+                    return result
+                finally:
+                    elapsed = time.perf_counter() - start
+                    with lock:
+                        histogram.observe(elapsed, error)
+            return async_wrapper
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            error = True
+            try:
+                result = func(*args, **kwargs)
+                error = False
+                return result
+            finally:
+                elapsed = time.perf_counter() - start
+                with lock:
+                    histogram.observe(elapsed, error)
+        return wrapper
+    
+    def snapshot(self) -> Tuple[Dict, Dict]:
+        """
+        Consistent copy of all series
+        
+        Returns:
+            Tuple of (histograms as name -> labels -> (bucket counts,
+            count, sum, max, errors), counters as name -> labels -> value)
+        """
+        with self._lock:
+            histograms = {
+                name: {labels: (list(h.counts), h.count, h.sum, h.max, h.errors) for labels, h in series.items()}
+                for name, series in self.histograms.items()
+            }
+            counters = {name: dict(series) for name, series in self.counters.items()}
+        return histograms, counters
+    
+    @staticmethod
+    def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+        """Render a Prometheus label set"""
+        items = list(labels) + ([extra] if extra else [])
+        if not items:
+            return ''
+        escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in items)
+        return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(items, escaped)) + '}'
+    
+    def render_prometheus(self, prefix: str = 'newbot_') -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+        
+        Args:
+            prefix: Prefix added to every metric name
+            
+        Returns:
+            Exposition text
+        """
+        histograms, counters = self.snapshot()
+        lines: List[str] = []
+        
+        for name, series in sorted(histograms.items()):
+            metric = prefix + name
+            if name in self.descriptions:
+                lines.append(f"# HELP {metric} {self.descriptions[name]}")
+            lines.append(f"# TYPE {metric} histogram")
+            for labels, (counts, count, total, _, errors) in sorted(series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{metric}_bucket{self._format_labels(labels, ('le', repr(bound)))} {cumulative}")
+                lines.append(f"{metric}_bucket{self._format_labels(labels, ('le', '+Inf'))} {count}")
+                lines.append(f"{metric}_sum{self._format_labels(labels)} {total}")
+                lines.append(f"{metric}_count{self._format_labels(labels)} {count}")
+            lines.append(f"# TYPE {metric}_errors counter")
+            for labels, (_, _, _, _, errors) in sorted(series.items()):
+                lines.append(f"{metric}_errors{self._format_labels(labels)} {errors}")
+        
+        for name, series in sorted(counters.items()):
+            metric = prefix + name
+            if name in self.descriptions:
+                lines.append(f"# HELP {metric} {self.descriptions[name]}")
+            lines.append(f"# TYPE {metric} counter")
+            for labels, value in sorted(series.items()):
+                lines.append(f"{metric}{self._format_labels(labels)} {value}")
+        
+        return '\n'.join(lines) + '\n'
+    
+    def summary(self) -> List[str]:
+        """
+        One line per histogram series for the log
+        
+        Returns:
+            Lines such as `loop_phase_seconds{phase=monitor_orders}
+            n=12 mean=3.1ms p50<=5.0ms p95<=10.0ms max=8.7ms errors=0`
+        """
+        with self._lock:
+            rows = [
+                (name, labels, histogram.count, histogram.sum, histogram.quantile(0.5),
+                 histogram.quantile(0.95), histogram.max, histogram.errors)
+                for name, series in sorted(self.histograms.items())
+                for labels, histogram in sorted(series.items())
+                if histogram.count
+            ]
+        
+        lines = []
+        for name, labels, count, total, p50, p95, maximum, errors in rows:
+            label_text = ','.join(f"{key}={value}" for key, value in labels)
+            lines.append(
+                f"{name}{{{label_text}}} n={count} mean={_format_seconds(total / count)} "
+                f"p50<={_format_seconds(p50)} p95<={_format_seconds(p95)} "
+                f"max={_format_seconds(maximum)} errors={errors}"
+            )
+        return lines
+
+
+class _Phase(_Timer):
+    """Timer that also marks the code it runs as part of a loop phase"""
+    
+    __slots__ = ('name', 'token')
+    
+    def __init__(self, registry: 'MetricsRegistry', name: str):
+        super().__init__(registry.histogram('loop_phase_seconds', phase=name), registry._lock)
+        self.name = name
+    
+    def __enter__(self) -> '_Phase':
+        self.token = current_phase.set(self.name)
+        return super().__enter__()
+    
+    def __exit__(self, exc_type, exc, traceback):
+        super().__exit__(exc_type, exc, traceback)
+        current_phase.reset(self.token)
+
+
+def loop_phase(name: str, registry: Optional['MetricsRegistry'] = None) -> _Phase:
+    """
+    Time a trading loop phase and attribute broker calls made inside it
+    
+    The phase name is held in a context variable, so it follows the code
+    into coroutines and asyncio.to_thread() calls.
+    
+    Example:
+        with loop_phase('monitor_orders'):
+            self._monitor_orders()
+    
+    Args:
+        name: Phase name (the `phase` label)
+        registry: Metrics registry (default: the shared one)
+    """
+    return _Phase(registry or metrics, name)
+
+
+class MetricsServer:
+    """
+    Serves a registry in Prometheus text format from a background thread
+    """
+    
+    def __init__(self, registry: MetricsRegistry, host: str = '127.0.0.1', port: int = 9108):
+        """
+        Initialize server
+        
+        Args:
+            registry: Metrics registry to expose
+            host: Interface to bind (local only by default)
+            port: TCP port (0 picks a free one)
+        """
+        self.registry = registry
+        registry_ref = registry
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry_ref.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                # Scrapes would otherwise be printed to stderr
+                pass
+        
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='metrics-server', daemon=True)
+    
+    def start(self) -> 'MetricsServer':
+        """Start serving"""
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        """Stop serving and close the socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Shared registry for the bot process
+metrics = MetricsRegistry()
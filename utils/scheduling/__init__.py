@@ -0,0 +1 @@
+"""Scheduling utilities"""
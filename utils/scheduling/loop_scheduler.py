@@ -0,0 +1,179 @@
+"""
+Loop scheduler for NewBot
+
+Decides which trading loop phases are due and how long to sleep:
+- Position/order monitoring runs every `check_interval_seconds`
+- Signal evaluation runs once per closed candle of the strategy timeframe
+
+Deadlines are fixed in advance, so time spent working does not push the
+next iteration back (no drift from sleeping *after* the work).
+"""
+
+import re
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional, Set
+
+
+MONITOR = 'monitor'
+SIGNALS = 'signals'
+
+_UNIT_SECONDS = {
+    's': 1,
+    'm': 60,
+    'h': 3600,
+    'd': 86400,
+    'w': 604800,
+}
+
+# Weekly candles open on Monday; the Unix epoch was a Thursday
+_WEEK_OFFSET = 4 * 86400
+
+
+def timeframe_to_seconds(timeframe: str) -> int:
+    """
+    Convert a CCXT timeframe string to seconds
+    
+    Args:
+        timeframe: Timeframe such as '1m', '15m', '1h', '1d', '1w' or '1M'
+        
+    Returns:
+        Nominal candle length in seconds (30 days for '1M')
+    """
+    match = re.fullmatch(r'(\d+)([smhdwM])', timeframe or '')
+    if not match:
+        raise ValueError(f"Unsupported timeframe: {timeframe}")
+    
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit == 'M':
+        return amount * 30 * 86400
+    return amount * _UNIT_SECONDS[unit]
+
+
+def candle_open_time(timestamp: float, timeframe: str) -> float:
+    """
+    Get the open time of the candle containing a timestamp
+    
+    Args:
+        timestamp: Unix time in seconds
+        timeframe: CCXT timeframe string
+        
+    Returns:
+        Unix time (seconds) at which that candle opened
+    """
+    if timeframe.endswith('M'):
+        months = int(timeframe[:-1])
+        current = datetime.fromtimestamp(timestamp, tz=timezone.utc)
+        index = (current.year * 12 + current.month - 1) // months * months
+        return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc).timestamp()
+    
+    period = timeframe_to_seconds(timeframe)
+    offset = _WEEK_OFFSET if timeframe.endswith('w') else 0
+    return (timestamp - offset) // period * period + offset
+
+
+def next_candle_close(timestamp: float, timeframe: str) -> float:
+    """
+    Get the close time of the candle containing a timestamp
+    
+    Args:
+        timestamp: Unix time in seconds
+        timeframe: CCXT timeframe string
+        
+    Returns:
+        Unix time (seconds) at which the current candle closes
+    """
+    if timeframe.endswith('M'):
+        months = int(timeframe[:-1])
+        opened = datetime.fromtimestamp(candle_open_time(timestamp, timeframe), tz=timezone.utc)
+        index = opened.year * 12 + opened.month - 1 + months
+        return datetime(index // 12, index % 12 + 1, 1, tzinfo=timezone.utc).timestamp()
+    
+    return candle_open_time(timestamp, timeframe) + timeframe_to_seconds(timeframe)
+
+
+class LoopScheduler:
+    """
+    Deadline-based scheduler for the trading loop phases
+    """
+    
+    def __init__(self, check_interval: float, timeframe: str,
+                 on_candle_close: bool = True, close_delay: float = 2.0,
+                 clock: Callable[[], float] = time.time):
+        """
+        Initialize scheduler
+        
+        Args:
+            check_interval: Seconds between position/order checks
+            timeframe: Strategy candle timeframe
+            on_candle_close: Evaluate signals only when a new candle closes;
+                otherwise signals follow the check interval
+            close_delay: Seconds to wait after a close so the exchange has
+                finalized the bar
+            clock: Time source returning Unix seconds
+        """
+        self.check_interval = check_interval
+        self.timeframe = timeframe
+        self.on_candle_close = on_candle_close
+        self.close_delay = close_delay
+        self.clock = clock
+        
+        now = clock()
+        self.next_monitor = now
+        self.next_signals = now
+    
+    def due(self, now: Optional[float] = None) -> Set[str]:
+        """
+        Get the phases whose deadline has passed
+        
+        Calling this also advances the deadlines of the returned phases.
+        
+        Args:
+            now: Current Unix time (defaults to the scheduler clock)
+            
+        Returns:
+            Set containing MONITOR and/or SIGNALS
+        """
+        now = self.clock() if now is None else now
+        due = set()
+        
+        if now >= self.next_monitor:
+            due.add(MONITOR)
+            self.next_monitor = self._advance(self.next_monitor, now)
+        
+        if now >= self.next_signals:
+            due.add(SIGNALS)
+            if self.on_candle_close:
+                self.next_signals = next_candle_close(now - self.close_delay, self.timeframe) + self.close_delay
+            else:
+                self.next_signals = self.next_monitor
+        
+        return due
+    
+    def _advance(self, deadline: float, now: float) -> float:
+        """Move a fixed-rate deadline past `now`, skipping missed slots"""
+        if self.check_interval <= 0:
+            return now
+        missed = (now - deadline) // self.check_interval + 1
+        return deadline + missed * self.check_interval
+    
+    def next_deadline(self) -> float:
+        """Get the Unix time of the next due phase"""
+        return min(self.next_monitor, self.next_signals)
+    
+    def seconds_until_next(self, now: Optional[float] = None) -> float:
+        """
+        Get how long to sleep before the next phase is due
+        
+        Args:
+            now: Current Unix time (defaults to the scheduler clock)
+            
+        Returns:
+            Non-negative number of seconds
+        """
+        now = self.clock() if now is None else now
+        return max(0.0, self.next_deadline() - now)
+    
+    def sleep_until_next(self):
+        """Block until the next phase is due"""
+        time.sleep(self.seconds_until_next())